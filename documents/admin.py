@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.db.models import Count
 from django.utils.html import format_html
 from .models import Document, Contract, LeaveRequest, Order, Vacancy, Candidate
+from employees.report_cache import bump_version
 
 
 # ========== LEAVE REQUESTS (Заявки на відпустку) ==========
@@ -194,27 +195,31 @@ class CandidateAdmin(admin.ModelAdmin):
 
     status_badge.short_description = 'Статус'
 
-    # Масові дії
+    # Масові дії (update() не надсилає сигналів, тому версію звітів оновлюємо вручну)
     def mark_as_interview(self, request, queryset):
         queryset.update(status='interview')
+        bump_version('documents.Candidate')
         self.message_user(request, f"{queryset.count()} кандидатів переведено на співбесіду")
 
     mark_as_interview.short_description = "→ На співбесіду"
 
     def mark_as_offer(self, request, queryset):
         queryset.update(status='offer')
+        bump_version('documents.Candidate')
         self.message_user(request, f"{queryset.count()} кандидатам надіслано оффер")
 
     mark_as_offer.short_description = "→ Надіслати оффер"
 
     def mark_as_hired(self, request, queryset):
         queryset.update(status='hired')
+        bump_version('documents.Candidate')
         self.message_user(request, f"{queryset.count()} кандидатів прийнято")
 
     mark_as_hired.short_description = "✓ Прийняти"
 
     def mark_as_rejected(self, request, queryset):
         queryset.update(status='rejected')
+        bump_version('documents.Candidate')
         self.message_user(request, f"{queryset.count()} кандидатів відхилено")
 
     mark_as_rejected.short_description = "✗ Відхилити"
\ No newline at end of file
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_vacancy_alter_leaverequest_options_order_candidate'),
+        ('employees', '0004_employee_department_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='candidate',
+            options={'ordering': ['-applied_date'], 'verbose_name': 'Кандидат', 'verbose_name_plural': 'Кандидати'},
+        ),
+        migrations.AlterModelOptions(
+            name='leaverequest',
+            options={'verbose_name': 'Заявка на відпустку', 'verbose_name_plural': 'Заявки на відпустку'},
+        ),
+        migrations.AlterModelOptions(
+            name='order',
+            options={'ordering': ['-order_date'], 'verbose_name': 'Наказ', 'verbose_name_plural': 'Накази'},
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status'], name='document_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['start_date', 'end_date'], name='leave_dates_idx'),
+        ),
+    ]
@@ -21,10 +21,14 @@ class Document(models.Model):
         default='pending',
         verbose_name="Статус"
     )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
 
     class Meta:
         verbose_name = "Документ"
         verbose_name_plural = "Документи"
+        indexes = [
+            models.Index(fields=['status'], name='document_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_document_type_display()} - {self.created_date.date()}"
@@ -67,6 +71,10 @@ class LeaveRequest(models.Model):
     class Meta:
         verbose_name = "Заявка на відпустку"
         verbose_name_plural = "Заявки на відпустку"
+        indexes = [
+            # Відпустки, що перетинають дату або місяць
+            models.Index(fields=['start_date', 'end_date'], name='leave_dates_idx'),
+        ]
 
     # Додайте ці моделі в кінець файлу documents/models.py
 
@@ -1,23 +1,28 @@
 from rest_framework import serializers
+
+from hrm_project.serializers import SparseFieldsMixin
+from employees.serializers import EmployeeSerializer
 from .models import Document, Contract, LeaveRequest
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Document
         fields = '__all__'
 
 
-class ContractSerializer(serializers.ModelSerializer):
+class ContractSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     document_details = DocumentSerializer(source='document', read_only=True)
+    expandable_fields = {'employee': EmployeeSerializer}
 
     class Meta:
         model = Contract
         fields = '__all__'
 
 
-class LeaveRequestSerializer(serializers.ModelSerializer):
+class LeaveRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     document_details = DocumentSerializer(source='document', read_only=True)
+    expandable_fields = {'employee': EmployeeSerializer}
 
     class Meta:
         model = LeaveRequest
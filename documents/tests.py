@@ -1,3 +1,28 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from employees.testing import make_employee
+from .models import DocumentFactory
+
+
+class DocumentApiTest(TestCase):
+    """Списки контрактів і заяв на відпустку API - один запит"""
+
+    @classmethod
+    def setUpTestData(cls):
+        employee = make_employee('worker@company.com', last_name='Тестенко')
+        for i in range(10):
+            DocumentFactory.create_document('contract', employee=employee, position='Інженер',
+                                            salary=Decimal('1000.00'), start_date=date(2024, 1, 1))
+            DocumentFactory.create_document('leave_request', employee=employee, leave_type='vacation',
+                                            reason='Відпочинок', start_date=date(2025, 7, 1),
+                                            end_date=date(2025, 7, 14))
+
+    def test_list_query_count(self):
+        for url, document_type in [('/api/contracts/', 'contract'), ('/api/leave-requests/', 'leave_request')]:
+            with self.subTest(url=url), self.assertNumQueries(1):
+                data = self.client.get(f'{url}?page_size=100').json()
+            self.assertEqual(len(data['results']), 10)
+            self.assertEqual(data['results'][0]['document_details']['document_type'], document_type)
@@ -1,18 +1,20 @@
 from rest_framework import viewsets
+
+from hrm_project.viewsets import ConditionalGetMixin, OptimizedQuerySetMixin
 from .models import Document, Contract, LeaveRequest
 from .serializers import DocumentSerializer, ContractSerializer, LeaveRequestSerializer
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(ConditionalGetMixin, OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
 
 
-class ContractViewSet(viewsets.ModelViewSet):
+class ContractViewSet(OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = Contract.objects.all()
     serializer_class = ContractSerializer
 
 
-class LeaveRequestViewSet(viewsets.ModelViewSet):
+class LeaveRequestViewSet(OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = LeaveRequest.objects.all()
     serializer_class = LeaveRequestSerializer
\ No newline at end of file
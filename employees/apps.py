@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
-    verbose_name = 'Співробітники'
\ No newline at end of file
+    verbose_name = 'Співробітники'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .report_cache import register_invalidation
+        register_invalidation()
\ No newline at end of file
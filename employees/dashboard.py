@@ -0,0 +1,203 @@
+"""
+Дані панелей співробітника та HR
+
+Панель — найвідвідуваніша сторінка (особливо на початку зміни),
+тому всі показники збираються фіксованою кількістю запитів:
+лічильники заявок — умовною агрегацією, години — з денних підсумків,
+непрочитані сповіщення та їх кількість — одним запитом з віконною функцією.
+
+Запити панелей незалежні, тому async-версії (a*_dashboard_data)
+виконують їх одночасно через gather_queries().
+"""
+from datetime import date, timedelta
+
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum, Window
+from django.utils import timezone
+
+from documents.models import LeaveRequest
+from hrm_project.concurrency import gather_queries
+from notifications.models import Notification
+from requests.models import Request
+from timetracking.ingest import pending_event
+from timetracking.models import DailyTimesheet, Presence, TimeRecord, TimeTrackingSystem
+from .models import DepartmentPayroll, Employee
+
+
+def request_stats(employee):
+    """Кількість заявок: всього, на розгляді, схвалених (один запит)"""
+    return Request.objects.filter(employee=employee).aggregate(
+        total_requests=Count('id'),
+        pending_requests=Count('id', filter=Q(current_state__state_type='pending')),
+        approved_requests=Count('id', filter=Q(current_state__state_type='approved')),
+    )
+
+
+def unread_notifications(employee, limit=3):
+    """Останні непрочитані сповіщення та їх загальна кількість (один запит)"""
+    notifications = list(
+        Notification.objects.filter(recipient=employee, is_read=False)
+        .annotate(unread_total=Window(Count('id')))
+        .order_by('-created_at', '-id')[:limit]
+    )
+    unread_count = notifications[0].unread_total if notifications else 0
+    return notifications, unread_count
+
+
+def worked_seconds(employee, today, week_start):
+    """Секунди закритих сесій за сьогодні та за тиждень (один запит)"""
+    totals = DailyTimesheet.objects.filter(employee=employee, date__gte=week_start).aggregate(
+        today=Sum('total_seconds', filter=Q(date=today)),
+        week=Sum('total_seconds'),
+    )
+    return totals['today'] or 0, totals['week'] or 0
+
+
+def _employee_queries(employee, now):
+    """Незалежні запити панелі співробітника {назва: функція без аргументів}"""
+    today = now.date()
+    week_start = today - timedelta(days=today.weekday())
+    return {
+        'request_stats': lambda: request_stats(employee),
+        'recent_requests': lambda: list(
+            Request.objects.filter(employee=employee)
+            .select_related('current_state').order_by('-created_date')[:5]
+        ),
+        'notifications': lambda: unread_notifications(employee),
+        # Поточний запис (якщо є незакритий, зокрема з нічної зміни)
+        'today_record': lambda: TimeTrackingSystem.open_record(employee),
+        'worked': lambda: worked_seconds(employee, today, week_start),
+    }
+
+
+def _employee_context(employee, now, results):
+    recent_notifications, unread_count = results['notifications']
+    today_record = results['today_record']
+    is_clocked_in = today_record is not None
+    today_seconds, week_seconds = results['worked']
+
+    # Якщо зараз на роботі - додати поточні години
+    if is_clocked_in:
+        today_seconds += (now - today_record.clock_in_time).total_seconds()
+
+    return {
+        'employee': employee,
+        **results['request_stats'],
+        'recent_requests': results['recent_requests'],
+        'recent_notifications': recent_notifications,
+        'unread_count': unread_count,
+        'is_clocked_in': is_clocked_in,
+        'today_hours': round(today_seconds / 3600, 1),
+        'week_hours': round(week_seconds / 3600, 1),
+        'today_record': today_record,
+    }
+
+
+def employee_dashboard_data(employee, now=None):
+    """Контекст панелі співробітника"""
+    now = now or timezone.now()
+    queries = _employee_queries(employee, now)
+    return _employee_context(employee, now, {name: query() for name, query in queries.items()})
+
+
+async def aemployee_dashboard_data(employee, now=None):
+    """Контекст панелі співробітника; незалежні запити виконуються одночасно"""
+    now = now or timezone.now()
+    queries = _employee_queries(employee, now)
+    results = await gather_queries(*queries.values())
+    return _employee_context(employee, now, dict(zip(queries, results)))
+
+
+def _hr_queries(today):
+    """Незалежні запити панелі HR {назва: функція без аргументів}"""
+    return {
+        # Статистика (зі зведення по відділах, без перебору співробітників)
+        'totals': lambda: DepartmentPayroll.objects.totals(),
+        'pending_requests': lambda: Request.objects.filter(current_state__state_type='pending').count(),
+        # Співробітники по відділам
+        'departments': lambda: list(DepartmentPayroll.objects.report()),
+        # Останні заявки
+        'recent_requests': lambda: list(
+            Request.objects.select_related('employee', 'current_state').order_by('-created_date')[:10]
+        ),
+        # Відпустки сьогодні
+        'on_leave_today': lambda: LeaveRequest.objects.filter(
+            start_date__lte=today,
+            end_date__gte=today,
+            document__status='approved'
+        ).count(),
+    }
+
+
+def _hr_context(results):
+    totals = results.pop('totals')
+    return {
+        'total_employees': totals['employee_count'],
+        'total_salary': totals['total_salary'],
+        **results,
+        'unread_count': 0,  # HR не має персональних сповіщень в цій реалізації
+    }
+
+
+def hr_dashboard_data(today=None):
+    """Контекст панелі HR"""
+    queries = _hr_queries(today or date.today())
+    return _hr_context({name: query() for name, query in queries.items()})
+
+
+async def ahr_dashboard_data(today=None):
+    """Контекст панелі HR; незалежні запити виконуються одночасно"""
+    queries = _hr_queries(today or date.today())
+    results = await gather_queries(*queries.values())
+    return _hr_context(dict(zip(queries, results)))
+
+
+def _per_employee(queryset, field, aggregate):
+    """Підзапит з агрегатом по записах співробітника з зовнішнього запиту"""
+    return Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by()
+        .values(field).annotate(value=aggregate).values('value')
+    )
+
+
+def dashboard_state(employee, now=None):
+    """
+    Усе, від чого залежить панель, одним запитом (для ETag)
+
+    Кількість і час останньої зміни заявок, сповіщень та записів часу,
+    а також години за сьогодні, які ростуть, поки сесія відкрита.
+    """
+    now = now or timezone.now()
+    today = now.date()
+
+    sources = {
+        'requests': (Request.objects.all(), 'employee'),
+        'notifications': (Notification.objects.all(), 'recipient'),
+        'records': (TimeRecord.objects.all(), 'employee'),
+    }
+    annotations = {}
+    for name, (queryset, field) in sources.items():
+        annotations[f'{name}_count'] = _per_employee(queryset, field, Count('id'))
+        annotations[f'{name}_modified'] = _per_employee(queryset, field, Max('updated_at'))
+    state = Employee.objects.filter(pk=employee.pk).annotate(
+        open_since=Subquery(Presence.objects.filter(employee=OuterRef('pk')).values('since')[:1]),
+        today_seconds=Subquery(
+            DailyTimesheet.objects.filter(employee=OuterRef('pk'), date=today).values('total_seconds')[:1]
+        ),
+        **annotations,
+    ).values('updated_at', 'open_since', 'today_seconds', *annotations).first()
+    if state is None:
+        return None
+
+    # Ще не записана в БД подія (буферизований режим, timetracking.ingest)
+    event = pending_event(employee.pk)
+    today_seconds = state.pop('today_seconds') or 0
+    if event is not None:
+        if event.kind == 'out' and state['open_since']:
+            today_seconds += (event.at - state['open_since']).total_seconds()
+        state['open_since'] = event.at if event.kind == 'in' else None
+        state['pending'] = tuple(event)
+
+    # Так само, як today_hours у employee_dashboard_data()
+    if state['open_since']:
+        today_seconds += (now - state['open_since']).total_seconds()
+    return today, round(today_seconds / 3600, 1), sorted(state.items())
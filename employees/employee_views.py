@@ -1,18 +1,47 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Sum
-from datetime import datetime, date
-from django.utils import timezone
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import condition
+from datetime import datetime
 
-from .models import Employee, SalaryStrategy
 from requests.models import Request, RequestState
 from notifications.models import Notification, NotificationService
-from timetracking.models import TimeRecord, TimeTrackingSystem
-from documents.models import Document, Contract, LeaveRequest
+from timetracking.models import TimeTrackingSystem, DailyTimesheet
+from notifications.unread import get_unread_count
+from hrm_project.conditional import collection_state, not_modified, page_etag, set_validators
+from .dashboard import aemployee_dashboard_data, dashboard_state, employee_dashboard_data
+
+
+def dashboard_etag(request):
+    """ETag панелі: один запит замість побудови всієї сторінки"""
+    employee = request.employee
+    if not employee or request.user.is_superuser or getattr(request.user, 'role', None) == 'hr':
+        return None
+    state = dashboard_state(employee)
+    return page_etag(request, state) if state else None
+
+
+def my_requests_etag(request):
+    """ETag списку заявок (з лічильником сповіщень у меню)"""
+    employee = request.employee
+    if not employee:
+        return None
+    requests_state = collection_state(Request.objects.filter(employee=employee))
+    return page_etag(request, employee.pk, employee.updated_at, get_unread_count(employee.pk), requests_state)
+
+
+def notifications_etag(request):
+    """ETag сторінки сповіщень"""
+    employee = request.employee
+    if not employee:
+        return None
+    notifications_state = collection_state(Notification.objects.filter(recipient=employee))
+    return page_etag(request, employee.pk, employee.updated_at, notifications_state)
 
 
 @login_required
+@condition(etag_func=dashboard_etag)
 def employee_dashboard(request):
     """Панель співробітника з усім функціоналом"""
 
@@ -25,115 +54,60 @@ def employee_dashboard(request):
         messages.warning(request, 'Ви увійшли як адміністратор. Використовуйте /admin/')
         return redirect('/admin/')
 
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, f'Співробітника з email {request.user.email} не знайдено. Зверніться до HR.')
         return redirect('login')
 
-    # Статистика заявок
-    total_requests = Request.objects.filter(employee=employee).count()
-    pending_requests = Request.objects.filter(
-        employee=employee,
-        current_state__state_type='pending'
-    ).count()
-    approved_requests = Request.objects.filter(
-        employee=employee,
-        current_state__state_type='approved'
-    ).count()
+    context = employee_dashboard_data(employee)
 
-    # Останні заявки
-    recent_requests = Request.objects.filter(employee=employee).order_by('-created_date')[:5]
-
-    # Сповіщення
-    recent_notifications = Notification.objects.filter(
-        recipient=employee,
-        is_read=False
-    ).order_by('-created_at')[:3]
+    return render(request, 'employee/dashboard.html', context)
 
-    unread_count = Notification.objects.filter(
-        recipient=employee,
-        is_read=False
-    ).count()
 
-    # Робочий час сьогодні
-    today = timezone.now().date()
-    time_system = TimeTrackingSystem()
+@login_required
+async def employee_dashboard_async(request):
+    """Панель співробітника (async): незалежні запити виконуються одночасно"""
+    user = await request.auser()
+    if getattr(user, 'role', None) == 'hr':
+        return redirect('/admin/')
+    if user.is_superuser:
+        await sync_to_async(messages.warning)(request, 'Ви увійшли як адміністратор. Використовуйте /admin/')
+        return redirect('/admin/')
 
-    # Поточний запис (якщо є незакритий)
-    today_record = TimeRecord.objects.filter(
-        employee=employee,
-        date=today,
-        clock_out_time__isnull=True
-    ).first()
-
-    # Чи на роботі зараз
-    is_clocked_in = today_record is not None
-
-    # Години сьогодні (всі записи)
-    today_hours = 0
-    all_today_records = TimeRecord.objects.filter(employee=employee, date=today)
-    for record in all_today_records:
-        today_hours += record.calculate_hours()
-
-    # Якщо зараз на роботі - додати поточні години
-    if is_clocked_in and today_record:
-        now = timezone.now()
-        current_delta = now - today_record.clock_in_time
-        current_hours = current_delta.total_seconds() / 3600
-        today_hours += current_hours
-
-    today_hours = round(today_hours, 1)
-
-    # Загальні години за тиждень (приблизно)
-    week_start = today - timezone.timedelta(days=today.weekday())
-    week_records = TimeRecord.objects.filter(
-        employee=employee,
-        date__gte=week_start
-    )
-    week_hours = sum([r.calculate_hours() for r in week_records])
-    week_hours = round(week_hours, 1)
+    employee = await sync_to_async(lambda: request.employee or None)()
+    if not employee:
+        await sync_to_async(messages.error)(
+            request, f'Співробітника з email {user.email} не знайдено. Зверніться до HR.'
+        )
+        return redirect('login')
 
-    context = {
-        'employee': employee,
-        'total_requests': total_requests,
-        'pending_requests': pending_requests,
-        'approved_requests': approved_requests,
-        'recent_requests': recent_requests,
-        'recent_notifications': recent_notifications,
-        'unread_count': unread_count,
-        'is_clocked_in': is_clocked_in,
-        'today_hours': today_hours,
-        'week_hours': week_hours,
-        'today_record': today_record,
-    }
+    etag = await sync_to_async(dashboard_etag)(request)
+    response = not_modified(request, etag) if etag else None
+    if response is not None:
+        return response
 
-    return render(request, 'employee/dashboard.html', context)
+    context = await aemployee_dashboard_data(employee)
+    response = await sync_to_async(render)(request, 'employee/dashboard.html', context)
+    return set_validators(response, etag) if etag else response
 
 
 @login_required
 def clock_in(request):
     """Відмітка приходу на роботу"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
     time_system = TimeTrackingSystem()
-    today = date.today()
 
-    # Перевірка чи вже є запис сьогодні
-    existing = TimeRecord.objects.filter(
-        employee=employee,
-        date=today,
-        clock_out_time__isnull=True
-    ).exists()
+    # Повторний прихід відхиляє сам clock_in (блокування й обмеження timerecord_one_open_session);
+    # знімок присутності процесу може не бачити виходу, відміченого в іншому процесі
+    record = time_system.clock_in(employee)
 
-    if existing:
-        messages.warning(request, '⚠️ Ви вже відмітили прихід сьогодні!')
+    if record is None:
+        messages.warning(request, '⚠️ Ви вже відмітили прихід!')
     else:
-        record = time_system.clock_in(employee)
         messages.success(request, f'✅ Прихід зафіксовано о {record.clock_in_time.strftime("%H:%M")}')
 
         # Сповіщення в консоль
@@ -145,9 +119,8 @@ def clock_in(request):
 @login_required
 def clock_out(request):
     """Відмітка виходу з роботи"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
@@ -170,9 +143,8 @@ def clock_out(request):
 @login_required
 def submit_request(request):
     """Подати заявку (відпустка, лікарняний тощо)"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
@@ -200,46 +172,34 @@ def submit_request(request):
         messages.success(request, f'✅ Заявку #{new_request.id} успішно подано! Очікуйте на розгляд HR.')
         return redirect('my_requests')
 
-    unread_count = Notification.objects.filter(
-        recipient=employee,
-        is_read=False
-    ).count()
-
     return render(request, 'employee/submit_request.html', {
         'employee': employee,
-        'unread_count': unread_count
     })
 
 
 @login_required
+@condition(etag_func=my_requests_etag)
 def my_requests(request):
     """Список моїх заявок"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
     requests_list = Request.objects.filter(employee=employee).order_by('-created_date')
 
-    unread_count = Notification.objects.filter(
-        recipient=employee,
-        is_read=False
-    ).count()
-
     return render(request, 'employee/my_requests.html', {
         'employee': employee,
         'requests': requests_list,
-        'unread_count': unread_count
     })
 
 
 @login_required
+@condition(etag_func=notifications_etag)
 def notifications_view(request):
     """Сповіщення співробітника"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
@@ -248,26 +208,22 @@ def notifications_view(request):
         recipient=employee
     ).order_by('-created_at')
 
-    unread_count = notifications.filter(is_read=False).count()
-
     print(f"📬 Показуємо {notifications.count()} сповіщень для {employee.first_name}")
 
     return render(request, 'employee/notifications.html', {
         'employee': employee,
         'notifications': notifications,
-        'unread_count': unread_count
     })
 
 
 @login_required
 def mark_as_read(request, notification_id):
     """Позначити сповіщення як прочитане"""
-    try:
-        notification = Notification.objects.get(id=notification_id)
-        notification.is_read = True
-        notification.save()
+    notification = Notification.objects.filter(id=notification_id, recipient=request.employee)
+    if notification.exists():
+        NotificationService.mark_read(notification)
         messages.success(request, 'Сповіщення позначено як прочитане')
-    except Notification.DoesNotExist:
+    else:
         messages.error(request, 'Сповіщення не знайдено')
 
     return redirect('notifications')
@@ -276,9 +232,8 @@ def mark_as_read(request, notification_id):
 @login_required
 def request_detail(request, request_id):
     """Деталі заявки"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
@@ -289,24 +244,17 @@ def request_detail(request, request_id):
         messages.error(request, 'Заявку не знайдено')
         return redirect('my_requests')
 
-    unread_count = Notification.objects.filter(
-        recipient=employee,
-        is_read=False
-    ).count()
-
     return render(request, 'employee/request_detail.html', {
         'employee': employee,
         'request': req,
-        'unread_count': unread_count
     })
 
 
 @login_required
 def my_salary(request):
     """Перегляд зарплати та бонусів"""
-    try:
-        employee = Employee.objects.get(email=request.user.email)
-    except Employee.DoesNotExist:
+    employee = request.employee
+    if not employee:
         messages.error(request, 'Співробітника не знайдено')
         return redirect('login')
 
@@ -321,6 +269,13 @@ def my_salary(request):
     salary_history = []
     current_date = date.today()
 
+    # Години та дні за всі 6 місяців одним запитом до денних підсумків
+    oldest_month = (current_date.replace(day=1) - timedelta(days=5 * 30)).replace(day=1)
+    monthly_stats = DailyTimesheet.objects.filter(
+        employee=employee,
+        date__gte=oldest_month
+    ).by_month()
+
     # Генеруємо історію за останні 6 місяців
     for i in range(6):
         # Перший день місяця
@@ -339,21 +294,10 @@ def my_salary(request):
 
         total = float(base or 0) + float(bonus_amount)
 
-        # Відпрацьовані години (з TimeRecord)
-        month_start = month_date
-        if month_date.month == 12:
-            month_end = month_date.replace(year=month_date.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            month_end = month_date.replace(month=month_date.month + 1, day=1) - timedelta(days=1)
-
-        records = TimeRecord.objects.filter(
-            employee=employee,
-            date__gte=month_start,
-            date__lte=month_end
-        )
-
-        hours_worked = sum([r.calculate_hours() for r in records])
-        days_worked = records.values('date').distinct().count()
+        # Відпрацьовані години (з денних підсумків)
+        stats = monthly_stats.get(month_date, {'hours': 0, 'days_worked': 0})
+        hours_worked = stats['hours']
+        days_worked = stats['days_worked']
 
         salary_history.append({
             'month': month_name,
@@ -365,17 +309,11 @@ def my_salary(request):
             'days_worked': days_worked,
         })
 
-    unread_count = Notification.objects.filter(
-        recipient=employee,
-        is_read=False
-    ).count()
-
     context = {
         'employee': employee,
         'current_salary': current_salary,
         'strategy': strategy,
         'salary_history': salary_history,
-        'unread_count': unread_count,
     }
 
     return render(request, 'employee/my_salary.html', context)
\ No newline at end of file
@@ -1,15 +1,19 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Sum, Avg
-from datetime import datetime, date, timedelta
+from django.db.models import Count, Avg
+from datetime import date, datetime, timedelta
 
-from .models import Employee, SalaryStrategy
+from .models import Employee
 from requests.models import Request, RequestState
-from notifications.models import Notification, NotificationService
-from timetracking.models import TimeRecord
-from documents.models import Contract, LeaveRequest
-from users.models import HR
+from notifications.models import Notification
+from timetracking.models import DailyTimesheet, TimeTrackingSystem
+from documents.models import Contract
+from hrm_project.exports import EXPORTS, FORMATS, ExportParams, export_lines
+from .dashboard import ahr_dashboard_data, hr_dashboard_data
+from .reporting import report_context
 
 
 def user_is_hr(user):
@@ -24,47 +28,18 @@ def hr_dashboard(request):
         messages.error(request, 'Доступ заборонено. Тільки для HR.')
         return redirect('employee_dashboard')
 
-    # Статистика
-    total_employees = Employee.objects.count()
+    return render(request, 'hr/dashboard.html', hr_dashboard_data())
 
-    pending_requests = Request.objects.filter(
-        current_state__state_type='pending'
-    ).count()
-
-    # Співробітники по відділам
-    departments = Employee.objects.values('department').annotate(
-        count=Count('id')
-    ).order_by('-count')
-
-    # Витрати на зарплати
-    total_salary = sum([emp.get_salary() for emp in Employee.objects.all()])
 
-    # Останні заявки
-    recent_requests = Request.objects.select_related(
-        'employee', 'current_state'
-    ).order_by('-created_date')[:10]
-
-    # Відпустки сьогодні
-    today = date.today()
-    on_leave_today = LeaveRequest.objects.filter(
-        start_date__lte=today,
-        end_date__gte=today,
-        document__status='approved'
-    ).count()
-
-    unread_count = 0  # HR не має персональних сповіщень в цій реалізації
-
-    context = {
-        'total_employees': total_employees,
-        'pending_requests': pending_requests,
-        'departments': departments,
-        'total_salary': total_salary,
-        'recent_requests': recent_requests,
-        'on_leave_today': on_leave_today,
-        'unread_count': unread_count,
-    }
+@login_required
+async def hr_dashboard_async(request):
+    """Панель HR (async): незалежні запити виконуються одночасно"""
+    if not user_is_hr(await request.auser()):
+        await sync_to_async(messages.error)(request, 'Доступ заборонено. Тільки для HR.')
+        return redirect('employee_dashboard')
 
-    return render(request, 'hr/dashboard.html', context)
+    context = await ahr_dashboard_data()
+    return await sync_to_async(render)(request, 'hr/dashboard.html', context)
 
 
 @login_required
@@ -190,14 +165,19 @@ def employee_detail(request, employee_id):
     # Заявки співробітника
     requests_list = Request.objects.filter(employee=employee).order_by('-created_date')[:10]
 
-    # Робочий час за місяць
-    month_start = date.today().replace(day=1)
-    time_records = TimeRecord.objects.filter(
-        employee=employee,
-        date__gte=month_start
-    ).order_by('-date')
+    # Робочий час за місяць (?month=РРРР-ММ, за замовчуванням поточний) - старі місяці з архіву
+    try:
+        month_start = datetime.strptime(request.GET.get('month', ''), '%Y-%m').date()
+    except ValueError:
+        month_start = date.today().replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    time_records = TimeTrackingSystem.get_work_history(employee, month_start, month_end)
 
-    total_hours = sum([record.calculate_hours() for record in time_records])
+    total_hours = DailyTimesheet.objects.filter(
+        employee=employee,
+        date__gte=month_start,
+        date__lte=month_end
+    ).summary()['hours']
 
     # Контракт
     try:
@@ -212,6 +192,9 @@ def employee_detail(request, employee_id):
         'requests': requests_list,
         'time_records': time_records,
         'total_hours': total_hours,
+        'month_start': month_start,
+        'previous_month': (month_start - timedelta(days=1)).replace(day=1),
+        'next_month': month_end + timedelta(days=1) if month_end < date.today() else None,
         'contract': contract,
         'unread_count': unread_count,
     }
@@ -226,40 +209,34 @@ def reports(request):
         messages.error(request, 'Доступ заборонено.')
         return redirect('employee_dashboard')
 
-    # Звіт по відділах
-    departments_report = Employee.objects.values('department').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    context = report_context()
+    context['unread_count'] = 0
 
-    # Витрати на зарплати по відділах
-    salary_by_dept = {}
-    for dept in departments_report:
-        dept_employees = Employee.objects.filter(department=dept['department'])
-        total = sum([emp.get_salary() for emp in dept_employees])
-        salary_by_dept[dept['department']] = total
+    return render(request, 'hr/reports.html', context)
 
-    # Заявки по статусам
-    requests_stats = Request.objects.values('current_state__state_type').annotate(
-        count=Count('id')
-    )
-
-    # Відпустки за місяць
-    month_start = date.today().replace(day=1)
-    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
 
-    leaves_this_month = LeaveRequest.objects.filter(
-        start_date__gte=month_start,
-        start_date__lte=month_end
-    ).count()
-
-    unread_count = 0
-
-    context = {
-        'departments_report': departments_report,
-        'salary_by_dept': salary_by_dept,
-        'requests_stats': requests_stats,
-        'leaves_this_month': leaves_this_month,
-        'unread_count': unread_count,
-    }
-
-    return render(request, 'hr/reports.html', context)
\ No newline at end of file
+@login_required
+def export_data(request, name):
+    """Потокове вивантаження записів часу, заявок або відпусток (CSV / JSON Lines)"""
+    if not user_is_hr(request.user):
+        messages.error(request, 'Доступ заборонено.')
+        return redirect('employee_dashboard')
+    if name not in EXPORTS:
+        raise Http404
+
+    params = ExportParams(data=request.GET)
+    if not params.is_valid():
+        return JsonResponse(params.errors, status=400)
+    export_format = params.validated_data['format']
+
+    response = StreamingHttpResponse(
+        export_lines(
+            name,
+            export_format,
+            date_from=params.validated_data.get('date_from'),
+            date_to=params.validated_data.get('date_to'),
+        ),
+        content_type=FORMATS[export_format],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{name}.{export_format}"'
+    return response
@@ -0,0 +1,75 @@
+import asyncio
+import statistics
+import time
+
+from django.db import transaction
+
+from employees.dashboard import (
+    aemployee_dashboard_data,
+    ahr_dashboard_data,
+    employee_dashboard_data,
+    hr_dashboard_data,
+)
+from employees.models import DepartmentPayroll, Employee
+from .benchmark_dashboard import Command as DashboardBenchmark
+
+
+class Command(DashboardBenchmark):
+    help = (
+        'Порівняти час синхронних та async-панелей співробітника і HR на синтетичних даних '
+        '(дані комітяться, бо паралельні запити йдуть окремими з\'єднаннями, і видаляються після виміру)'
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(employees=200, requests=20, notifications=20, days=30, runs=30)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic():
+            employees = self.populate(options)
+            DepartmentPayroll.rebuild()
+        self.stdout.write(f'📦 Дані створено за {time.perf_counter() - started:.1f} с')
+
+        try:
+            employee = employees[0]
+            for label, sync_build, async_build in [
+                ('Панель співробітника', lambda: employee_dashboard_data(employee),
+                 lambda: aemployee_dashboard_data(employee)),
+                ('Панель HR', hr_dashboard_data, ahr_dashboard_data),
+            ]:
+                sync_timings = self.measure(sync_build, options['runs'])
+                async_timings = asyncio.run(self.ameasure(async_build, options['runs']))
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ {label}: sync {self.summary(sync_timings)}; async {self.summary(async_timings)}'
+                ))
+        finally:
+            started = time.perf_counter()
+            Employee.objects.filter(pk__in=[emp.pk for emp in employees]).delete()
+            self.stdout.write(f'🧹 Дані видалено за {time.perf_counter() - started:.1f} с')
+
+    @staticmethod
+    def measure(build, runs):
+        build()
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            build()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    @staticmethod
+    async def ameasure(build, runs):
+        await build()
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            await build()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    @staticmethod
+    def summary(timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return f'медіана {statistics.median(timings):.2f} мс, p95 {p95:.2f} мс'
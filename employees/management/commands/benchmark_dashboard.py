@@ -0,0 +1,85 @@
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from employees.dashboard import employee_dashboard_data
+from employees.models import Employee
+from notifications.models import Notification
+from requests.models import Request, RequestState
+from timetracking.models import TimeRecord, DailyTimesheet
+
+
+class Command(BaseCommand):
+    help = 'Виміряти час побудови панелі співробітника на синтетичних даних (дані відкочуються)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--requests', type=int, default=50, help='Заявок на співробітника')
+        parser.add_argument('--notifications', type=int, default=100, help='Сповіщень на співробітника')
+        parser.add_argument('--days', type=int, default=60, help='Днів записів часу')
+        parser.add_argument('--runs', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            employees = self.populate(options)
+            self.stdout.write(f'📦 Дані створено за {time.perf_counter() - started:.1f} с')
+
+            employee = employees[0]
+            with CaptureQueriesContext(connection) as queries:
+                employee_dashboard_data(employee)
+
+            timings = []
+            for _ in range(options['runs']):
+                started = time.perf_counter()
+                employee_dashboard_data(employee)
+                timings.append((time.perf_counter() - started) * 1000)
+
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Запитів: {len(queries)}; медіана {statistics.median(timings):.2f} мс; p95 {p95:.2f} мс'
+            ))
+
+            transaction.set_rollback(True)
+
+    def populate(self, options):
+        """Синтетичні дані (bulk_create оминає сигнали, тому підсумки перебудовуються окремо)"""
+        offset = Employee.objects.count()
+        Employee.objects.bulk_create([
+            Employee(first_name='Бенч', last_name=str(i), email=f'bench{offset + i}@company.com',
+                     phone='+380500000000', position='Інженер', department=f'Відділ {i % 10}',
+                     hire_date=date(2024, 1, 1))
+            for i in range(options['employees'])
+        ], batch_size=1000)
+        employees = list(Employee.objects.filter(email__startswith='bench').order_by('id'))
+
+        states = [RequestState.objects.get_or_create(state_type=state)[0]
+                  for state in ('pending', 'approved', 'rejected')]
+        Request.objects.bulk_create([
+            Request(employee=emp, current_state=states[i % len(states)])
+            for emp in employees for i in range(options['requests'])
+        ], batch_size=2000)
+        Notification.objects.bulk_create([
+            Notification(recipient=emp, notification_type='order_status', message='Бенчмарк', is_read=bool(i % 2))
+            for emp in employees for i in range(options['notifications'])
+        ], batch_size=2000)
+
+        today = timezone.now().date()
+        records = []
+        for days_ago in range(options['days']):
+            day = today - timedelta(days=days_ago)
+            clock_in = timezone.make_aware(datetime(day.year, day.month, day.day, 9))
+            records.extend(
+                TimeRecord(employee=emp, date=day, clock_in_time=clock_in,
+                           clock_out_time=clock_in + timedelta(hours=8))
+                for emp in employees
+            )
+        TimeRecord.objects.bulk_create(records, batch_size=2000)
+        DailyTimesheet.rebuild(date_from=today - timedelta(days=options['days']))
+        return employees
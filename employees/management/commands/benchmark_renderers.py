@@ -0,0 +1,79 @@
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from employees.models import Employee, SalaryStrategy
+from employees.serializers import EmployeeSerializer
+from hrm_project.renderers import MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+from timetracking.models import TimeRecord
+from timetracking.serializers import TimeRecordSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Порівняти серіалізацію та рендеринг JSON / orjson / MessagePack на списках '
+        'EmployeeSerializer і TimeRecordSerializer (об\'єкти в пам\'яті, без БД)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        renderers = [('json', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('orjson', ORJSONRenderer()))
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+
+        for label, serializer_class, instances in [
+            ('EmployeeSerializer', EmployeeSerializer, self.employees(options['rows'])),
+            ('TimeRecordSerializer', TimeRecordSerializer, self.time_records(options['rows'])),
+        ]:
+            started = time.perf_counter()
+            data = serializer_class(instances, many=True).data
+            self.stdout.write(f'📦 {label}: {len(data)} рядків серіалізовано за {time.perf_counter() - started:.2f} с')
+
+            for name, renderer in renderers:
+                timings = []
+                for _ in range(options['runs']):
+                    started = time.perf_counter()
+                    content = renderer.render(data)
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ {name}: медіана {statistics.median(timings):.0f} мс; {len(content) / 1024 / 1024:.1f} МБ'
+                ))
+
+    @staticmethod
+    def employees(rows):
+        """Співробітники зі стратегіями обох типів (зарплата - Decimal)"""
+        strategies = [
+            SalaryStrategy(pk=1, strategy_type='fixed', monthly_amount=Decimal('25000.00')),
+            SalaryStrategy(pk=2, strategy_type='bonus', base_salary=Decimal('30000.00'),
+                           bonus_percentage=Decimal('12.50')),
+        ]
+        updated_at = timezone.now()
+        return [
+            Employee(pk=i + 1, first_name='Бенч', last_name=str(i), email=f'bench{i}@company.com',
+                     phone='+380500000000', position='Інженер', department=f'Відділ {i % 10}',
+                     hire_date=date(2024, 1, 1), salary_strategy=strategies[i % 2], updated_at=updated_at)
+            for i in range(rows)
+        ]
+
+    @staticmethod
+    def time_records(rows):
+        """Закриті сесії по 8 годин (aware datetime)"""
+        start = timezone.make_aware(datetime(2025, 1, 1, 9))
+        records = []
+        for i in range(rows):
+            clock_in = start + timedelta(days=i // 1000)
+            records.append(TimeRecord(
+                pk=i + 1, employee_id=i % 1000 + 1, date=clock_in.date(), clock_in_time=clock_in,
+                clock_out_time=clock_in + timedelta(hours=8), updated_at=clock_in + timedelta(hours=8),
+            ))
+        return records
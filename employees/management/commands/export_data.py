@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hrm_project.exports import EXPORTS, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Потоково вивантажити записи часу, заявки або відпустки у CSV / JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=list(EXPORTS))
+        parser.add_argument('--format', dest='export_format', choices=list(FORMATS), default='csv')
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat,
+                            help='Перша дата (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat,
+                            help='Остання дата (YYYY-MM-DD)')
+        parser.add_argument('--output', help='Файл (за замовчуванням - stdout)')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Кількість рядків, що читаються з БД за раз')
+
+    def handle(self, *args, **options):
+        if options['date_from'] and options['date_to'] and options['date_from'] > options['date_to']:
+            raise CommandError('Кінцева дата раніше початкової')
+
+        lines = export_lines(
+            options['name'],
+            options['export_format'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+            chunk_size=options['chunk_size'],
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+            self.stdout.write(self.style.SUCCESS(f'✅ Вивантажено у {options["output"]}'))
+        else:
+            for chunk in lines:
+                self.stdout.write(chunk, ending='')
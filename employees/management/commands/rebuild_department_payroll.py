@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employees.models import DepartmentPayroll
+
+
+class Command(BaseCommand):
+    help = 'Перебудувати зведення зарплат і кількості співробітників по відділах'
+
+    def handle(self, *args, **options):
+        count = DepartmentPayroll.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✅ Зведення перебудовано: {count} відділів'))
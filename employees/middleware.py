@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+
+from .models import Employee
+
+EMPLOYEE_KEY = 'employee_for_user:{}'
+
+
+def get_employee(user):
+    """
+    Співробітник, пов'язаний з користувачем (з кешу)
+
+    Якщо зв'язку ще немає (обліковий запис створено після міграції),
+    співробітник шукається за email і зв'язується з користувачем.
+    """
+    if not user.is_authenticated:
+        return None
+
+    key = EMPLOYEE_KEY.format(user.pk)
+    employee = cache.get(key)
+    if employee is None:
+        employees = Employee.objects.select_related('salary_strategy')
+        employee = employees.filter(user=user).first()
+        if employee is None and user.email:
+            employee = employees.filter(user__isnull=True, email__iexact=user.email).first()
+            if employee is not None:
+                employee.user = user
+                employee.save(update_fields=['user'])
+        if employee is not None:
+            cache.set(key, employee, getattr(settings, 'EMPLOYEE_CACHE_TIMEOUT', 300))
+    return employee
+
+
+def invalidate_employee(*user_ids):
+    """Скинути кеш співробітника для користувачів (після коміту транзакції)"""
+    keys = [EMPLOYEE_KEY.format(user_id) for user_id in user_ids if user_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class EmployeeMiddleware:
+    """Додає до запиту request.employee (завантажується при першому зверненні)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.employee = SimpleLazyObject(lambda: get_employee(request.user))
+        return self.get_response(request)
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:36
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Avg, Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
+
+# Знімок SalaryStrategy.salary_expression() на момент міграції: міграція не
+# залежить від поточного коду моделей
+MONEY_FIELD = models.DecimalField(max_digits=12, decimal_places=2)
+
+
+def salary_expression(prefix):
+    base = Cast(F(f'{prefix}base_salary'), FloatField())
+    bonus = Cast(F(f'{prefix}bonus_percentage'), FloatField())
+    return Case(
+        When(**{f'{prefix}strategy_type': 'fixed'}, then=F(f'{prefix}monthly_amount')),
+        When(**{f'{prefix}strategy_type': 'bonus'}, then=Round(base + base * bonus / Value(100.0), 2)),
+        default=Value(Decimal('0')),
+        output_field=MONEY_FIELD,
+    )
+
+
+def populate_department_payroll(apps, schema_editor):
+    """Початкове заповнення зведення з наявних співробітників"""
+    Employee = apps.get_model('employees', 'Employee')
+    DepartmentPayroll = apps.get_model('employees', 'DepartmentPayroll')
+
+    salary = salary_expression('salary_strategy__')
+    rows = Employee.objects.values('department').annotate(
+        count=Count('id'),
+        total_salary=Coalesce(Sum(salary), Value(Decimal('0')), output_field=MONEY_FIELD),
+        avg_salary=Coalesce(Round(Avg(salary), 2), Value(Decimal('0')), output_field=MONEY_FIELD),
+    ).order_by()
+    DepartmentPayroll.objects.bulk_create([
+        DepartmentPayroll(
+            department=row['department'],
+            employee_count=row['count'],
+            total_salary=row['total_salary'],
+            avg_salary=row['avg_salary'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentPayroll',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(max_length=100, unique=True, verbose_name='Відділ')),
+                ('employee_count', models.PositiveIntegerField(default=0, verbose_name='Співробітників')),
+                ('total_salary', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Загальна зарплата')),
+                ('avg_salary', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Середня зарплата')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Оновлено')),
+            ],
+            options={
+                'verbose_name': 'Зведення по відділу',
+                'verbose_name_plural': 'Зведення по відділах',
+                'ordering': ['-employee_count', 'department'],
+            },
+        ),
+        migrations.RunPython(populate_department_payroll, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def link_users_by_email(apps, schema_editor):
+    """Зв'язати співробітників з користувачами за email (без урахування регістру)"""
+    Employee = apps.get_model('employees', 'Employee')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+    users = {}
+    for user_id, email in User.objects.exclude(email='').order_by('id').values_list('id', 'email'):
+        users.setdefault(email.lower(), user_id)
+
+    employees = []
+    for employee in Employee.objects.filter(user__isnull=True):
+        user_id = users.pop(employee.email.lower(), None)
+        if user_id is not None:
+            employee.user_id = user_id
+            employees.append(employee)
+    Employee.objects.bulk_update(employees, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_departmentpayroll'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee', to=settings.AUTH_USER_MODEL, verbose_name='Користувач'),
+        ),
+        migrations.RunPython(link_users_by_email, migrations.RunPython.noop),
+    ]
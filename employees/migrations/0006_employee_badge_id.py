@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employee_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='badge_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True, verbose_name='Номер перепустки'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_employee_badge_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportsProxy',
+            fields=[
+            ],
+            options={
+                'verbose_name': '📊 Звіти та аналітика',
+                'verbose_name_plural': '📊 Звіти та аналітика',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('employees.employee',),
+        ),
+        migrations.AlterModelOptions(
+            name='salarystrategy',
+            options={'verbose_name': 'Стратегія зарплати', 'verbose_name_plural': 'Стратегії зарплати'},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_reportsproxy_salarystrategy_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salarystrategy',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Оновлено'),
+        ),
+    ]
@@ -1,4 +1,13 @@
-from django.db import models
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Avg, BigIntegerField, Case, Count, ExpressionWrapper, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
+
+# Гроші зберігаються з точністю до копійки
+MONEY_FIELD = models.DecimalField(max_digits=12, decimal_places=2)
+CENT = Decimal('0.01')
 
 
 class SalaryStrategy(models.Model):
@@ -16,15 +25,43 @@ class SalaryStrategy(models.Model):
     # Для зарплати з бонусами
     base_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     bonus_percentage = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    # Входить у ETag співробітників, які показують розраховану зарплату
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
 
     def calculate_salary(self, employee):
         """Розрахунок зарплати (Strategy Pattern)"""
         if self.strategy_type == 'fixed':
             return self.monthly_amount
         elif self.strategy_type == 'bonus':
-            return self.base_salary + (self.base_salary * self.bonus_percentage / 100)
+            salary = self.base_salary + (self.base_salary * self.bonus_percentage / 100)
+            return salary.quantize(CENT, rounding=ROUND_HALF_UP)
         return 0
 
+    @staticmethod
+    def salary_expression(prefix=''):
+        """
+        ORM-вираз, еквівалентний calculate_salary()
+
+        Args:
+            prefix: шлях до стратегії, напр. 'salary_strategy__' для Employee
+
+        Returns:
+            Case-вираз, що рахує зарплату на боці БД
+        """
+        # Точно, як Decimal у calculate_salary(): у цілих (копійки × соті частки відсотка), бо
+        # SQLite рахує десяткові як float; ділення цілих з +5000 - округлення половини вгору
+        base = Cast(Round(F(f'{prefix}base_salary') * Value(100)), BigIntegerField())
+        bonus = Cast(Round(F(f'{prefix}bonus_percentage') * Value(100)), BigIntegerField())
+        cents = (base * Value(10000) + base * bonus + Value(5000)) / Value(10000)
+        return Case(
+            When(**{f'{prefix}strategy_type': 'fixed'}, then=F(f'{prefix}monthly_amount')),
+            When(**{f'{prefix}strategy_type': 'bonus'}, then=ExpressionWrapper(
+                Cast(cents, FloatField()) / Value(100.0), output_field=MONEY_FIELD
+            )),
+            default=Value(Decimal('0')),
+            output_field=MONEY_FIELD,
+        )
+
     def __str__(self):
         return f"{self.get_strategy_type_display()}"
 
@@ -33,6 +70,30 @@ class SalaryStrategy(models.Model):
         verbose_name_plural = "Стратегії зарплати"
 
 
+class EmployeeQuerySet(models.QuerySet):
+    """Запити до співробітників із розрахунком зарплати в БД"""
+
+    def with_salary(self):
+        """Додати анотацію salary (без окремого запиту на стратегію)"""
+        return self.annotate(salary=SalaryStrategy.salary_expression('salary_strategy__'))
+
+    def total_payroll(self):
+        """Загальний фонд оплати праці одним запитом"""
+        salary = SalaryStrategy.salary_expression('salary_strategy__')
+        return self.aggregate(
+            total=Coalesce(Sum(salary), Value(Decimal('0')), output_field=MONEY_FIELD)
+        )['total']
+
+    def payroll_by_department(self):
+        """Кількість, сума та середня зарплата по відділах (один GROUP BY)"""
+        salary = SalaryStrategy.salary_expression('salary_strategy__')
+        return self.values('department').annotate(
+            count=Count('id'),
+            total_salary=Coalesce(Sum(salary), Value(Decimal('0')), output_field=MONEY_FIELD),
+            avg_salary=Coalesce(Round(Avg(salary), 2), Value(Decimal('0')), output_field=MONEY_FIELD),
+        ).order_by('-count', 'department')
+
+
 class Employee(models.Model):
     """Модель співробітника"""
     first_name = models.CharField(max_length=100, verbose_name="Ім'я")
@@ -42,6 +103,10 @@ class Employee(models.Model):
     position = models.CharField(max_length=100, verbose_name="Посада")
     department = models.CharField(max_length=100, verbose_name="Відділ")
     hire_date = models.DateField(verbose_name="Дата найму")
+    # Номер перепустки в журналах турнікетів (timetracking.punches)
+    badge_id = models.CharField(
+        max_length=50, unique=True, null=True, blank=True, verbose_name="Номер перепустки"
+    )
 
     # Strategy Pattern - стратегія розрахунку зарплати
     salary_strategy = models.ForeignKey(
@@ -51,6 +116,19 @@ class Employee(models.Model):
         verbose_name="Стратегія зарплати"
     )
 
+    # Обліковий запис, під яким співробітник входить у систему
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='employee',
+        verbose_name="Користувач"
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    objects = EmployeeQuerySet.as_manager()
+
     def get_salary(self):
         """Отримати зарплату згідно стратегії"""
         if self.salary_strategy:
@@ -62,4 +140,82 @@ class Employee(models.Model):
 
     class Meta:
         verbose_name = "Співробітник"
-        verbose_name_plural = "Співробітники"
\ No newline at end of file
+        verbose_name_plural = "Співробітники"
+        indexes = [
+            models.Index(fields=['department'], name='employee_department_idx'),
+        ]
+
+
+class DepartmentPayrollQuerySet(models.QuerySet):
+    """Читання зведення по відділах"""
+
+    def report(self):
+        """Рядки у форматі Employee.objects.payroll_by_department()"""
+        return self.values(
+            'department', 'total_salary', 'avg_salary', count=F('employee_count')
+        ).order_by('-employee_count', 'department')
+
+    def totals(self):
+        """Загальна кількість співробітників та фонд оплати праці"""
+        return self.aggregate(
+            employee_count=Coalesce(Sum('employee_count'), 0),
+            total_salary=Coalesce(Sum('total_salary'), Value(Decimal('0')), output_field=MONEY_FIELD),
+        )
+
+
+class DepartmentPayroll(models.Model):
+    """Зведення по відділу: кількість співробітників і зарплати"""
+    department = models.CharField(max_length=100, unique=True, verbose_name="Відділ")
+    employee_count = models.PositiveIntegerField(default=0, verbose_name="Співробітників")
+    total_salary = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Загальна зарплата")
+    avg_salary = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Середня зарплата")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    objects = DepartmentPayrollQuerySet.as_manager()
+
+    @classmethod
+    def refresh(cls, departments):
+        """Перерахувати зведення лише для вказаних відділів"""
+        departments = {dept for dept in departments if dept is not None}
+        if not departments:
+            return
+
+        with transaction.atomic():
+            rows = {
+                row['department']: row
+                for row in Employee.objects.filter(department__in=departments).payroll_by_department()
+            }
+            for dept in departments:
+                row = rows.get(dept)
+                if row is None:
+                    cls.objects.filter(department=dept).delete()
+                    continue
+                cls.objects.update_or_create(department=dept, defaults={
+                    'employee_count': row['count'],
+                    'total_salary': row['total_salary'],
+                    'avg_salary': row['avg_salary'],
+                })
+
+    @classmethod
+    def rebuild(cls):
+        """Повністю перебудувати зведення з таблиці співробітників"""
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([
+                cls(
+                    department=row['department'],
+                    employee_count=row['count'],
+                    total_salary=row['total_salary'],
+                    avg_salary=row['avg_salary'],
+                )
+                for row in Employee.objects.payroll_by_department()
+            ])
+        return cls.objects.count()
+
+    def __str__(self):
+        return f"{self.department}: {self.employee_count}"
+
+    class Meta:
+        verbose_name = "Зведення по відділу"
+        verbose_name_plural = "Зведення по відділах"
+        ordering = ['-employee_count', 'department']
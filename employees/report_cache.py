@@ -0,0 +1,107 @@
+import time
+from datetime import date
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from hrm_project.caching import is_process_local
+
+# Моделі, від яких залежать звіти; зміна будь-якої з них інвалідує звіти
+REPORT_MODELS = [
+    'employees.Employee',
+    'employees.SalaryStrategy',
+    'requests.Request',
+    'documents.LeaveRequest',
+    'documents.Document',
+    'timetracking.TimeRecord',
+    'documents.Vacancy',
+    'documents.Candidate',
+]
+
+VERSION_KEY = 'report_version:{}'
+REPORT_KEY = 'report:{}:{}:{}'
+
+
+def _version_key(label):
+    return VERSION_KEY.format(label.lower())
+
+
+def get_versions(labels):
+    """
+    Поточні версії моделей
+
+    Відсутній лічильник ініціалізується часом, а не одиницею, тому після
+    витіснення з кешу нова версія не збігається зі старими ключами звітів.
+    """
+    keys = [_version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(label):
+    """Збільшити версію моделі (після коміту транзакції)"""
+    key = _version_key(label)
+
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+    transaction.on_commit(bump)
+
+
+def _report_timeout():
+    """
+    Час життя кешованого звіту
+
+    Версії змінюються сигналами в процесі, що записав дані. З LocMemCache
+    інші процеси цього не бачать, тому звіт живе лише REPORT_CACHE_LOCAL_TIMEOUT.
+    """
+    timeout = getattr(settings, 'REPORT_CACHE_TIMEOUT', 3600)
+    if is_process_local():
+        timeout = min(timeout, getattr(settings, 'REPORT_CACHE_LOCAL_TIMEOUT', 5))
+    return timeout
+
+
+def cached_report(name, builder, models=None):
+    """
+    Отримати звіт з кешу або побудувати його
+
+    Args:
+        name: унікальна назва звіту
+        builder: функція без аргументів, що будує звіт (має серіалізуватися pickle)
+        models: мітки моделей, від яких залежить звіт (за замовчуванням усі)
+
+    Returns:
+        (звіт, вік кешу в секундах)
+    """
+    versions = get_versions(models or REPORT_MODELS)
+    # Дата входить у ключ: "сьогодні" у звітах змінюється опівночі
+    key = REPORT_KEY.format(name, date.today().isoformat(), '-'.join(str(v) for v in versions))
+
+    entry = cache.get(key)
+    if entry is None:
+        entry = {'built_at': time.time(), 'value': builder()}
+        cache.set(key, entry, _report_timeout())
+
+    return entry['value'], int(time.time() - entry['built_at'])
+
+
+def _invalidate(sender, **kwargs):
+    bump_version(sender._meta.label)
+
+
+def register_invalidation():
+    """Підключити сигнали save/delete усіх моделей звітів"""
+    for label in REPORT_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(_invalidate, sender=model, dispatch_uid=f'report_cache_save_{label}')
+        post_delete.connect(_invalidate, sender=model, dispatch_uid=f'report_cache_delete_{label}')
@@ -0,0 +1,175 @@
+"""
+Єдиний сервіс звітів HR
+
+Усі сторінки звітів (HR /hr/reports/, ReportsAdmin, HRMAdminSite)
+будуються з одного об'єкта Report. Кількість запитів фіксована
+і не залежить від кількості співробітників чи записів часу.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+
+from documents.models import LeaveRequest, Vacancy, Candidate
+from requests.models import Request
+from timetracking.models import TimeRecord, TimeTrackingSystem, session_duration, duration_to_hours
+from timetracking.presence import on_shift_by_department
+from .models import DepartmentPayroll
+from .report_cache import cached_report
+
+
+@dataclass
+class DepartmentStats:
+    """Рядок звіту по відділу"""
+    department: str
+    count: int
+    total_salary: Decimal
+    avg_salary: Decimal
+
+
+@dataclass
+class TopWorker:
+    """Співробітник у топі за відпрацьованими годинами"""
+    employee: object
+    hours: float
+
+
+@dataclass
+class Report:
+    """Звіт HR: відділи, зарплати, заявки, відпустки, робочий час, підбір"""
+    today: date
+    departments: list = field(default_factory=list)
+    requests_by_state: dict = field(default_factory=dict)
+    leaves_this_month: int = 0
+    on_leave_now: int = 0
+    future_leaves: list = field(default_factory=list)
+    total_hours_week: float = 0
+    top_workers: list = field(default_factory=list)
+    active_vacancies: int = 0
+    total_candidates: int = 0
+    new_candidates: int = 0
+
+    @property
+    def total_employees(self):
+        return sum(dept.count for dept in self.departments)
+
+    @property
+    def total_salary(self):
+        return sum((dept.total_salary for dept in self.departments), Decimal('0'))
+
+    @property
+    def total_requests(self):
+        return sum(self.requests_by_state.values())
+
+    def as_context(self):
+        """Контекст для шаблонів admin/reports.html та hr/reports.html"""
+        return {
+            # Відділи та зарплати
+            'salary_by_dept': self.departments,
+            'departments_report': self.departments,
+            'total_employees': self.total_employees,
+            'total_salary': self.total_salary,
+
+            # Заявки
+            'total_requests': self.total_requests,
+            'pending_requests': self.requests_by_state.get('pending', 0),
+            'approved_requests': self.requests_by_state.get('approved', 0),
+            'rejected_requests': self.requests_by_state.get('rejected', 0),
+            'requests_stats': [
+                {'current_state__state_type': state, 'count': count}
+                for state, count in self.requests_by_state.items()
+            ],
+
+            # Відпустки
+            'leaves_this_month': self.leaves_this_month,
+            'on_leave_now': self.on_leave_now,
+            'future_leaves': self.future_leaves,
+
+            # Робочий час
+            'total_hours_week': round(self.total_hours_week, 1),
+            'top_workers': self.top_workers,
+
+            # Вакансії
+            'active_vacancies': self.active_vacancies,
+            'total_candidates': self.total_candidates,
+            'new_candidates': self.new_candidates,
+        }
+
+
+def build_report(today=None):
+    """Побудувати звіт фіксованою кількістю запитів"""
+    today = today or date.today()
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    week_ago = today - timedelta(days=7)
+
+    # Відділи та зарплати (зведення по відділах)
+    departments = [DepartmentStats(**row) for row in DepartmentPayroll.objects.report()]
+
+    # Заявки по статусах
+    requests_by_state = {
+        row['current_state__state_type']: row['count']
+        for row in Request.objects.values('current_state__state_type').annotate(count=Count('id')).order_by()
+    }
+
+    # Відпустки
+    approved = Q(document__status='approved')
+    leaves = LeaveRequest.objects.aggregate(
+        this_month=Count('id', filter=approved & Q(start_date__gte=month_start, start_date__lte=month_end)),
+        on_leave_now=Count('id', filter=approved & Q(start_date__lte=today, end_date__gte=today)),
+    )
+    future_leaves = list(
+        LeaveRequest.objects.filter(approved, start_date__gt=today)
+        .select_related('employee').order_by('start_date')[:10]
+    )
+
+    # Робочий час (лише останній тиждень - пошук за timerecord_date_idx)
+    hours = TimeRecord.objects.filter(date__gte=week_ago).aggregate(
+        week=Sum(session_duration()),
+    )
+    top_workers = [TopWorker(**item) for item in TimeTrackingSystem.top_workers(week_ago, limit=10)]
+
+    # Підбір персоналу
+    vacancies = Vacancy.objects.aggregate(active=Count('id', filter=Q(is_active=True)))
+    candidates = Candidate.objects.aggregate(
+        total=Count('id'),
+        new=Count('id', filter=Q(status='new')),
+    )
+
+    return Report(
+        today=today,
+        departments=departments,
+        requests_by_state=requests_by_state,
+        leaves_this_month=leaves['this_month'],
+        on_leave_now=leaves['on_leave_now'],
+        future_leaves=future_leaves,
+        total_hours_week=duration_to_hours(hours['week']),
+        top_workers=top_workers,
+        active_vacancies=vacancies['active'],
+        total_candidates=candidates['total'],
+        new_candidates=candidates['new'],
+    )
+
+
+def get_report():
+    """
+    Звіт з кешу (див. report_cache) та вік кешу в секундах
+
+    Зміни через сигнали інвалідують звіт одразу; записи без сигналів (.update(),
+    інші процеси з LocMemCache) - після часу життя кешу (report_cache._report_timeout).
+    """
+    return cached_report('reports', build_report)
+
+
+def report_context():
+    """Контекст шаблону звітів разом із віком кешу і тим, хто зараз на роботі"""
+    report, cache_age = get_report()
+    context = report.as_context()
+    context['report_cache_age'] = cache_age
+
+    # Не з кешу звіту: знімок присутності в процесі актуальний на кожен запит
+    by_department = on_shift_by_department()
+    context['on_work_now'] = sum(by_department.values())
+    context['on_work_by_department'] = sorted(by_department.items())
+    return context
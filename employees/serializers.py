@@ -1,20 +1,23 @@
 from rest_framework import serializers
+
+from hrm_project.serializers import SparseFieldsMixin
 from .models import Employee, SalaryStrategy
 
 
-class SalaryStrategySerializer(serializers.ModelSerializer):
+class SalaryStrategySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SalaryStrategy
         fields = '__all__'
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     salary = serializers.SerializerMethodField()
     salary_strategy_details = SalaryStrategySerializer(source='salary_strategy', read_only=True)
 
     class Meta:
         model = Employee
         fields = '__all__'
+        method_sources = {'salary': ['salary_strategy']}
 
     def get_salary(self, obj):
         return obj.get_salary()
\ No newline at end of file
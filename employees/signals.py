@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .middleware import invalidate_employee
+from .models import Employee, SalaryStrategy, DepartmentPayroll
+
+
+@receiver(pre_save, sender=Employee)
+def remember_old_department(sender, instance, **kwargs):
+    """Запам'ятати попередні відділ і користувача, щоб оновити обидва зведення та кеш"""
+    instance._old_department = instance._old_user_id = None
+    if instance.pk:
+        instance._old_department, instance._old_user_id = Employee.objects.filter(
+            pk=instance.pk
+        ).values_list('department', 'user_id').first() or (None, None)
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, **kwargs):
+    DepartmentPayroll.refresh({instance.department, getattr(instance, '_old_department', None)})
+    invalidate_employee(instance.user_id, getattr(instance, '_old_user_id', None))
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    DepartmentPayroll.refresh({instance.department})
+    invalidate_employee(instance.user_id)
+
+
+def strategy_employees(strategy):
+    return Employee.objects.filter(salary_strategy=strategy)
+
+
+@receiver(post_save, sender=SalaryStrategy)
+def strategy_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    employees = strategy_employees(instance)
+    DepartmentPayroll.refresh(employees.values_list('department', flat=True).distinct())
+    invalidate_employee(*employees.filter(user__isnull=False).values_list('user_id', flat=True))
+
+
+@receiver(pre_delete, sender=SalaryStrategy)
+def remember_strategy_departments(sender, instance, **kwargs):
+    """Після видалення стратегії співробітники вже не посилаються на неї"""
+    employees = strategy_employees(instance)
+    instance._departments = set(employees.values_list('department', flat=True).distinct())
+    instance._user_ids = list(employees.filter(user__isnull=False).values_list('user_id', flat=True))
+
+
+@receiver(post_delete, sender=SalaryStrategy)
+def strategy_deleted(sender, instance, **kwargs):
+    DepartmentPayroll.refresh(getattr(instance, '_departments', set()))
+    invalidate_employee(*getattr(instance, '_user_ids', []))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    invalidate_employee(instance.pk)
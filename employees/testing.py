@@ -0,0 +1,19 @@
+"""Спільні заготовки для тестів застосунків"""
+from datetime import date
+
+from .models import Employee
+
+
+def make_employee(email, department='IT', strategy=None, **fields):
+    """Співробітник з усіма обов'язковими полями; fields перевизначають значення за замовчуванням"""
+    return Employee.objects.create(**{
+        'first_name': 'Тест',
+        'last_name': email.split('@')[0],
+        'email': email,
+        'phone': '+380500000000',
+        'position': 'Інженер',
+        'department': department,
+        'hire_date': date(2024, 1, 1),
+        'salary_strategy': strategy,
+        **fields,
+    })
@@ -1,3 +1,907 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from importlib.util import find_spec
+from io import StringIO
+import tempfile
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from .models import Employee, SalaryStrategy, DepartmentPayroll
+from .report_cache import cached_report
+from .reporting import build_report
+from .testing import make_employee
+
+
+class PayrollExpressionTest(TestCase):
+    """Розрахунок зарплати в SQL має збігатися з calculate_salary()"""
+
+    @classmethod
+    def setUpTestData(cls):
+        strategies = [
+            SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('25000.00')),
+            SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('18333.33')),
+            SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal('10001.00'),
+                                          bonus_percentage=Decimal('15.00')),
+            SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal('10000.01'),
+                                          bonus_percentage=Decimal('12.50')),
+            SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal('333.33'),
+                                          bonus_percentage=Decimal('33.33')),
+            SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal('1.35'),
+                                          bonus_percentage=Decimal('10.00')),
+        ]
+        departments = ['IT', 'Design', 'Marketing']
+        for i in range(30):
+            strategy = strategies[i % len(strategies)] if i % 7 else None
+            make_employee(f'user{i}@company.com', departments[i % len(departments)], strategy)
+
+    def test_with_salary_matches_python(self):
+        employees = Employee.objects.with_salary().select_related('salary_strategy')
+        for emp in employees:
+            self.assertEqual(emp.salary, Decimal(emp.get_salary()), emp.email)
+
+    def test_half_cent_rounds_up(self):
+        """Рівно пів копійки (10.125, 1.005, 2.005) - вгору і в SQL, і в Python"""
+        for base, bonus, expected in [('10.00', '1.25', '10.13'), ('1.00', '0.50', '1.01'), ('2.00', '0.25', '2.01')]:
+            strategy = SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal(base),
+                                                     bonus_percentage=Decimal(bonus))
+            employee = make_employee(f'half{base}@company.com', 'Finance', strategy)
+            with self.subTest(base=base, bonus=bonus):
+                self.assertEqual(Decimal(employee.get_salary()), Decimal(expected))
+                self.assertEqual(Employee.objects.with_salary().get(pk=employee.pk).salary, Decimal(expected))
+
+    def test_payroll_by_department_matches_python(self):
+        for dept in Employee.objects.payroll_by_department():
+            employees = Employee.objects.filter(department=dept['department'])
+            total = sum(Decimal(emp.get_salary()) for emp in employees)
+            avg = (total / len(employees)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+            self.assertEqual(dept['count'], len(employees))
+            self.assertEqual(dept['total_salary'], total)
+            self.assertEqual(dept['avg_salary'], avg)
+
+    def test_payroll_by_department_is_single_query(self):
+        with self.assertNumQueries(1):
+            list(Employee.objects.payroll_by_department())
+
+    def test_total_payroll(self):
+        total = sum(Decimal(emp.get_salary()) for emp in Employee.objects.all())
+        self.assertEqual(Employee.objects.total_payroll(), total)
+        self.assertEqual(Employee.objects.none().total_payroll(), Decimal('0'))
+
+
+class DepartmentPayrollTest(TestCase):
+    """Зведення по відділах оновлюється при кожній зміні"""
+
+    def setUp(self):
+        self.fixed = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('20000.00'))
+        self.bonus = SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal('10000.00'),
+                                                   bonus_percentage=Decimal('10.00'))
+
+    def assertSummaryMatches(self):
+        expected = {row['department']: row for row in Employee.objects.payroll_by_department()}
+        actual = {row['department']: row for row in DepartmentPayroll.objects.report()}
+        self.assertEqual(actual, expected)
+
+    def test_create_update_delete(self):
+        first = make_employee('a@company.com', 'IT', self.fixed)
+        make_employee('b@company.com', 'IT', self.bonus)
+        self.assertSummaryMatches()
+        self.assertEqual(DepartmentPayroll.objects.get(department='IT').total_salary, Decimal('31000.00'))
+
+        first.department = 'Design'
+        first.save()
+        self.assertSummaryMatches()
+        self.assertEqual(DepartmentPayroll.objects.get(department='IT').employee_count, 1)
+
+        first.delete()
+        self.assertSummaryMatches()
+        self.assertFalse(DepartmentPayroll.objects.filter(department='Design').exists())
+
+    def test_strategy_changes(self):
+        make_employee('a@company.com', 'IT', self.fixed)
+        make_employee('b@company.com', 'Design', self.fixed)
+
+        self.fixed.monthly_amount = Decimal('21000.00')
+        self.fixed.save()
+        self.assertSummaryMatches()
+        self.assertEqual(DepartmentPayroll.objects.totals()['total_salary'], Decimal('42000.00'))
+
+        self.fixed.delete()
+        self.assertSummaryMatches()
+        self.assertEqual(DepartmentPayroll.objects.totals(), {
+            'employee_count': 2,
+            'total_salary': Decimal('0'),
+        })
+
+    def test_rebuild_command_repairs_drift(self):
+        make_employee('a@company.com', 'IT', self.fixed)
+        make_employee('b@company.com', 'Design', self.bonus)
+        Employee.objects.filter(department='IT').update(department='Marketing')
+        DepartmentPayroll.objects.create(department='Ghost', employee_count=5)
+
+        call_command('rebuild_department_payroll', stdout=StringIO())
+        self.assertSummaryMatches()
+
+
+class ReportCacheTest(TestCase):
+    """Звіт береться з кешу, доки не зміниться пов'язана модель"""
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {'total_employees': Employee.objects.count()}
+
+    def get_report(self):
+        return cached_report('test_report', self.build, models=['employees.Employee'])
+
+    def check_invalidation(self):
+        context, age = self.get_report()
+        self.assertEqual(context['total_employees'], 0)
+        self.assertEqual(age, 0)
+        self.get_report()
+        self.assertEqual(self.builds, 1)
+
+        # Зміна моделі, від якої звіт не залежить
+        with self.captureOnCommitCallbacks(execute=True):
+            SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('1000.00'))
+        self.get_report()
+        self.assertEqual(self.builds, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            employee = make_employee('a@company.com', 'IT')
+        context, _ = self.get_report()
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(context['total_employees'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            employee.delete()
+        context, _ = self.get_report()
+        self.assertEqual(self.builds, 3)
+        self.assertEqual(context['total_employees'], 0)
+
+    def test_locmem_backend(self):
+        self.check_invalidation()
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            with override_settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}):
+                self.check_invalidation()
+
+    def test_locmem_entries_are_short_lived(self):
+        """Версії LocMemCache не бачать записів інших процесів - звіт живе секунди, а не годину"""
+        import time
+        from unittest import mock
+        from .report_cache import _report_timeout
+
+        self.assertEqual(_report_timeout(), 5)
+        self.get_report()
+        # Запис "в іншому процесі": без сигналу, версія тут не змінилася
+        make_employee('a@company.com', 'IT')
+        self.assertEqual(self.get_report()[0]['total_employees'], 0)
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=time.time() + 6):
+            self.assertEqual(self.get_report()[0]['total_employees'], 1)
+
+        with tempfile.TemporaryDirectory() as location:
+            with override_settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}):
+                self.assertEqual(_report_timeout(), 3600)
+
+
+class ReportingServiceTest(TestCase):
+    """Звіт будується фіксованою кількістю запитів"""
+
+    def populate(self, employees_count):
+        from datetime import datetime, timedelta
+        from django.utils import timezone
+        from requests.models import Request, RequestState
+        from timetracking.models import TimeRecord
+
+        strategy = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('1000.00'))
+        offset = Employee.objects.count()
+        Employee.objects.bulk_create([
+            Employee(first_name='Тест', last_name=str(i), email=f'bulk{offset + i}@company.com',
+                     phone='+380500000000', position='Інженер', department=f'Відділ {i % 5}',
+                     hire_date=date(2024, 1, 1), salary_strategy=strategy)
+            for i in range(employees_count)
+        ])
+        DepartmentPayroll.rebuild()
+
+        pending, _ = RequestState.objects.get_or_create(state_type='pending')
+        today = timezone.now().date()
+        clock_in = timezone.make_aware(datetime(today.year, today.month, today.day, 9))
+        employees = list(Employee.objects.order_by('id')[offset:])
+        Request.objects.bulk_create([Request(employee=emp, current_state=pending) for emp in employees])
+        TimeRecord.objects.bulk_create([
+            TimeRecord(employee=emp, date=today, clock_in_time=clock_in,
+                       clock_out_time=clock_in + timedelta(hours=8))
+            for emp in employees
+        ])
+
+    def test_query_count_does_not_depend_on_size(self):
+        self.populate(10)
+        with self.assertNumQueries(8):
+            small = build_report()
+
+        self.populate(10_000)
+        with self.assertNumQueries(8):
+            large = build_report()
+
+        self.assertEqual(small.total_employees, 10)
+        self.assertEqual(large.total_employees, 10_010)
+        self.assertEqual(large.total_salary, Decimal('10010000.00'))
+        self.assertEqual(large.requests_by_state, {'pending': 10_010})
+        self.assertEqual(len(large.top_workers), 10)
+        self.assertEqual(large.as_context()['pending_requests'], 10_010)
+
+    def test_report_context_sees_writes_without_signals(self):
+        import time
+        from unittest import mock
+        from requests.models import Request, RequestState
+        from .reporting import report_context
+
+        cache.clear()
+        self.populate(3)
+        self.assertEqual(report_context()['pending_requests'], 3)
+
+        Request.objects.update(current_state=RequestState.objects.create(state_type='approved'))
+        self.assertEqual(report_context()['pending_requests'], 3)
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=time.time() + 6):
+            self.assertEqual(report_context()['pending_requests'], 0)
+
+
+class EmployeeDashboardTest(TestCase):
+    """Панель співробітника будується фіксованою кількістю запитів"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import datetime, timedelta
+        from django.utils import timezone
+        from notifications.models import Notification
+        from requests.models import Request, RequestState
+        from timetracking.models import TimeRecord
+
+        cls.employee = make_employee('worker@company.com', 'IT')
+        other = make_employee('other@company.com', 'IT')
+        pending = RequestState.objects.create(state_type='pending')
+        approved = RequestState.objects.create(state_type='approved')
+        for state in [pending, pending, approved, None]:
+            Request.objects.create(employee=cls.employee, current_state=state)
+        Request.objects.create(employee=other, current_state=pending)
+
+        for i in range(5):
+            Notification.objects.create(recipient=cls.employee, notification_type='order_status',
+                                        message=f'Сповіщення {i}', is_read=i == 0)
+        Notification.objects.create(recipient=other, notification_type='order_status', message='Чуже')
+
+        cls.now = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        today = cls.now.date()
+        for day in {today, today - timedelta(days=today.weekday())}:
+            clock_in = timezone.make_aware(datetime(day.year, day.month, day.day, 6))
+            TimeRecord.objects.create(employee=cls.employee, date=day, clock_in_time=clock_in,
+                                      clock_out_time=clock_in + timedelta(hours=2))
+        TimeRecord.objects.create(employee=cls.employee, date=today,
+                                  clock_in_time=cls.now - timedelta(minutes=30))
+        cls.week_hours = 2.0 if today.weekday() == 0 else 4.0
+
+    def test_query_count(self):
+        from .dashboard import employee_dashboard_data
+
+        with self.assertNumQueries(5):
+            context = employee_dashboard_data(self.employee, now=self.now)
+            # Шаблон звертається до стану заявок - без додаткових запитів
+            [request.current_state for request in context['recent_requests']]
+
+        self.assertEqual(context['total_requests'], 4)
+        self.assertEqual(context['pending_requests'], 2)
+        self.assertEqual(context['approved_requests'], 1)
+        self.assertEqual(context['unread_count'], 4)
+        self.assertEqual([n.message for n in context['recent_notifications']],
+                         ['Сповіщення 4', 'Сповіщення 3', 'Сповіщення 2'])
+        self.assertTrue(context['is_clocked_in'])
+        self.assertEqual(context['today_hours'], 2.5)
+        self.assertEqual(context['week_hours'], self.week_hours)
+
+    def test_no_notifications(self):
+        from .dashboard import unread_notifications
+
+        employee = make_employee('new@company.com', 'IT')
+        self.assertEqual(unread_notifications(employee), ([], 0))
+
+
+class EmployeePagesConditionalTest(TestCase):
+    """Незмінені сторінки співробітника віддаються як 304 без рендерингу"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from requests.models import RequestState
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user('worker', 'worker@company.com', 'password')
+        self.employee = make_employee('worker@company.com', 'IT')
+        RequestState.objects.create(state_type='pending')
+        self.client.force_login(self.user)
+        # Перша сторінка встановлює CSRF-cookie, від якої залежить ETag
+        self.client.get('/')
+
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def assertNotModified(self, url, etag, modified=False):
+        response = self.client.get(url, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200 if modified else 304)
+
+    def test_dashboard(self):
+        from notifications.models import NotificationService
+        from .dashboard import dashboard_state
+
+        etag = self.etag('/')
+        self.assertNotModified('/', etag)
+        with self.assertNumQueries(1):
+            dashboard_state(self.employee)
+
+        NotificationService.notify(self.employee, 'order_status', 'Сповіщення')
+        self.assertNotModified('/', etag, modified=True)
+
+        # Після відмітки є повідомлення - сторінка рендериться без ETag
+        self.client.get('/clock-in/')
+        response = self.client.get('/', headers={'if_none_match': etag})
+        self.assertContains(response, 'Прихід зафіксовано')
+        self.assertFalse(response.has_header('ETag'))
+        etag = self.etag('/')
+        self.assertNotModified('/', etag)
+
+        self.client.get('/clock-out/')
+        self.assertNotModified('/', etag, modified=True)
+
+    def test_requests_and_notifications(self):
+        from notifications.models import Notification, NotificationService
+
+        requests_etag, notifications_etag = self.etag('/my-requests/'), self.etag('/notifications/')
+        self.assertNotModified('/my-requests/', requests_etag)
+        self.assertNotModified('/notifications/', notifications_etag)
+
+        self.client.post('/submit-request/', {'request_type': 'vacation', 'reason': 'Відпочинок'})
+        self.client.get('/my-requests/')
+        self.assertNotModified('/my-requests/', requests_etag, modified=True)
+        self.assertNotModified('/notifications/', notifications_etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.notify(self.employee, 'order_status', 'Сповіщення')
+        self.assertNotModified('/notifications/', notifications_etag, modified=True)
+
+        notifications_etag = self.etag('/notifications/')
+        NotificationService.mark_read(Notification.objects.all())
+        self.assertNotModified('/notifications/', notifications_etag, modified=True)
+
+
+class EmployeeMiddlewareTest(TestCase):
+    """request.employee береться з кешу і скидається при зміні записів"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user('worker', 'Worker@Company.com', 'password')
+        self.employee = make_employee('worker@company.com', 'IT')
+
+    def test_backfill_migration_links_by_email(self):
+        from importlib import import_module
+        from django.apps import apps
+
+        make_employee('nobody@company.com', 'IT')
+        migration = import_module('employees.migrations.0003_employee_user')
+        migration.link_users_by_email(apps, None)
+
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.user, self.user)
+        self.assertEqual(Employee.objects.filter(user__isnull=True).count(), 1)
+
+    def test_cached_and_invalidated(self):
+        from .middleware import get_employee
+
+        # Перше звернення зв'язує співробітника з користувачем за email
+        self.assertEqual(get_employee(self.user), self.employee)
+        self.employee.refresh_from_db()
+        self.assertEqual(self.employee.user, self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_employee(self.user).department, 'IT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.department = 'Design'
+            self.employee.save()
+        self.assertEqual(get_employee(self.user).department, 'Design')
+
+        strategy = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('100.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.salary_strategy = strategy
+            self.employee.save()
+        self.assertEqual(get_employee(self.user).get_salary(), Decimal('100.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            strategy.monthly_amount = Decimal('200.00')
+            strategy.save()
+        self.assertEqual(get_employee(self.user).get_salary(), Decimal('200.00'))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_employee(self.user).get_salary(), Decimal('200.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.delete()
+        with self.assertNumQueries(2):
+            self.assertIsNone(get_employee(self.user))
+
+    def test_views_use_request_employee(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['employee'], self.employee)
+
+        self.client.get('/clock-in/')
+        self.assertTrue(self.employee.timerecord_set.filter(clock_out_time__isnull=True).exists())
+
+
+class ClockInViewTest(TransactionTestCase):
+    """Повторний прихід вирішує clock_in, а не знімок присутності процесу"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user('worker', 'worker@company.com', 'password')
+        self.employee = make_employee('worker@company.com', 'IT')
+        self.employee.user = self.user
+        self.employee.save()
+
+    def test_clock_in_ignores_stale_presence_snapshot(self):
+        """Вихід, відмічений в іншому процесі (без зміни версії тут), не блокує прихід"""
+        from django.utils import timezone
+        from timetracking.models import Presence
+        from timetracking.presence import is_clocked_in
+
+        self.client.force_login(self.user)
+        self.client.get('/clock-in/')
+        self.assertTrue(is_clocked_in(self.employee.pk))
+
+        # Інший процес: запис закрито, присутність знято, версія в кеші цього процесу та сама
+        self.employee.timerecord_set.update(clock_out_time=timezone.now())
+        Presence.objects.filter(employee=self.employee).delete()
+        self.assertTrue(is_clocked_in(self.employee.pk))
+
+        self.client.get('/clock-in/')
+        self.assertEqual(self.employee.timerecord_set.filter(clock_out_time__isnull=True).count(), 1)
+        self.assertEqual(self.employee.timerecord_set.count(), 2)
+
+
+class QueryPlanTest(TestCase):
+    """Запити сторінок співробітника та HR використовують індекси, а не повне сканування"""
+
+    # Маленькі довідкові таблиці, які дешевше прочитати цілком
+    SMALL_TABLES = {'employees_departmentpayroll', 'requests_requeststate'}
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+        from requests.models import Request, RequestState
+        from notifications.models import NotificationService
+        from timetracking.models import TimeTrackingSystem
+
+        User = get_user_model()
+        cls.user = User.objects.create_user('worker', 'worker@company.com', 'password')
+        cls.hr = User.objects.create_user('hr', 'hr@company.com', 'password', role='hr')
+        strategy = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('1000.00'))
+        cls.employee = make_employee('worker@company.com', 'IT', strategy)
+        cls.employee.user = cls.user
+        cls.employee.save()
+
+        pending = RequestState.objects.create(state_type='pending')
+        RequestState.objects.create(state_type='approved')
+        Request.objects.create(employee=cls.employee, current_state=pending)
+        NotificationService.notify(cls.employee, 'order_status', 'Сповіщення')
+        TimeTrackingSystem().clock_in(cls.employee)
+
+    def full_scans(self, queries):
+        from django.db import connection
+
+        scans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                if not query['sql'].startswith('SELECT'):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    table = detail.split()[1] if detail.startswith('SCAN ') else None
+                    # Підзапити (віконні функції) сканують вже відібрані рядки
+                    if table and 'USING' not in detail and not table.startswith('(') \
+                            and table not in self.SMALL_TABLES | {'CONSTANT'}:
+                        scans.append(f"{detail}\n    {query['sql']}")
+        return scans
+
+    def assertNoFullScans(self, user, urls):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_login(user)
+        for url in urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.assertIn(self.client.get(url).status_code, (200, 302))
+            self.assertEqual(self.full_scans(queries.captured_queries), [], url)
+
+    def test_employee_pages(self):
+        cache.clear()
+        self.assertNoFullScans(self.user, [
+            '/', '/my-requests/', '/notifications/', '/my-salary/', '/submit-request/', '/clock-in/',
+        ])
+
+    def test_hr_pages(self):
+        self.assertNoFullScans(self.hr, [
+            '/hr/', '/hr/pending/', f'/hr/employee/{self.employee.pk}/',
+        ])
+
+    def test_report_hours_use_date_index(self):
+        from timetracking.models import TimeRecord
+
+        plan = TimeRecord.objects.filter(date__gte=date(2025, 1, 1)).explain()
+        self.assertIn('timerecord_date_idx', plan)
+
+
+class OptimizedQuerySetTest(TestCase):
+    """Списки API не виконують запит на кожен об'єкт"""
+
+    def test_related_lookups(self):
+        from rest_framework import serializers
+        from hrm_project.viewsets import related_lookups
+        from requests.models import Request
+        from .serializers import EmployeeSerializer
+
+        class RequestWithEmployeeSerializer(serializers.ModelSerializer):
+            employee_email = serializers.CharField(source='employee.email')
+            employee_details = EmployeeSerializer(source='employee')
+            state = serializers.StringRelatedField(source='current_state')
+
+            class Meta:
+                model = Request
+                fields = ['id', 'employee', 'employee_email', 'employee_details', 'state']
+
+        self.assertEqual(related_lookups(EmployeeSerializer(), Employee), ({'salary_strategy'}, set()))
+        self.assertEqual(
+            related_lookups(RequestWithEmployeeSerializer(), Request),
+            ({'employee', 'employee__salary_strategy', 'current_state'}, set()),
+        )
+
+    def test_employee_list_query_count(self):
+        for i in range(20):
+            strategy = SalaryStrategy.objects.create(strategy_type='bonus', base_salary=Decimal('1000.00'),
+                                                     bonus_percentage=Decimal('10.00'))
+            make_employee(f'user{i}@company.com', 'IT', strategy)
+
+        # Запит валідаторів (ETag) та запит сторінки
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/employees/?page_size=100').json()
+        self.assertEqual(len(data['results']), 20)
+        self.assertEqual(data['results'][0]['salary'], 1100.0)
+        self.assertEqual(data['results'][0]['salary_strategy_details']['strategy_type'], 'bonus')
+
+
+class SparseFieldsTest(TestCase):
+    """?fields=/?omit=/?expand= обмежують і поля відповіді, і колонки запиту"""
+
+    @classmethod
+    def setUpTestData(cls):
+        strategy = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('2000.00'))
+        for i in range(5):
+            make_employee(f'user{i}@company.com', 'IT', strategy)
+
+    def get(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        # Запит валідаторів (ETag) та запит сторінки
+        self.assertEqual(len(queries), 2)
+        return response.json()['results'], queries[1]['sql']
+
+    def test_fields(self):
+        results, sql = self.get('/api/employees/?fields=id,email,department,salary')
+        self.assertEqual(set(results[0]), {'id', 'email', 'department', 'salary'})
+        self.assertEqual(results[0]['salary'], 2000.0)
+        self.assertNotIn('"phone"', sql)
+        self.assertIn('employees_salarystrategy', sql)
+
+        results, sql = self.get('/api/employees/?fields=id,email')
+        self.assertEqual(set(results[0]), {'id', 'email'})
+        self.assertNotIn('employees_salarystrategy', sql)
+        self.assertNotIn('"first_name"', sql)
+
+    def test_omit(self):
+        results, sql = self.get('/api/employees/?omit=salary,salary_strategy_details,phone')
+        self.assertNotIn('salary', results[0])
+        self.assertNotIn('phone', results[0])
+        self.assertIn('salary_strategy', results[0])
+        self.assertNotIn('"phone"', sql)
+
+    def test_expand(self):
+        from timetracking.models import TimeTrackingSystem
+
+        TimeTrackingSystem().clock_in(Employee.objects.first())
+        results, sql = self.get('/api/time-records/?fields=id,hours_worked&expand=employee')
+        self.assertEqual(set(results[0]), {'id', 'hours_worked', 'employee'})
+        self.assertEqual(results[0]['employee']['salary'], 2000.0)
+
+    def test_unknown_fields(self):
+        for query in ['fields=id,password', 'omit=nothing', 'expand=department']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/employees/?{query}').status_code, 400)
+
+
+class EmployeeConditionalGetTest(TestCase):
+    """ETag співробітника враховує стратегію, з якої розраховується зарплата"""
+
+    def setUp(self):
+        self.strategy = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('2000.00'))
+        self.employee = make_employee('worker@company.com', 'IT', self.strategy)
+
+    def assertStrategyEditRefreshes(self, url, read_salary):
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, headers={'if_none_match': etag}).status_code, 304)
+
+        self.strategy.monthly_amount = Decimal('2500.00')
+        self.strategy.save()
+        response = self.client.get(url, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(read_salary(response.json()), 2500.0)
+
+    def test_list(self):
+        self.assertStrategyEditRefreshes('/api/employees/', lambda data: data['results'][0]['salary'])
+
+    def test_detail(self):
+        self.assertStrategyEditRefreshes(f'/api/employees/{self.employee.pk}/', lambda data: data['salary'])
+
+    def test_expand(self):
+        from timetracking.models import TimeTrackingSystem
+
+        TimeTrackingSystem().clock_in(self.employee)
+        self.assertStrategyEditRefreshes(
+            '/api/time-records/?expand=employee', lambda data: data['results'][0]['employee']['salary']
+        )
+
+    def test_validators_do_not_add_queries(self):
+        etag = self.client.get('/api/employees/')['ETag']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/employees/', headers={'if_none_match': etag}).status_code, 304)
+
+
+class ExportTest(TestCase):
+    """Потокове вивантаження записів часу, заявок і відпусток"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from datetime import datetime, timedelta
+        from django.contrib.auth import get_user_model
+        from django.utils import timezone
+        from documents.models import DocumentFactory
+        from requests.models import Request, RequestState
+        from timetracking.models import TimeRecord
+
+        User = get_user_model()
+        cls.hr = User.objects.create_user('hr', 'hr@company.com', 'password', role='hr')
+        cls.user = User.objects.create_user('worker', 'worker@company.com', 'password')
+        employee = make_employee('worker@company.com', 'IT')
+
+        for day in range(1, 6):
+            clock_in = timezone.make_aware(datetime(2025, 3, day, 9))
+            TimeRecord.objects.create(employee=employee, date=clock_in.date(), clock_in_time=clock_in,
+                                      clock_out_time=clock_in + timedelta(hours=7, minutes=30))
+        TimeRecord.objects.create(employee=employee, date=date(2025, 3, 6),
+                                  clock_in_time=timezone.make_aware(datetime(2025, 3, 6, 9)))
+
+        Request.objects.create(employee=employee, current_state=RequestState.objects.create(state_type='pending'),
+                               start_date=date(2025, 4, 1), end_date=date(2025, 4, 10), reason='Море, "сонце"')
+        for start in (date(2025, 2, 20), date(2025, 3, 20)):
+            DocumentFactory.create_document('leave_request', employee=employee, leave_type='vacation',
+                                            reason='Відпочинок', start_date=start, end_date=start + timedelta(days=13))
+
+    def export(self, url):
+        self.client.force_login(self.hr)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_time_records_csv(self):
+        import csv
+
+        url = '/hr/export/time-records/?date_from=2025-03-02&date_to=2025-03-06'
+        rows = list(csv.DictReader(self.export(url).splitlines()))
+        self.assertEqual([row['date'] for row in rows], [f'2025-03-0{day}' for day in range(2, 7)])
+        self.assertEqual(rows[0]['hours'], '7.5')
+        self.assertEqual(rows[0]['employee_email'], 'worker@company.com')
+        self.assertEqual(rows[-1]['hours'], '')
+
+    def test_requests_and_leaves_jsonl(self):
+        import json
+
+        requests = [json.loads(line) for line in self.export('/hr/export/requests/?format=jsonl').splitlines()]
+        self.assertEqual(len(requests), 1)
+        self.assertEqual((requests[0]['state'], requests[0]['days']), ('pending', 10))
+        self.assertEqual(requests[0]['reason'], 'Море, "сонце"')
+
+        url = '/hr/export/leaves/?format=jsonl&date_from=2025-03-01&date_to=2025-03-10'
+        leaves = [json.loads(line) for line in self.export(url).splitlines()]
+        self.assertEqual([(leave['start_date'], leave['days']) for leave in leaves], [('2025-02-20', 14)])
+
+    def test_invalid_requests(self):
+        self.client.force_login(self.hr)
+        self.assertEqual(self.client.get('/hr/export/salaries/').status_code, 404)
+        for query in ['format=xml', 'date_from=вчора', 'date_from=2025-03-02&date_to=2025-03-01']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/hr/export/requests/?{query}').status_code, 400)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/hr/export/requests/').status_code, 302)
+
+    def test_command(self):
+        import os
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.csv')
+            call_command('export_data', 'time-records', '--from', '2025-03-05', '--output', path,
+                         '--chunk-size', '1', stdout=StringIO())
+            with open(path, encoding='utf-8') as output:
+                self.assertEqual(len(output.read().splitlines()), 3)
+
+        stdout = StringIO()
+        call_command('export_data', 'leaves', '--format', 'jsonl', stdout=stdout)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 2)
+
+
+class AsyncDashboardTest(TestCase):
+    """Async-панелі збігаються з синхронними"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.contrib.auth import get_user_model
+        from notifications.models import NotificationService
+        from requests.models import Request, RequestState
+        from timetracking.models import TimeTrackingSystem
+
+        User = get_user_model()
+        cls.user = User.objects.create_user('worker', 'worker@company.com', 'password')
+        cls.hr = User.objects.create_user('hr', 'hr@company.com', 'password', role='hr')
+        strategy = SalaryStrategy.objects.create(strategy_type='fixed', monthly_amount=Decimal('1000.00'))
+        cls.employee = make_employee('worker@company.com', 'IT', strategy)
+        cls.employee.user = cls.user
+        cls.employee.save()
+
+        pending = RequestState.objects.create(state_type='pending')
+        for _ in range(3):
+            Request.objects.create(employee=cls.employee, current_state=pending)
+        NotificationService.notify(cls.employee, 'order_status', 'Сповіщення')
+        TimeTrackingSystem().clock_in(cls.employee)
+
+    def test_same_context(self):
+        from asgiref.sync import async_to_sync
+        from django.utils import timezone
+        from .dashboard import (aemployee_dashboard_data, ahr_dashboard_data,
+                                employee_dashboard_data, hr_dashboard_data)
+
+        now = timezone.now()
+        self.assertEqual(async_to_sync(aemployee_dashboard_data)(self.employee, now=now),
+                         employee_dashboard_data(self.employee, now=now))
+        context = async_to_sync(ahr_dashboard_data)()
+        self.assertEqual(context, hr_dashboard_data())
+        self.assertEqual((context['total_employees'], context['pending_requests']), (1, 3))
+
+    async def test_views(self):
+        await self.async_client.aforce_login(self.user)
+        await self.async_client.get('/async/')  # встановлює CSRF-cookie, від якої залежить ETag
+        response = await self.async_client.get('/async/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_requests'], 3)
+        self.assertTrue(response.context['is_clocked_in'])
+        response = await self.async_client.get('/async/', headers={'if_none_match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual((await self.async_client.get('/hr/async/')).status_code, 302)
+
+        await self.async_client.aforce_login(self.hr)
+        response = await self.async_client.get('/hr/async/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['pending_requests'], 3)
+        self.assertEqual((await self.async_client.get('/async/')).status_code, 302)
+
+
+class GatherQueriesTest(TransactionTestCase):
+    """Поза транзакцією запити виконуються в окремих потоках з власними з'єднаннями"""
+
+    def test_parallel(self):
+        import threading
+        from asgiref.sync import async_to_sync
+        from hrm_project.concurrency import gather_queries
+
+        make_employee('worker@company.com', 'IT')
+
+        def query():
+            return threading.get_ident(), Employee.objects.count()
+
+        results = async_to_sync(gather_queries)(query, query, query)
+        self.assertEqual([count for _, count in results], [1, 1, 1])
+        self.assertNotIn(threading.get_ident(), {thread for thread, _ in results})
+
+
+class RendererTest(TestCase):
+    """orjson і MessagePack дають ті самі значення, що й стандартний JSON"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from django.utils import timezone
+        from timetracking.models import TimeRecord
+
+        strategy = SalaryStrategy.objects.create(
+            strategy_type='bonus', base_salary=Decimal('1234.56'), bonus_percentage=Decimal('7.25')
+        )
+        cls.employee = make_employee('worker@company.com', 'IT', strategy)
+        clock_in = timezone.now().replace(microsecond=123456)
+        TimeRecord.objects.create(employee=cls.employee, date=clock_in.date(), clock_in_time=clock_in,
+                                  clock_out_time=clock_in + timedelta(hours=8))
+
+    def test_orjson_matches_json(self):
+        from rest_framework.renderers import JSONRenderer
+        from hrm_project.renderers import ORJSONRenderer
+        from timetracking.models import TimeRecord
+        from timetracking.serializers import TimeRecordSerializer
+        from .serializers import EmployeeSerializer
+
+        payloads = [
+            EmployeeSerializer(Employee.objects.all(), many=True).data,
+            TimeRecordSerializer(TimeRecord.objects.all(), many=True).data,
+            # Значення, які серіалізатори віддають як є
+            {'salary': self.employee.get_salary(), 'at': self.employee.updated_at, 'text': 'a\u2028b'},
+            {0: ['помилка'], 2: {'employee': ['невідомий']}},
+        ]
+        for data in payloads:
+            with self.subTest(data=data):
+                self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+        response = self.client.get('/api/employees/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['results'][0]['salary'], 1324.07)
+
+    @skipUnless(find_spec('msgpack'), 'msgpack не встановлено')
+    def test_msgpack(self):
+        import msgpack
+
+        accept = {'accept': 'application/msgpack'}
+        for url in ['/api/employees/', '/api/time-records/', f'/api/employees/{self.employee.pk}/']:
+            with self.subTest(url=url):
+                response = self.client.get(url, headers=accept)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], 'application/msgpack')
+                self.assertEqual(msgpack.unpackb(response.content), self.client.get(url).json())
+                # ETag залежить від формату
+                self.assertNotEqual(response['ETag'], self.client.get(url)['ETag'])
+
+        response = self.client.post(
+            '/api/time-records/bulk/',
+            msgpack.packb([{'employee': self.employee.pk, 'clock_in_time': '2025-03-10T10:00:00+02:00'}]),
+            content_type='application/msgpack', headers=accept,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(msgpack.unpackb(response.content)['results'][0]['status'], 'created')
+
+        response = self.client.post('/api/time-records/bulk/', b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, 400)
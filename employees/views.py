@@ -1,13 +1,15 @@
 from rest_framework import viewsets
+
+from hrm_project.viewsets import ConditionalGetMixin, OptimizedQuerySetMixin
 from .models import Employee, SalaryStrategy
 from .serializers import EmployeeSerializer, SalaryStrategySerializer
 
 
-class SalaryStrategyViewSet(viewsets.ModelViewSet):
+class SalaryStrategyViewSet(OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = SalaryStrategy.objects.all()
     serializer_class = SalaryStrategySerializer
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ConditionalGetMixin, OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
\ No newline at end of file
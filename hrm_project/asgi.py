@@ -3,6 +3,9 @@ ASGI config for hrm_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Async-панелі (/async/ та /hr/async/) найкраще обслуговувати через ASGI,
+наприклад: uvicorn hrm_project.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,9 @@
+"""Властивості налаштованого кешу"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_process_local(alias='default'):
+    """Чи кеш свій у кожного процесу: його записів не бачать інші воркери й команди manage.py"""
+    return isinstance(caches[alias], (LocMemCache, DummyCache))
@@ -0,0 +1,44 @@
+"""
+Одночасне виконання незалежних запитів в async-views
+
+Async ORM Django (aget, acount, aaggregate...) виконує всі запити в одному
+потоці (sync_to_async з thread_sensitive=True), тому asyncio.gather над ними
+запити не розпаралелює. gather_queries() запускає кожну функцію в окремому
+потоці з власним з'єднанням із БД.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection
+
+
+def _in_transaction():
+    return connection.in_atomic_block
+
+
+def _own_connection(function):
+    """Виконати функцію з власним з'єднанням потоку (з урахуванням CONN_MAX_AGE, як у запиті)"""
+    def run():
+        close_old_connections()
+        try:
+            return function()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def gather_queries(*functions):
+    """
+    Виконати незалежні синхронні функції із запитами одночасно
+
+    Усередині транзакції (наприклад, у тестах) інші з'єднання не бачать
+    її змін, тому функції виконуються послідовно в потоці транзакції.
+
+    Returns:
+        список результатів у порядку функцій
+    """
+    if await sync_to_async(_in_transaction)():
+        return [await sync_to_async(function)() for function in functions]
+    return list(await asyncio.gather(*(
+        sync_to_async(_own_connection(function), thread_sensitive=False)() for function in functions
+    )))
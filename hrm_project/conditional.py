@@ -0,0 +1,55 @@
+"""
+Умовні GET-запити (ETag / Last-Modified)
+
+Валідатори рахуються дешевими запитами (для API-списків - рядки поточної
+сторінки, для сторінок співробітника - кількість і найпізніший updated_at
+його записів), тому незмінений ресурс отримує 304 без серіалізації
+та рендерингу шаблону.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def collection_state(queryset, field='updated_at'):
+    """Кількість записів і час останньої зміни (один запит; для невеликих вибірок)"""
+    state = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max(field))
+    return state['count'], state['last_modified']
+
+
+def make_etag(*parts):
+    """ETag із значень, від яких залежить відповідь"""
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def not_modified(request, etag, last_modified=None):
+    """Відповідь 304, якщо у клієнта актуальна версія, інакше None"""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified=None):
+    """Додати ETag і Last-Modified до успішної відповіді"""
+    if response.status_code == 200:
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def page_etag(request, *parts):
+    """
+    ETag HTML-сторінки користувача
+
+    Враховує користувача та CSRF-cookie (токени форм на сторінці).
+    None, якщо є ще не показані повідомлення: сторінку треба рендерити.
+    """
+    if len(get_messages(request)):
+        return None
+    return make_etag(request.user.pk, request.COOKIES.get(settings.CSRF_COOKIE_NAME), *parts)
@@ -0,0 +1,247 @@
+"""
+Потокове вивантаження даних у CSV та JSON Lines
+
+Рядки читаються з БД через values_list(...).iterator(chunk_size=...)
+і одразу записуються у відповідь (StreamingHttpResponse) або файл,
+тому пам'ять не залежить від кількості рядків. Записи часу, перенесені
+в архів (TimeRecordArchive), читаються посегментно перед таблицею.
+"""
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from rest_framework import serializers
+
+from documents.models import LeaveRequest
+from requests.models import Request
+from timetracking.models import TimeRecord, TimeRecordArchive, duration_to_hours, session_duration
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def _hours(duration):
+    return duration_to_hours(duration) if duration is not None else None
+
+
+def _days(start_date, end_date):
+    return (end_date - start_date).days + 1 if start_date and end_date else None
+
+
+def _on_dates(field):
+    """Записи з датою field у періоді"""
+    def date_range(queryset, date_from, date_to):
+        if date_from:
+            queryset = queryset.filter(**{f'{field}__gte': date_from})
+        if date_to:
+            queryset = queryset.filter(**{f'{field}__lte': date_to})
+        return queryset
+    return date_range
+
+
+def _archived_time_records(date_from, date_to):
+    """Рядки вивантаження 'time-records' з архівних сегментів періоду (помісячно)"""
+    segments = TimeRecordArchive.objects.select_related('employee').order_by('month', 'employee_id')
+    if date_from:
+        segments = segments.filter(month__gte=date_from.replace(day=1))
+    if date_to:
+        segments = segments.filter(month__lte=date_to)
+    for segment in segments.iterator(chunk_size=100):
+        for record in segment.records():
+            if (date_from and record.date < date_from) or (date_to and record.date > date_to):
+                continue
+            yield (
+                record.pk, segment.employee_id, segment.employee.email, record.date,
+                record.clock_in_time, record.clock_out_time, _hours(record.clock_out_time - record.clock_in_time),
+            )
+
+
+def _created_on_dates(field):
+    """Записи, створені в період (межі - початок доби, щоб працював індекс по field)"""
+    def date_range(queryset, date_from, date_to):
+        if date_from:
+            queryset = queryset.filter(**{f'{field}__gte': timezone.make_aware(datetime.combine(date_from, time.min))})
+        if date_to:
+            next_day = datetime.combine(date_to + timedelta(days=1), time.min)
+            queryset = queryset.filter(**{f'{field}__lt': timezone.make_aware(next_day)})
+        return queryset
+    return date_range
+
+
+def _overlapping(start_field, end_field):
+    """Записи, період яких перетинається з заданим"""
+    def date_range(queryset, date_from, date_to):
+        if date_from:
+            queryset = queryset.filter(**{f'{end_field}__gte': date_from})
+        if date_to:
+            queryset = queryset.filter(**{f'{start_field}__lte': date_to})
+        return queryset
+    return date_range
+
+
+class Export:
+    """
+    Опис вивантаження
+
+    Args:
+        queryset: вихідні записи
+        columns: [(назва колонки, lookup або назва анотації)]
+        date_range: функція (queryset, date_from, date_to) -> queryset
+        annotations: вирази ORM для обчислюваних у БД значень
+        computed: [(назва колонки, функція, [lookup-и аргументів])] - обчислюються
+            з рядка в Python; аргументи читаються, навіть якщо їх немає серед колонок
+        archived: функція (date_from, date_to) -> рядки (у порядку header) з архіву,
+            що йдуть перед рядками queryset
+    """
+
+    def __init__(self, queryset, columns, date_range, annotations=None, computed=(), archived=None):
+        self.queryset = queryset
+        self.columns = columns
+        self.date_range = date_range
+        self.annotations = annotations or {}
+        self.computed = computed
+        self.archived = archived
+
+    @property
+    def header(self):
+        return [name for name, _ in self.columns] + [name for name, _, _ in self.computed]
+
+    def rows(self, date_from=None, date_to=None, chunk_size=None):
+        """Рядки вивантаження (кортежі у порядку header), читаються порціями"""
+        lookups = [lookup for _, lookup in self.columns]
+        lookups += list(dict.fromkeys(
+            lookup for _, _, arguments in self.computed for lookup in arguments if lookup not in lookups
+        ))
+        positions = {lookup: index for index, lookup in enumerate(lookups)}
+        width = len(self.columns)
+        if self.archived:
+            yield from self.archived(date_from, date_to)
+
+        queryset = self.date_range(self.queryset, date_from, date_to)
+        rows = queryset.annotate(**self.annotations).order_by('pk').values_list(*lookups).iterator(
+            chunk_size=chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+        )
+        for row in rows:
+            yield row[:width] + tuple(
+                function(*(row[positions[lookup]] for lookup in arguments))
+                for _, function, arguments in self.computed
+            )
+
+
+EXPORTS = {
+    'time-records': Export(
+        TimeRecord.objects.all(),
+        columns=[
+            ('id', 'id'),
+            ('employee_id', 'employee_id'),
+            ('employee_email', 'employee__email'),
+            ('date', 'date'),
+            ('clock_in_time', 'clock_in_time'),
+            ('clock_out_time', 'clock_out_time'),
+        ],
+        annotations={'duration': session_duration()},
+        computed=[('hours', _hours, ['duration'])],
+        date_range=_on_dates('date'),
+        archived=_archived_time_records,
+    ),
+    'requests': Export(
+        Request.objects.all(),
+        columns=[
+            ('id', 'id'),
+            ('employee_id', 'employee_id'),
+            ('employee_email', 'employee__email'),
+            ('request_type', 'request_type'),
+            ('state', 'current_state__state_type'),
+            ('start_date', 'start_date'),
+            ('end_date', 'end_date'),
+            ('created_date', 'created_date'),
+            ('reason', 'reason'),
+            ('hr_comment', 'hr_comment'),
+        ],
+        computed=[('days', _days, ['start_date', 'end_date'])],
+        date_range=_created_on_dates('created_date'),
+    ),
+    'leaves': Export(
+        LeaveRequest.objects.all(),
+        columns=[
+            ('id', 'id'),
+            ('employee_id', 'employee_id'),
+            ('employee_email', 'employee__email'),
+            ('leave_type', 'leave_type'),
+            ('status', 'document__status'),
+            ('start_date', 'start_date'),
+            ('end_date', 'end_date'),
+            ('created_date', 'document__created_date'),
+            ('reason', 'reason'),
+        ],
+        computed=[('days', _days, ['start_date', 'end_date'])],
+        date_range=_overlapping('start_date', 'end_date'),
+    ),
+}
+
+
+class ExportParams(serializers.Serializer):
+    """Параметри вивантаження: ?format=csv|jsonl&date_from=&date_to="""
+    format = serializers.ChoiceField(choices=list(FORMATS), default='csv')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': 'Кінцева дата раніше початкової.'})
+        return attrs
+
+
+def _value(value):
+    """Дати-час - у поточному часовому поясі"""
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat()
+    return value
+
+
+class _Echo:
+    """"Файл" для csv.writer, що повертає рядок замість запису"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_value(value) for value in row])
+
+
+def _jsonl_lines(header, rows):
+    for row in rows:
+        yield json.dumps(
+            dict(zip(header, (_value(value) for value in row))), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+
+
+def export_lines(name, export_format='csv', date_from=None, date_to=None, chunk_size=None, lines_per_chunk=500):
+    """
+    Текст вивантаження порціями по lines_per_chunk рядків
+
+    Returns:
+        генератор рядків (str) для StreamingHttpResponse або запису у файл
+    """
+    export = EXPORTS[name]
+    header = export.header
+    rows = export.rows(date_from, date_to, chunk_size)
+    lines = _csv_lines(header, rows) if export_format == 'csv' else _jsonl_lines(header, rows)
+
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= lines_per_chunk:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
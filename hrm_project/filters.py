@@ -0,0 +1,32 @@
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+
+class QueryFilter(serializers.Serializer):
+    """
+    Фільтр списку API за параметрами запиту
+
+    Кожне поле - параметр запиту; його source - lookup ORM (за замовчуванням
+    назва поля). Для нестандартної умови оголосіть метод filter_<source>.
+    Невалідні значення дають відповідь 400, невідомі параметри ігноруються.
+    """
+
+    def filter_queryset(self, queryset):
+        for lookup, value in self.validated_data.items():
+            if value is None:
+                continue
+            method = getattr(self, f'filter_{lookup}', None)
+            queryset = method(queryset, value) if method else queryset.filter(**{lookup: value})
+        return queryset
+
+
+class QueryFilterBackend(BaseFilterBackend):
+    """Застосовує query_filter_class viewset-а до списку"""
+
+    def filter_queryset(self, request, queryset, view):
+        filter_class = getattr(view, 'query_filter_class', None)
+        if filter_class is None or getattr(view, 'action', None) != 'list':
+            return queryset
+        query_filter = filter_class(data=request.query_params)
+        query_filter.is_valid(raise_exception=True)
+        return query_filter.filter_queryset(queryset)
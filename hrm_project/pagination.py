@@ -0,0 +1,14 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Курсорна (keyset) пагінація для всіх API-ендпоінтів
+
+    Сторінка вибирається умовою WHERE id < курсор ... LIMIT n по первинному
+    ключу, тому час відповіді не залежить від глибини, а COUNT(*) не виконується.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
@@ -0,0 +1,32 @@
+"""
+Швидкі парсери тіла запиту API: JSON через orjson та MessagePack
+
+Пара до hrm_project.renderers; orjson і msgpack - необов'язкові залежності.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import msgpack, orjson
+
+
+class ORJSONParser(JSONParser):
+    """application/json через orjson (без orjson - стандартний JSONParser)"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(BaseParser):
+    """application/msgpack"""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, TypeError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
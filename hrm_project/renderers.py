@@ -0,0 +1,65 @@
+"""
+Швидкі рендерери API: JSON через orjson та MessagePack
+
+Значення, яких немає в JSON (Decimal, дати-час, UUID, lazy-рядки...),
+перетворюються тим самим енкодером, що й у стандартному JSONRenderer:
+Decimal - число, aware datetime - ISO 8601 у поточному часовому поясі
+('Z' для UTC). Тому клієнт отримує однакові значення в будь-якому форматі.
+
+orjson і msgpack - необов'язкові залежності: без orjson ORJSONRenderer
+працює як JSONRenderer, MessagePackRenderer реєструється лише за наявності msgpack.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+# Як і JSONRenderer, екрануємо U+2028/U+2029 (недопустимі в JavaScript-рядках)
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    application/json через orjson
+
+    Відступи (?indent= у Accept, Browsable API) orjson не підтримує
+    довільні, тому такі відповіді рендерить стандартний JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        # Дати-час - через енкодер DRF, а не у форматі orjson; ключі-числа (помилки bulk) - рядками, як у json
+        ret = orjson.dumps(
+            data, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+        for separator, escaped in _LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """application/msgpack (?format=msgpack)"""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True, datetime=False)
@@ -0,0 +1,107 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+def _param_list(request, name):
+    value = request.query_params.get(name, '') if request is not None else ''
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    Розріджені набори полів для ModelSerializer
+
+    ?fields=a,b  - лише ці поля;
+    ?omit=a,b    - усі поля, крім цих;
+    ?expand=fk   - замінити первинний ключ FK вкладеним об'єктом
+                   (серіалізатори з атрибута expandable_fields).
+
+    Не запитані вкладені серіалізатори та SerializerMethodField не обчислюються,
+    а OptimizedQuerySetMixin завантажує лише потрібні колонки (.only()).
+    Діє лише на серіалізатор відповіді (з request у context).
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        fields, omit, expand = (_param_list(request, name) for name in ('fields', 'omit', 'expand'))
+        self.is_sparse = bool(fields or omit)
+        if not (fields or omit or expand):
+            return
+
+        unknown = set(expand) - set(self.expandable_fields)
+        if unknown:
+            raise serializers.ValidationError({'expand': f'Невідомі поля: {", ".join(sorted(unknown))}'})
+        for name in expand:
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+
+        unknown = (set(fields) | set(omit)) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({'fields': f'Невідомі поля: {", ".join(sorted(unknown))}'})
+        keep = (set(fields) | set(expand)) if fields else set(self.fields)
+        for name in list(self.fields):
+            if name not in keep or name in omit:
+                self.fields.pop(name)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Пакет елементів bulk-ендпоінта
+
+    Кожен елемент перевіряється окремо, а коректні елементи - ще й разом
+    через child.validate_batch() (пов'язані записи одним запитом, дублікати),
+    тож відповідь 400 містить усі помилки пакета. Формат помилок, як і
+    в ListSerializer, - {індекс елемента: помилки}.
+    """
+
+    def run_child_validation(self, data):
+        try:
+            validated = super().run_child_validation(data)
+        except serializers.ValidationError:
+            self._checked.append(None)
+            raise
+        self._checked.append(validated)
+        return validated
+
+    def to_internal_value(self, data):
+        self._checked = []
+        try:
+            items = super().to_internal_value(data)
+            errors = {}
+        except serializers.ValidationError as exc:
+            if not self._checked:
+                raise
+            items, errors = None, exc.detail
+
+        valid = {index: item for index, item in enumerate(self._checked) if item is not None}
+        for index, error in self.child.validate_batch(valid).items():
+            errors.setdefault(index, error)
+        if errors:
+            raise serializers.ValidationError(dict(sorted(errors.items())))
+        return items
+
+
+class BulkItemSerializer(serializers.Serializer):
+    """Елемент bulk-запиту; many=True дає BulkListSerializer з лімітом BULK_MAX_ITEMS"""
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        kwargs.setdefault('max_length', getattr(settings, 'BULK_MAX_ITEMS', 10000))
+        return super().many_init(*args, **kwargs)
+
+    def validate_batch(self, items):
+        """
+        Перевірити коректні елементи пакета разом
+
+        Args:
+            items: {індекс: перевірені дані елемента}
+
+        Returns:
+            {індекс: {поле: [повідомлення]}}
+        """
+        return {}
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -55,6 +57,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'employees.middleware.EmployeeMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -72,6 +75,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'notifications.context_processors.unread_notifications',
             ],
         },
     },
@@ -86,10 +90,50 @@ WSGI_APPLICATION = 'hrm_project.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        # Пікові приходи о 9:00: WAL - читання не чекають на запис;
+        # IMMEDIATE - транзакція одразу бере блокування запису і чекає на нього
+        # (до timeout секунд) замість помилки "database is locked" посеред транзакції
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Звіти кешуються з версіями моделей; для кількох процесів можна використати
+# 'django.core.cache.backends.filebased.FileBasedCache' з LOCATION на спільний каталог
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hrm-cache',
     }
 }
 
+# Максимальний час життя кешованого звіту (секунди)
+REPORT_CACHE_TIMEOUT = 3600
+
+# Час життя звіту, якщо кеш - LocMemCache: лічильники версій у пам'яті процесу не
+# бачать змін, записаних іншими воркерами (і запитами .update() без сигналів)
+REPORT_CACHE_LOCAL_TIMEOUT = 5
+
+# Час життя лічильника непрочитаних сповіщень (секунди). LocMemCache - свій у кожному
+# процесі, тож із кількома воркерами зміни з інших процесів видно після цього часу;
+# для точного лічильника одразу потрібен спільний кеш (Redis / Memcached).
+UNREAD_COUNT_TIMEOUT = 60
+
+# Найдовший вік знімка присутності в процесі (секунди): версії в LocMemCache
+# не бачать clock_in / clock_out з інших процесів
+PRESENCE_SNAPSHOT_TIMEOUT = 5
+
+# Час життя кешованого співробітника для request.employee (секунди)
+EMPLOYEE_CACHE_TIMEOUT = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,12 +184,50 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'hrm_project.pagination.KeysetPagination',
+    'DEFAULT_FILTER_BACKENDS': [
+        'hrm_project.filters.QueryFilterBackend',
+    ],
+    'PAGE_SIZE': 50,
+    # orjson замість json (без orjson - стандартний рендерер); MessagePack - за Accept: application/msgpack
+    'DEFAULT_RENDERER_CLASSES': [
+        'hrm_project.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'hrm_project.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+if find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('hrm_project.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('hrm_project.parsers.MessagePackParser')
+
+# Найбільший розмір сторінки API (?page_size=)
+API_MAX_PAGE_SIZE = 500
+
+# Найбільша кількість елементів в одному bulk-запиті API
+BULK_MAX_ITEMS = 10000
+
+# Кількість рядків, що читаються з БД за раз при потоковому вивантаженні
+EXPORT_CHUNK_SIZE = 2000
+
+# Каталог журналу приходів/виходів (timetracking.ingest); None - запис у БД одразу
+CLOCK_JOURNAL_DIR = os.environ.get('CLOCK_JOURNAL_DIR') or None
+
+# Як часто фоновий потік записує накопичені події в БД (секунди)
+CLOCK_FLUSH_INTERVAL = 0.005
+
+# Закриті записи часу за місяці, старші за стільки днів, переносяться в архів
+# (archive_time_records). Після архівації не збільшувати: архів читається лише для місяців до межі.
+TIMERECORD_ARCHIVE_AFTER_DAYS = 365
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
 # Login/Logout redirects
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
-LOGOUT_REDIRECT_URL = '/login/'
\ No newline at end of file
+LOGOUT_REDIRECT_URL = '/login/'
\ No newline at end of file
@@ -13,6 +13,7 @@ from timetracking.views import TimeRecordViewSet
 # Employee Views
 from employees.employee_views import (
     employee_dashboard,
+    employee_dashboard_async,
     clock_in,
     clock_out,
     submit_request,
@@ -26,12 +27,14 @@ from employees.employee_views import (
 # HR Views
 from employees.hr_views import (
     hr_dashboard,
+    hr_dashboard_async,
     pending_requests,
     approve_request,
     reject_request,
     all_employees,
     employee_detail,
     reports,
+    export_data,
 )
 
 # Login redirect
@@ -60,6 +63,7 @@ urlpatterns = [
 
     # Employee URLs
     path('', employee_dashboard, name='employee_dashboard'),
+    path('async/', employee_dashboard_async, name='employee_dashboard_async'),
     path('clock-in/', clock_in, name='clock_in'),
     path('clock-out/', clock_out, name='clock_out'),
     path('submit-request/', submit_request, name='submit_request'),
@@ -71,10 +75,12 @@ urlpatterns = [
 
     # HR URLs
     path('hr/', hr_dashboard, name='hr_dashboard'),
+    path('hr/async/', hr_dashboard_async, name='hr_dashboard_async'),
     path('hr/pending/', pending_requests, name='pending_requests'),
     path('hr/request/<int:request_id>/approve/', approve_request, name='approve_request'),
     path('hr/request/<int:request_id>/reject/', reject_request, name='reject_request'),
     path('hr/employees/', all_employees, name='all_employees'),
     path('hr/employee/<int:employee_id>/', employee_detail, name='employee_detail'),
     path('hr/reports/', reports, name='reports'),
-]
\ No newline at end of file
+    path('hr/export/<str:name>/', export_data, name='export_data'),
+]
\ No newline at end of file
@@ -0,0 +1,228 @@
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer, SerializerMethodField
+
+from .conditional import collection_state, make_etag, not_modified, set_validators
+
+
+def method_sources(serializer):
+    """Атрибути, які читають SerializerMethodField (Meta.method_sources)"""
+    return getattr(getattr(serializer, 'Meta', None), 'method_sources', {})
+
+
+def relation_path(model, attrs):
+    """Початок шляху attrs, що складається зі зв'язків моделі"""
+    path, current, many = [], model, False
+    for attr in attrs:
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not model_field.is_relation or model_field.related_model is None:
+            break
+        path.append(attr)
+        many = many or model_field.many_to_many or model_field.one_to_many
+        current = model_field.related_model
+    return path, current, many
+
+
+def related_lookups(serializer, model, prefix=''):
+    """
+    Зв'язки, які серіалізатор читає для кожного об'єкта
+
+    Вкладені серіалізатори та поля з source='fk.attr' дають select_related
+    (або prefetch_related, якщо шлях проходить через зв'язок "багато").
+    Поля, що віддають лише первинний ключ FK, запитів не потребують.
+    Для SerializerMethodField враховуються зв'язки з Meta.method_sources.
+
+    Returns:
+        (множина для select_related, множина для prefetch_related)
+    """
+    select, prefetch = set(), set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if isinstance(field, SerializerMethodField):
+            for source in method_sources(serializer).get(name, []):
+                path, _, many = relation_path(model, source.split('__'))
+                if path:
+                    (prefetch if many else select).add(prefix + '__'.join(path))
+            continue
+        if field.source == '*':
+            continue
+
+        path, current, many = relation_path(model, field.source_attrs)
+        nested = field.child if isinstance(field, ListSerializer) else field
+        needs_join = (
+            isinstance(nested, BaseSerializer)
+            or isinstance(field, ManyRelatedField)
+            or len(path) < len(field.source_attrs)
+            or len(path) > 1
+            or (isinstance(field, RelatedField) and not field.use_pk_only_optimization())
+        )
+        if not path or not needs_join:
+            continue
+
+        lookup = prefix + '__'.join(path)
+        (prefetch if many else select).add(lookup)
+        if isinstance(nested, BaseSerializer):
+            nested_select, nested_prefetch = related_lookups(nested, current, lookup + '__')
+            if many:
+                prefetch |= nested_select | nested_prefetch
+            else:
+                select |= nested_select
+                prefetch |= nested_prefetch
+
+    return select, prefetch
+
+
+def loaded_fields(serializer, model):
+    """
+    Поля моделі, які потрібні серіалізатору (для .only())
+
+    None - якщо якесь поле читає невідомі атрибути (source='*'
+    або SerializerMethodField без Meta.method_sources).
+    """
+    names = {model._meta.pk.name}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, SerializerMethodField):
+            if name not in method_sources(serializer):
+                return None
+            sources = [source.split('__') for source in method_sources(serializer)[name]]
+        elif field.source == '*':
+            return None
+        else:
+            sources = [field.source_attrs]
+
+        for attrs in sources:
+            try:
+                model_field = model._meta.get_field(attrs[0])
+            except FieldDoesNotExist:
+                return None
+            if model_field.concrete:
+                names.add(model_field.name)
+            elif not model_field.is_relation:
+                return None
+    return names
+
+
+class OptimizedQuerySetMixin:
+    """
+    Додає до queryset viewset-а select_related/prefetch_related,
+    виведені з полів його серіалізатора (без N+1 у списках).
+    Для розріджених наборів полів (?fields=, ?omit=) завантажує лише потрібні колонки.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer = self.get_serializer()
+        select, prefetch = related_lookups(serializer, queryset.model)
+        if select:
+            queryset = queryset.select_related(*sorted(select))
+        if prefetch:
+            queryset = queryset.prefetch_related(*sorted(prefetch))
+
+        if getattr(serializer, 'is_sparse', False):
+            names = loaded_fields(serializer, queryset.model)
+            if names is not None:
+                queryset = queryset.only(*sorted(names))
+        return queryset
+
+
+class ConditionalGetMixin:
+    """
+    ETag і Last-Modified для list і retrieve
+
+    Список: первинні ключі та updated_at рядків поточної сторінки (той самий
+    keyset-запит, що й сторінка, лише кілька колонок - без COUNT і агрегатів
+    по всій таблиці) і чи є сусідні сторінки; об'єкт: його updated_at.
+    До них додаються updated_at пов'язаних рядків, які читає серіалізатор
+    (вкладені об'єкти, ?expand=, Meta.method_sources), - для довідкових таблиць
+    без updated_at (вони не змінюються) первинний ключ. Якщо серіалізатор
+    читає зв'язки "багато", валідаторів немає.
+    ETag враховує повний шлях запиту (фільтри, курсор, ?fields=) і формат
+    відповіді. Якщо клієнт надіслав актуальні If-None-Match /
+    If-Modified-Since, повертається 304 без серіалізації.
+    """
+    updated_field = 'updated_at'
+
+    def etag(self, *parts):
+        return make_etag(self.request.get_full_path(), self.request.accepted_renderer.format, *parts)
+
+    def related_validators(self, model):
+        """Lookup-и валідаторів пов'язаних рядків, які читає серіалізатор; None - валідаторів немає"""
+        select, prefetch = related_lookups(self.get_serializer(), model)
+        if prefetch:
+            return None
+        lookups = []
+        for path in sorted(select):
+            _, related, _ = relation_path(model, path.split('__'))
+            names = {field.name for field in related._meta.concrete_fields}
+            lookups.append(f'{path}__{self.updated_field if self.updated_field in names else related._meta.pk.name}')
+        return lookups
+
+    def page_state(self, queryset, related=()):
+        """Валідатори сторінки списку: (частини ETag, час останньої зміни)"""
+        if self.paginator is None:
+            count, last_modified = collection_state(queryset, self.updated_field)
+            return (count, last_modified), last_modified
+
+        # Окремий екземпляр: self.paginator ще пагінуватиме саму сторінку
+        paginator = self.pagination_class()
+        pk = queryset.model._meta.pk.name
+        ordering = [field.lstrip('-') for field in paginator.get_ordering(self.request, queryset, self)]
+        columns = [pk, self.updated_field, *related]
+        rows = paginator.paginate_queryset(
+            queryset.order_by().values(*columns, *ordering), self.request, view=self
+        )
+        window = [tuple(row[column] for column in columns) for row in rows]
+        return (window, paginator.has_next, paginator.has_previous), _latest(window)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        related = self.related_validators(queryset.model)
+        # collection_state не бачить пов'язаних рядків
+        if related is None or (related and self.paginator is None):
+            return super().list(request, *args, **kwargs)
+
+        parts, last_modified = self.page_state(queryset, related)
+        etag = self.etag(*parts)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(super().list(request, *args, **kwargs), etag, last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        related = self.related_validators(type(instance))
+        if related is None:
+            return Response(self.get_serializer(instance).data)
+
+        state = (instance.pk, getattr(instance, self.updated_field), *(_lookup(instance, path) for path in related))
+        last_modified = _latest([state])
+        etag = self.etag(*state)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(Response(self.get_serializer(instance).data), etag, last_modified)
+        return response
+
+
+def _lookup(instance, path):
+    """Значення lookup-а ('fk__field') з уже завантажених (select_related) об'єктів"""
+    value = instance
+    for attr in path.split('__'):
+        if value is None:
+            return None
+        value = getattr(value, attr)
+    return value
+
+
+def _latest(rows):
+    """Найпізніший час серед значень рядків валідаторів"""
+    return max((value for row in rows for value in row if isinstance(value, datetime)), default=None)
@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import Notification
+from .models import Notification, NotificationService
 
 
 @admin.register(Notification)
@@ -49,13 +50,13 @@ class NotificationAdmin(admin.ModelAdmin):
     status_display.short_description = 'Статус'
 
     def mark_as_sent(self, request, queryset):
-        updated = queryset.update(is_sent=True)
+        updated = queryset.update(is_sent=True, updated_at=timezone.now())
         self.message_user(request, f"{updated} сповіщень позначено як надіслані")
 
     mark_as_sent.short_description = "Позначити як надіслані"
 
     def mark_as_read(self, request, queryset):
-        updated = queryset.update(is_read=True)
+        updated = NotificationService.mark_read(queryset)
         self.message_user(request, f"{updated} сповіщень позначено як прочитані")
 
     mark_as_read.short_description = "Позначити як прочитані"
\ No newline at end of file
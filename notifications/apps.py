@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notifications'
-    verbose_name = 'Сповіщення'
\ No newline at end of file
+    verbose_name = 'Сповіщення'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,15 @@
+from .unread import get_unread_count
+
+
+def unread_notifications(request):
+    """
+    Лічильник для значка сповіщень у base.html
+
+    Значення - функція: шаблон викликає її лише тоді, коли значок показується.
+    """
+    employee = getattr(request, 'employee', None)
+
+    def unread_count():
+        return get_unread_count(employee.pk) if employee else 0
+
+    return {'unread_count': unread_count}
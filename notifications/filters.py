@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from hrm_project.filters import QueryFilter
+
+
+class NotificationFilter(QueryFilter):
+    """?recipient=&is_read=&created_after= (індекси notification_*_idx)"""
+    recipient = serializers.IntegerField(required=False, min_value=1, source='recipient_id')
+    is_read = serializers.BooleanField(required=False, allow_null=True, default=None)
+    created_after = serializers.DateTimeField(required=False, source='created_at__gte')
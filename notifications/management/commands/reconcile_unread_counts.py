@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hrm_project.caching import is_process_local
+from notifications.unread import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Перерахувати лічильники непрочитаних сповіщень з таблиці сповіщень'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employee', type=int, action='append', dest='employee_ids',
+                            help='ID співробітника (можна вказати кілька разів)')
+
+    def handle(self, *args, **options):
+        if is_process_local():
+            # Лічильники в пам'яті цього процесу: сервер їх не побачив би
+            raise CommandError(
+                'Кеш за замовчуванням - у пам\'яті процесу (LocMemCache), команда не змінить лічильників '
+                'сервера. Сервер сам перераховує їх з таблиці через UNREAD_COUNT_TIMEOUT секунд; '
+                'для перерахунку командою потрібен спільний кеш (Redis, Memcached, FileBasedCache).'
+            )
+        count = reconcile_unread_counts(options['employee_ids'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Лічильники перераховано для {count} співробітників'))
@@ -1,4 +1,7 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
+from django.utils import timezone
 from employees.models import Employee
 
 
@@ -17,9 +20,11 @@ class Notification(models.Model):
         ('push', 'Push'),
     ]
 
+    # Окремий індекс FK не потрібен: його покриває notification_inbox_idx
     recipient = models.ForeignKey(
         Employee,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name="Одержувач"
     )
     notification_type = models.CharField(
@@ -37,6 +42,7 @@ class Notification(models.Model):
     is_sent = models.BooleanField(default=False, verbose_name="Надіслано")
     is_read = models.BooleanField(default=False, verbose_name="Прочитано")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
 
     def __str__(self):
         return f"{self.get_notification_type_display()} для {self.recipient}"
@@ -45,6 +51,13 @@ class Notification(models.Model):
         verbose_name = "Сповіщення"
         verbose_name_plural = "Сповіщення"
         ordering = ['-created_at']
+        indexes = [
+            # Усі сповіщення співробітника, новіші першими
+            models.Index(fields=['recipient', '-created_at'], name='notification_inbox_idx'),
+            # Непрочитані (значок, панель) - лише невелика частина таблиці
+            models.Index(fields=['recipient', '-created_at'], condition=models.Q(is_read=False),
+                         name='notification_unread_idx'),
+        ]
 
 
 class NotificationService:
@@ -64,4 +77,21 @@ class NotificationService:
                 is_read=False  # ← ДОДАНО!
             )
             notifications.append(notification)
-        return notifications
\ No newline at end of file
+        return notifications
+
+    @staticmethod
+    def mark_read(notifications):
+        """Позначити сповіщення прочитаними одним UPDATE та зменшити лічильники"""
+        from .unread import change_unread_count
+
+        with transaction.atomic():
+            rows = list(
+                notifications.filter(is_read=False).select_for_update().values_list('id', 'recipient_id')
+            )
+            Notification.objects.filter(id__in=[row[0] for row in rows]).update(
+                is_read=True, updated_at=timezone.now()
+            )
+
+        for recipient_id, count in Counter(row[1] for row in rows).items():
+            change_unread_count(recipient_id, -count)
+        return len(rows)
@@ -1,8 +1,30 @@
+from django.conf import settings
 from rest_framework import serializers
+
+from hrm_project.serializers import SparseFieldsMixin
+from employees.serializers import EmployeeSerializer
 from .models import Notification
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {'recipient': EmployeeSerializer}
+
     class Meta:
         model = Notification
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    """POST /api/notifications/mark-read/: список ids або всі сповіщення одержувача"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=getattr(settings, 'BULK_MAX_ITEMS', 10000),
+    )
+    recipient = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('recipient' in attrs):
+            raise serializers.ValidationError('Вкажіть або ids, або recipient.')
+        return attrs
@@ -0,0 +1,32 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Notification
+from .unread import change_unread_count
+
+
+@receiver(pre_save, sender=Notification)
+def remember_old_state(sender, instance, **kwargs):
+    """Запам'ятати попередні одержувача і статус (адмін може змінити обидва)"""
+    instance._old_unread = None
+    if instance.pk:
+        instance._old_unread = Notification.objects.filter(
+            pk=instance.pk, is_read=False
+        ).values_list('recipient_id', flat=True).first()
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, **kwargs):
+    old_recipient = getattr(instance, '_old_unread', None)
+    new_recipient = None if instance.is_read else instance.recipient_id
+    if old_recipient != new_recipient:
+        if old_recipient:
+            change_unread_count(old_recipient, -1)
+        if new_recipient:
+            change_unread_count(new_recipient, 1)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        change_unread_count(instance.recipient_id, -1)
@@ -1,3 +1,233 @@
-from django.test import TestCase
+from io import StringIO
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from employees.testing import make_employee
+from .models import Notification, NotificationService
+from .unread import get_unread_count
+
+
+class UnreadCounterTest(TestCase):
+    """Лічильник непрочитаних сповіщень береться з кешу і не розходиться з таблицею"""
+
+    def setUp(self):
+        cache.clear()
+        self.employee = make_employee('worker@company.com')
+        self.other = make_employee('other@company.com')
+
+    def assertCounter(self, employee, expected):
+        self.assertEqual(get_unread_count(employee.pk), expected)
+        self.assertEqual(Notification.objects.filter(recipient=employee, is_read=False).count(), expected)
+
+    def test_counter_follows_changes(self):
+        self.assertCounter(self.employee, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.notify(self.employee, 'order_status', 'Перше', channels=['push', 'email'])
+            Notification.objects.create(recipient=self.employee, notification_type='leave_approved', message='Друге')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.employee.pk), 3)
+
+        notification = Notification.objects.filter(recipient=self.employee).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.recipient = self.other
+            notification.save()
+        self.assertCounter(self.employee, 2)
+        self.assertCounter(self.other, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.mark_read(Notification.objects.all())
+        self.assertCounter(self.employee, 0)
+        self.assertCounter(self.other, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            unread = NotificationService.notify(self.employee, 'order_status', 'Третє')[0]
+            unread.delete()
+        self.assertCounter(self.employee, 0)
+
+    def test_reconcile_command(self):
+        for _ in range(3):
+            NotificationService.notify(self.employee, 'order_status', 'Сповіщення')
+        self.assertEqual(get_unread_count(self.employee.pk), 3)
+        Notification.objects.filter(recipient=self.employee).update(is_read=True)
+        self.assertEqual(get_unread_count(self.employee.pk), 3)
+
+        # Кеш у пам'яті процесу: команда нічого не змінила б для сервера
+        with self.assertRaisesMessage(CommandError, 'LocMemCache'):
+            call_command('reconcile_unread_counts', stdout=StringIO())
+        self.assertEqual(get_unread_count(self.employee.pk), 3)
+
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }}):
+            cache.set(f'unread_notifications:{self.employee.pk}', 3)
+            call_command('reconcile_unread_counts', stdout=StringIO())
+            self.assertEqual(get_unread_count(self.employee.pk), 0)
+            self.assertEqual(get_unread_count(self.other.pk), 0)
+
+    def test_counter_expires(self):
+        """Зміни з іншого процесу (лічильник цього процесу їх не бачить) - після UNREAD_COUNT_TIMEOUT"""
+        import time
+        from unittest import mock
+        from django.conf import settings
+
+        NotificationService.notify(self.employee, 'order_status', 'Сповіщення')
+        self.assertEqual(get_unread_count(self.employee.pk), 1)
+        Notification.objects.filter(recipient=self.employee).update(is_read=True)
+        self.assertEqual(get_unread_count(self.employee.pk), 1)
+
+        later = time.time() + settings.UNREAD_COUNT_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertEqual(get_unread_count(self.employee.pk), 0)
+
+    def test_badge_and_mark_as_read_view(self):
+        user = get_user_model().objects.create_user('worker', 'worker@company.com', 'password')
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = NotificationService.notify(self.employee, 'order_status', 'Сповіщення')[0]
+            NotificationService.notify(self.other, 'order_status', 'Чуже')
+
+        self.client.force_login(user)
+        response = self.client.get('/my-requests/')
+        self.assertContains(response, '<span class="notification-badge">1</span>', html=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(f'/notifications/{notification.pk}/read/')
+        self.assertCounter(self.employee, 0)
+        self.assertCounter(self.other, 1)
+
+
+class NotificationFilterTest(TestCase):
+    """Фільтри /api/notifications/"""
+
+    def test_filters(self):
+        employee = make_employee('worker@company.com')
+        other = make_employee('other@company.com')
+        read = NotificationService.notify(employee, 'order_status', 'Прочитане')[0]
+        NotificationService.mark_read(Notification.objects.filter(pk=read.pk))
+        unread = NotificationService.notify(employee, 'order_status', 'Нове')[0]
+        NotificationService.notify(other, 'order_status', 'Чуже')
+        Notification.objects.filter(pk=read.pk).update(created_at='2025-01-01T10:00:00Z')
+
+        def ids(query):
+            response = self.client.get(f'/api/notifications/?{query}')
+            self.assertEqual(response.status_code, 200, response.content)
+            return [item['id'] for item in response.json()['results']]
+
+        self.assertEqual(ids(f'recipient={employee.pk}&is_read=false'), [unread.pk])
+        self.assertEqual(ids(f'recipient={employee.pk}&is_read=true'), [read.pk])
+        self.assertEqual(ids(f'recipient={employee.pk}&created_after=2025-06-01T00:00:00Z'), [unread.pk])
+        self.assertEqual(len(ids('')), 3)
+        self.assertEqual(self.client.get('/api/notifications/?created_after=вчора').status_code, 400)
+
+
+class ConditionalGetTest(TestCase):
+    """Незмінені сповіщення API віддаються як 304 без серіалізації"""
+
+    def setUp(self):
+        self.employee = make_employee('worker@company.com')
+        self.notification = NotificationService.notify(self.employee, 'order_status', 'Сповіщення')[0]
+
+    def assertNotModified(self, url, **headers):
+        with self.assertNumQueries(1):
+            response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_list(self):
+        url = '/api/notifications/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertNotModified(url, if_none_match=etag)
+        self.assertNotModified(url, if_modified_since=response['Last-Modified'])
+
+        # Інший набір полів чи фільтр - інша відповідь
+        self.assertEqual(self.client.get(f'{url}?fields=id', headers={'if_none_match': etag}).status_code, 200)
+
+        NotificationService.mark_read(Notification.objects.all())
+        response = self.client.get(url, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['results'][0]['is_read'])
+
+        etag = response['ETag']
+        NotificationService.notify(self.employee, 'order_status', 'Друге')[0].delete()
+        self.assertNotModified(url, if_none_match=etag)
+        self.notification.delete()
+        self.assertEqual(self.client.get(url, headers={'if_none_match': etag}).status_code, 200)
+
+    def test_list_validator_reads_only_the_page(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for i in range(3):
+            NotificationService.notify(self.employee, 'order_status', f'Сповіщення {i}')
+        url = '/api/notifications/?page_size=2'
+        response = self.client.get(url)
+        etag, next_url = response['ETag'], response.json()['next']
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, headers={'if_none_match': etag}).status_code, 304)
+        self.assertNotIn('COUNT(', queries[0]['sql'])
+        self.assertIn('LIMIT 3', queries[0]['sql'])
+
+        # Зміна поза сторінкою її не інвалідує, на сторінці - інвалідує
+        NotificationService.mark_read(Notification.objects.filter(pk=self.notification.pk))
+        self.assertNotModified(url, if_none_match=etag)
+        self.assertEqual(self.client.get(next_url, headers={'if_none_match': etag}).status_code, 200)
+        NotificationService.mark_read(Notification.objects.all())
+        self.assertEqual(self.client.get(url, headers={'if_none_match': etag}).status_code, 200)
+
+    def test_detail(self):
+        url = f'/api/notifications/{self.notification.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, if_none_match=etag)
+
+        self.notification.message = 'Змінене'
+        self.notification.save()
+        response = self.client.get(url, headers={'if_none_match': etag})
+        self.assertEqual(response.json()['message'], 'Змінене')
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class NotificationMarkReadTest(TestCase):
+    """POST /api/notifications/mark-read/ - одним UPDATE, з результатом для кожного id"""
+
+    def setUp(self):
+        cache.clear()
+        self.employee = make_employee('worker@company.com')
+        self.other = make_employee('other@company.com')
+
+    def post(self, data):
+        return self.client.post('/api/notifications/mark-read/', data, content_type='application/json')
+
+    def test_mark_list(self):
+        read, unread = NotificationService.notify(self.employee, 'order_status', 'Сповіщення', ['push', 'email'])
+        NotificationService.mark_read(Notification.objects.filter(pk=read.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post({'ids': [read.pk, unread.pk, 999999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'marked': 1, 'results': [
+            {'id': read.pk, 'status': 'already_read'},
+            {'id': unread.pk, 'status': 'marked'},
+            {'id': 999999, 'status': 'not_found'},
+        ]})
+        self.assertEqual(get_unread_count(self.employee.pk), 0)
+
+    def test_mark_all_for_recipient(self):
+        for _ in range(3):
+            NotificationService.notify(self.employee, 'order_status', 'Сповіщення')
+        NotificationService.notify(self.other, 'order_status', 'Чуже')
+
+        with self.assertNumQueries(4):  # SAVEPOINT, SELECT ... FOR UPDATE, UPDATE, RELEASE
+            response = self.post({'recipient': self.employee.pk})
+        self.assertEqual(response.json(), {'marked': 3})
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 1)
+
+    def test_invalid(self):
+        for data in [{}, {'ids': []}, {'ids': ['a']}, {'ids': [1], 'recipient': 1}]:
+            with self.subTest(data=data):
+                self.assertEqual(self.post(data).status_code, 400)
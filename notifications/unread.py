@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Notification
+
+UNREAD_KEY = 'unread_notifications:{}'
+
+
+def _unread_key(employee_id):
+    return UNREAD_KEY.format(employee_id)
+
+
+def get_unread_count(employee_id):
+    """
+    Кількість непрочитаних сповіщень (з кешу, за відсутності - з таблиці)
+
+    Лічильник живе UNREAD_COUNT_TIMEOUT секунд і потім рахується з таблиці
+    знову: зміни з інших процесів (кеш у пам'яті процесу) видно не пізніше.
+    """
+    key = _unread_key(employee_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(recipient_id=employee_id, is_read=False).count()
+        cache.add(key, count, settings.UNREAD_COUNT_TIMEOUT)
+    return max(count, 0)
+
+
+def change_unread_count(employee_id, delta):
+    """
+    Змінити лічильник на delta (після коміту транзакції)
+
+    Відсутній лічильник не створюється: його порахує наступне читання.
+    """
+    key = _unread_key(employee_id)
+
+    def change():
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            pass
+
+    transaction.on_commit(change)
+
+
+def reconcile_unread_counts(employee_ids=None):
+    """
+    Перерахувати лічильники з таблиці сповіщень; повертає кількість співробітників
+
+    Змінює кеш поточного процесу: з LocMemCache - лише його власні лічильники.
+    """
+    from employees.models import Employee
+
+    employees = Employee.objects.all()
+    notifications = Notification.objects.filter(is_read=False)
+    if employee_ids is not None:
+        employees = employees.filter(id__in=employee_ids)
+        notifications = notifications.filter(recipient_id__in=employee_ids)
+
+    counts = dict(notifications.values_list('recipient').annotate(count=Count('id')).order_by())
+    values = {_unread_key(employee_id): counts.get(employee_id, 0)
+              for employee_id in employees.values_list('id', flat=True)}
+    cache.set_many(values, settings.UNREAD_COUNT_TIMEOUT)
+    return len(values)
@@ -1,8 +1,36 @@
 from rest_framework import viewsets
-from .models import Notification
-from .serializers import NotificationSerializer
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from hrm_project.viewsets import ConditionalGetMixin, OptimizedQuerySetMixin
+from .filters import NotificationFilter
+from .models import Notification, NotificationService
+from .serializers import NotificationMarkReadSerializer, NotificationSerializer
 
-class NotificationViewSet(viewsets.ModelViewSet):
+
+class NotificationViewSet(ConditionalGetMixin, OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.all()
-    serializer_class = NotificationSerializer
\ No newline at end of file
+    serializer_class = NotificationSerializer
+    query_filter_class = NotificationFilter
+
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        """Позначити прочитаними список сповіщень або всі сповіщення одержувача одним UPDATE"""
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if 'recipient' in data:
+            marked = NotificationService.mark_read(Notification.objects.filter(recipient_id=data['recipient']))
+            return Response({'marked': marked})
+
+        ids = data['ids']
+        was_read = dict(Notification.objects.filter(id__in=ids).values_list('id', 'is_read'))
+        marked = NotificationService.mark_read(Notification.objects.filter(id__in=ids))
+
+        def item_status(pk):
+            if pk not in was_read:
+                return 'not_found'
+            return 'already_read' if was_read[pk] else 'marked'
+
+        return Response({'marked': marked, 'results': [{'id': pk, 'status': item_status(pk)} for pk in ids]})
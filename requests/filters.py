@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from hrm_project.filters import QueryFilter
+from .models import Request, RequestState
+
+
+class RequestFilter(QueryFilter):
+    """?employee=&state=&type= (індекси request_*_idx)"""
+    employee = serializers.IntegerField(required=False, min_value=1, source='employee_id')
+    state = serializers.ChoiceField(required=False, choices=RequestState.STATE_TYPES,
+                                    source='current_state__state_type')
+    type = serializers.ChoiceField(required=False, choices=Request.REQUEST_TYPES, source='request_type')
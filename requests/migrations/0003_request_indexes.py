@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employee_department_idx'),
+        ('requests', '0002_alter_request_options_request_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='request',
+            name='current_state',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='requests.requeststate', verbose_name='Поточний стан'),
+        ),
+        migrations.AlterField(
+            model_name='request',
+            name='employee',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='employees.employee', verbose_name='Співробітник'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['employee', '-created_date'], name='request_emp_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['current_state', '-created_date'], name='request_state_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['-created_date'], name='request_created_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.utils import timezone
 from employees.models import Employee
+from employees.report_cache import bump_version
 
 
 class RequestState(models.Model):
@@ -34,9 +38,11 @@ class Request(models.Model):
         ('other', 'Інше'),
     ]
 
+    # Окремі індекси FK не потрібні: їх покривають складені індекси з Meta
     employee = models.ForeignKey(
         Employee,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name="Співробітник"
     )
     request_type = models.CharField(
@@ -63,6 +69,7 @@ class Request(models.Model):
         RequestState,
         on_delete=models.SET_NULL,
         null=True,
+        db_index=False,
         verbose_name="Поточний стан"
     )
     created_date = models.DateTimeField(
@@ -73,6 +80,7 @@ class Request(models.Model):
         blank=True,
         verbose_name="Коментар HR"
     )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
 
     def change_state(self, new_state_type):
         """Змінити стан заявки (State Pattern)"""
@@ -83,6 +91,41 @@ class Request(models.Model):
         except RequestState.DoesNotExist:
             pass
 
+    @classmethod
+    def change_states(cls, transitions):
+        """
+        Змінити стан багатьох заявок в одній транзакції (State Pattern)
+
+        Один UPDATE на кожен цільовий стан; заявки, що вже в цьому стані, не змінюються.
+
+        Args:
+            transitions: {id заявки: тип нового стану}
+
+        Returns:
+            {id заявки: тип попереднього стану (None, якщо стану не було)}
+        """
+        states = dict(RequestState.objects.filter(
+            state_type__in=set(transitions.values())
+        ).values_list('state_type', 'id'))
+
+        with transaction.atomic():
+            previous = dict(
+                cls.objects.filter(id__in=transitions).select_for_update()
+                .values_list('id', 'current_state__state_type')
+            )
+            changes = defaultdict(list)
+            for pk, state_type in transitions.items():
+                if pk in previous and previous[pk] != state_type:
+                    changes[state_type].append(pk)
+            now = timezone.now()
+            for state_type, ids in changes.items():
+                cls.objects.filter(id__in=ids).update(current_state_id=states[state_type], updated_at=now)
+
+        if changes:
+            # UPDATE оминає сигнали, тому кеш звітів інвалідується тут
+            bump_version(cls._meta.label)
+        return previous
+
     def days_count(self):
         """Кількість днів"""
         if self.start_date and self.end_date:
@@ -95,4 +138,12 @@ class Request(models.Model):
     class Meta:
         verbose_name = "Заявка"
         verbose_name_plural = "Заявки"
-        ordering = ['-created_date']
\ No newline at end of file
+        ordering = ['-created_date']
+        indexes = [
+            # Заявки співробітника (панель, "Мої заявки", картка в HR)
+            models.Index(fields=['employee', '-created_date'], name='request_emp_created_idx'),
+            # Заявки за станом (очікують розгляду)
+            models.Index(fields=['current_state', '-created_date'], name='request_state_created_idx'),
+            # Останні заявки на панелі HR
+            models.Index(fields=['-created_date'], name='request_created_idx'),
+        ]
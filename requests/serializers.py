@@ -1,16 +1,42 @@
 from rest_framework import serializers
+
+from hrm_project.serializers import BulkItemSerializer, SparseFieldsMixin
+from employees.serializers import EmployeeSerializer
 from .models import Request, RequestState
 
 
-class RequestStateSerializer(serializers.ModelSerializer):
+class RequestStateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = RequestState
         fields = '__all__'
 
 
-class RequestSerializer(serializers.ModelSerializer):
+class RequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     state_details = RequestStateSerializer(source='current_state', read_only=True)
+    expandable_fields = {'employee': EmployeeSerializer}
 
     class Meta:
         model = Request
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class RequestTransitionSerializer(BulkItemSerializer):
+    """Перехід заявки для POST /api/requests/transition/"""
+    id = serializers.IntegerField(min_value=1)
+    state = serializers.ChoiceField(choices=RequestState.STATE_TYPES)
+
+    def validate_batch(self, items):
+        known = set(Request.objects.filter(
+            id__in={item['id'] for item in items.values()}
+        ).values_list('id', flat=True))
+        states = set(RequestState.objects.values_list('state_type', flat=True))
+        errors, seen = {}, set()
+        for index, item in items.items():
+            if item['id'] not in known:
+                errors[index] = {'id': [f'Заявки {item["id"]} не існує.']}
+            elif item['id'] in seen:
+                errors[index] = {'id': ['Заявка повторюється в пакеті.']}
+            elif item['state'] not in states:
+                errors[index] = {'state': [f'Стан "{item["state"]}" не створено.']}
+            seen.add(item['id'])
+        return errors
@@ -1,3 +1,85 @@
 from django.test import TestCase
 
-# Create your tests here.
+from employees.testing import make_employee
+from .models import Request, RequestState
+
+
+class RequestApiTest(TestCase):
+    """Список заявок API - стала кількість запитів незалежно від кількості заявок"""
+
+    @classmethod
+    def setUpTestData(cls):
+        employee = make_employee('worker@company.com', last_name='Тестенко')
+        states = [RequestState.objects.create(state_type=state) for state in ('pending', 'approved', 'rejected')]
+        for i in range(15):
+            Request.objects.create(employee=employee, current_state=states[i % len(states)])
+
+    def test_list_query_count(self):
+        # Запит валідаторів (ETag) та запит сторінки
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/requests/?page_size=100').json()
+        self.assertEqual(len(data['results']), 15)
+        self.assertEqual({item['state_details']['state_type'] for item in data['results']},
+                         {'pending', 'approved', 'rejected'})
+
+    def test_filters(self):
+        def count(query):
+            response = self.client.get(f'/api/requests/?page_size=100&{query}')
+            self.assertEqual(response.status_code, 200, response.content)
+            return len(response.json()['results'])
+
+        Request.objects.filter(current_state__state_type='approved').update(request_type='sick')
+        self.assertEqual(count('state=pending'), 5)
+        self.assertEqual(count('state=approved&type=sick'), 5)
+        self.assertEqual(count('type=sick'), 5)
+        self.assertEqual(count('type=vacation'), 10)
+        self.assertEqual(self.client.get('/api/requests/?state=archived').status_code, 400)
+
+
+class RequestTransitionTest(TestCase):
+    """POST /api/requests/transition/ - пакет переходів в одній транзакції"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee('worker@company.com', last_name='Тестенко')
+        cls.pending = RequestState.objects.create(state_type='pending')
+        cls.approved = RequestState.objects.create(state_type='approved')
+
+    def post(self, items):
+        return self.client.post('/api/requests/transition/', items, content_type='application/json')
+
+    def test_transition(self):
+        first, second = [Request.objects.create(employee=self.employee, current_state=self.pending)
+                         for _ in range(2)]
+        Request.objects.filter(pk=second.pk).update(current_state=self.approved)
+
+        response = self.post([{'id': first.pk, 'state': 'approved'}, {'id': second.pk, 'state': 'approved'}])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([item['status'] for item in response.json()['results']], ['changed', 'unchanged'])
+        self.assertEqual(Request.objects.filter(current_state=self.approved).count(), 2)
+
+    def test_invalid_batch_changes_nothing(self):
+        request = Request.objects.create(employee=self.employee, current_state=self.pending)
+        response = self.post([
+            {'id': request.pk, 'state': 'approved'},
+            {'id': request.pk, 'state': 'pending'},
+            {'id': 999999, 'state': 'approved'},
+            {'id': request.pk, 'state': 'rejected'},
+            {'id': request.pk, 'state': 'archived'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'1', '2', '3', '4'})
+        request.refresh_from_db()
+        self.assertEqual(request.current_state, self.pending)
+
+    def test_ten_thousand_items(self):
+        import time
+
+        Request.objects.bulk_create([Request(employee=self.employee, current_state=self.pending)
+                                     for _ in range(10_000)])
+        items = [{'id': pk, 'state': 'approved'} for pk in Request.objects.values_list('id', flat=True)]
+        started = time.monotonic()
+        response = self.post(items)
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(Request.objects.filter(current_state=self.approved).count(), 10_000)
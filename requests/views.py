@@ -1,13 +1,37 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from hrm_project.viewsets import ConditionalGetMixin, OptimizedQuerySetMixin
+from .filters import RequestFilter
 from .models import Request, RequestState
-from .serializers import RequestSerializer, RequestStateSerializer
+from .serializers import RequestSerializer, RequestStateSerializer, RequestTransitionSerializer
 
 
-class RequestStateViewSet(viewsets.ModelViewSet):
+class RequestStateViewSet(OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = RequestState.objects.all()
     serializer_class = RequestStateSerializer
 
 
-class RequestViewSet(viewsets.ModelViewSet):
+class RequestViewSet(ConditionalGetMixin, OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = Request.objects.all()
-    serializer_class = RequestSerializer
\ No newline at end of file
+    serializer_class = RequestSerializer
+    query_filter_class = RequestFilter
+
+    @action(detail=False, methods=['post'], url_path='transition')
+    def transition(self, request):
+        """Змінити стан до BULK_MAX_ITEMS заявок в одній транзакції (усі або жодної)"""
+        serializer = RequestTransitionSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        transitions = {item['id']: item['state'] for item in serializer.validated_data}
+        previous = Request.change_states(transitions)
+
+        def item_status(pk, state):
+            # Заявку могли видалити після перевірки пакета
+            if pk not in previous:
+                return 'not_found'
+            return 'unchanged' if previous[pk] == state else 'changed'
+
+        return Response({'results': [
+            {'id': pk, 'state': state, 'status': item_status(pk, state)} for pk, state in transitions.items()
+        ]})
@@ -1,8 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from django.db.models import Sum
-from datetime import date, timedelta
-from .models import TimeRecord
+from .models import TimeRecord, TimeRecordArchive
 
 
 @admin.register(TimeRecord)
@@ -79,4 +77,25 @@ class TimeRecordAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         """Заборонити додавання записів вручну (створюються через Clock In/Out)"""
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(TimeRecordArchive)
+class TimeRecordArchiveAdmin(admin.ModelAdmin):
+    """Архів лише для перегляду: сегменти створює команда archive_time_records"""
+    list_display = ['employee', 'month', 'record_count', 'archived_hours']
+    list_filter = ['month']
+    search_fields = ['employee__first_name', 'employee__last_name']
+    list_select_related = ['employee']
+    exclude = ['data']
+
+    def archived_hours(self, obj):
+        return f'{sum(seconds for seconds, _ in obj.days.values()) / 3600:.1f} год'
+
+    archived_hours.short_description = 'Відпрацьовано'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
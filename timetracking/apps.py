@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class TimetrackingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'timetracking'
-    verbose_name = 'Облік часу'
\ No newline at end of file
+    verbose_name = 'Облік часу'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
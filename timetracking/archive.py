@@ -0,0 +1,99 @@
+"""
+Перенесення старих записів часу в архів (TimeRecordArchive)
+
+Для кожного місяця до межі (TimeRecordArchive.cutoff) закриті записи
+співробітника стискаються в один сегмент, а рядки видаляються з таблиці.
+Незакриті записи лишаються в таблиці. Пізні записи в уже архівованому
+місяці дописуються в наявний сегмент.
+
+Денні підсумки при цьому не змінюються (DailyTimesheet враховує архів),
+тому рядки видаляються сирим DELETE - без сигналів і перерахунку.
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models.functions import TruncMonth
+
+from employees.report_cache import bump_version
+from .models import TimeRecord, TimeRecordArchive
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _archive_month(month, employee_ids):
+    """Перенести записи співробітників за місяць однією транзакцією; повертає кількість записів"""
+    with transaction.atomic():
+        hot = defaultdict(list)
+        for record in TimeRecord.objects.filter(
+            employee_id__in=employee_ids, date__gte=month, date__lt=_next_month(month), clock_out_time__isnull=False
+        ).order_by('date', 'clock_in_time', 'id'):
+            hot[record.employee_id].append(record)
+        segments = {
+            segment.employee_id: segment
+            for segment in TimeRecordArchive.objects.filter(employee_id__in=hot, month=month)
+        }
+
+        created, updated = [], []
+        for employee_id, employee_records in hot.items():
+            segment = segments.get(employee_id)
+            if segment is None:
+                segment = TimeRecordArchive(employee_id=employee_id, month=month, days={})
+                created.append(segment)
+            else:
+                employee_records = sorted(
+                    segment.records() + employee_records, key=lambda record: (record.date, record.clock_in_time, record.pk)
+                )
+                updated.append(segment)
+
+            days = defaultdict(lambda: [0, 0])
+            for record in employee_records:
+                day = days[record.date.isoformat()]
+                day[0] += (record.clock_out_time - record.clock_in_time).total_seconds()
+                day[1] += 1
+            segment.days = dict(days)
+            segment.record_count = len(employee_records)
+            segment.data = TimeRecordArchive.pack(employee_records)
+
+        TimeRecordArchive.objects.bulk_create(created)
+        TimeRecordArchive.objects.bulk_update(updated, ['days', 'record_count', 'data'])
+        # Сирий DELETE замість .delete(): той читав би кожен запис і слав post_delete (перерахунок
+        # підсумків і присутності), а підсумки днів ті самі і на закриті записи ніщо не посилається
+        # (Presence - лише на незакриті)
+        archived = [record.pk for employee_records in hot.values() for record in employee_records]
+        quote = connection.ops.quote_name
+        sql = f'DELETE FROM {quote(TimeRecord._meta.db_table)} WHERE {quote(TimeRecord._meta.pk.column)} IN '
+        step = connection.ops.bulk_batch_size(['id'], archived)
+        with connection.cursor() as cursor:
+            for start in range(0, len(archived), step):
+                chunk = archived[start:start + step]
+                cursor.execute(sql + f'({", ".join(["%s"] * len(chunk))})', chunk)
+    return len(archived)
+
+
+def archive_records(batch_size=500):
+    """
+    Перенести в архів закриті записи за місяці до TimeRecordArchive.cutoff()
+
+    Args:
+        batch_size: співробітників в одній транзакції
+
+    Returns:
+        {місяць: кількість перенесених записів}
+    """
+    old = TimeRecord.objects.filter(date__lt=TimeRecordArchive.cutoff(), clock_out_time__isnull=False)
+    months = old.annotate(month=TruncMonth('date')).values_list('month', flat=True).distinct().order_by('month')
+
+    moved = {}
+    for month in months:
+        employee_ids = list(
+            old.filter(date__gte=month, date__lt=_next_month(month)).values_list('employee', flat=True)
+            .distinct().order_by('employee')
+        )
+        for start in range(0, len(employee_ids), batch_size):
+            moved[month] = moved.get(month, 0) + _archive_month(month, employee_ids[start:start + batch_size])
+    if moved:
+        bump_version(TimeRecord._meta.label)
+    return moved
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from hrm_project.filters import QueryFilter
+
+
+class TimeRecordFilter(QueryFilter):
+    """?employee=&date__gte=&date__lte=&open= (індекси timerecord_*_idx)"""
+    employee = serializers.IntegerField(required=False, min_value=1, source='employee_id')
+    date__gte = serializers.DateField(required=False)
+    date__lte = serializers.DateField(required=False)
+    open = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate(self, attrs):
+        if attrs.get('date__gte') and attrs.get('date__lte') and attrs['date__gte'] > attrs['date__lte']:
+            raise serializers.ValidationError({'date__lte': 'Кінцева дата раніше початкової.'})
+        return attrs
+
+    def filter_open(self, queryset, value):
+        return queryset.filter(clock_out_time__isnull=value)
@@ -0,0 +1,326 @@
+"""
+Буферизований запис приходів і виходів (write-behind)
+
+Якщо задано CLOCK_JOURNAL_DIR, TimeTrackingSystem.clock_in/clock_out не пишуть
+у БД під час запиту: подія дописується в журнал процесу (JSON Lines, fsync)
+і відповідь повертається одразу. Фоновий потік кожні CLOCK_FLUSH_INTERVAL
+секунд застосовує накопичені події однією транзакцією (bulk_create /
+bulk_update) і в тій самій транзакції зберігає позицію журналу
+(ClockJournalCheckpoint), тож після збою події не губляться і не
+застосовуються двічі.
+
+Журнал процесу заблокований flock, доки процес живий; журнали завершених
+процесів дочитує recover() (при створенні журналу або командою
+flush_clock_journal).
+
+Стан співробітника (TimeTrackingSystem.open_record, presence.shift_of)
+враховує ще не записані події цього процесу - див. pending_event().
+"""
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ClockEvent = namedtuple('ClockEvent', ['kind', 'employee_id', 'at'])
+
+
+def _encode(event):
+    return (json.dumps({'type': event.kind, 'employee': event.employee_id, 'at': event.at.isoformat()}) + '\n').encode()
+
+
+def _decode(line):
+    data = json.loads(line)
+    return ClockEvent(data['type'], data['employee'], datetime.fromisoformat(data['at']))
+
+
+def apply_events(events, segment, offset):
+    """
+    Застосувати події журналу однією транзакцією
+
+    Події йдуть по порядку: прихід відкриває запис, якщо співробітник не на
+    роботі; вихід закриває відкритий запис (з БД або створений у цьому ж
+    пакеті). Інші події (подвійні приходи з різних процесів, події видалених
+    співробітників) пропускаються, як і події, старші за вже записані для
+    співробітника: recover() дочитує журнал іншого процесу пізніше, і його
+    вихід не повинен закрити новішу сесію.
+
+    Args:
+        events: список ClockEvent
+        segment, offset: файл журналу і позиція після останньої події
+
+    Returns:
+        кількість застосованих подій
+    """
+    from employees.models import Employee
+    from employees.report_cache import bump_version
+    from .models import ClockJournalCheckpoint, DailyTimesheet, Presence, TimeRecord
+
+    with transaction.atomic():
+        employee_ids = {event.employee_id for event in events}
+        known = set(Employee.objects.filter(id__in=employee_ids).values_list('id', flat=True))
+        open_records = {
+            record.employee_id: record
+            for record in TimeRecord.objects.select_for_update().filter(
+                employee_id__in=known, clock_out_time__isnull=True
+            )
+        }
+
+        # Найпізніший записаний час співробітника: старіші події - застарілі
+        latest = {}
+        since = min((event.at for event in events), default=None)
+        if since is not None:
+            rows = TimeRecord.objects.filter(
+                employee_id__in=known, date__gte=since.date() - timedelta(days=1)
+            ).values('employee_id').annotate(last_in=Max('clock_in_time'), last_out=Max('clock_out_time'))
+            for row in rows:
+                latest[row['employee_id']] = max(filter(None, (row['last_in'], row['last_out'])))
+
+        created, closed, applied = [], [], 0
+        for event in events:
+            if event.employee_id not in known:
+                continue
+            if event.employee_id in latest and event.at < latest[event.employee_id]:
+                continue
+            latest[event.employee_id] = event.at
+            record = open_records.get(event.employee_id)
+            if event.kind == 'in' and record is None:
+                record = TimeRecord(employee_id=event.employee_id, clock_in_time=event.at, date=event.at.date())
+                open_records[event.employee_id] = record
+                created.append(record)
+                applied += 1
+            elif event.kind == 'out' and record is not None:
+                record.clock_out_time = record.updated_at = event.at
+                if record.pk:
+                    closed.append(record)
+                del open_records[event.employee_id]
+                applied += 1
+
+        # Спершу закриття: новий прихід того ж співробітника порушив би timerecord_one_open_session
+        TimeRecord.objects.bulk_update(closed, ['clock_out_time', 'updated_at'])
+        TimeRecord.objects.bulk_create(created)
+        DailyTimesheet.refresh_many((record.employee_id, record.date) for record in created + closed)
+        Presence.refresh_many(known)
+        ClockJournalCheckpoint.objects.update_or_create(segment=segment, defaults={'offset': offset})
+        if created or closed:
+            bump_version(TimeRecord._meta.label)
+    return applied
+
+
+def _read_events(path, offset):
+    """Повні рядки журналу після offset: [(позиція після рядка, ClockEvent)]"""
+    with open(path, 'rb') as journal:
+        journal.seek(offset)
+        data = journal.read()
+    events = []
+    # Обрізаний останній рядок (збій під час запису) клієнту не підтверджувався
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b'\n'):
+            break
+        offset += len(line)
+        events.append((offset, _decode(line)))
+    return events
+
+
+def recover(directory, batch_size=1000):
+    """
+    Дочитати журнали завершених процесів і видалити їх
+
+    Returns:
+        кількість застосованих подій
+    """
+    from .models import ClockJournalCheckpoint
+
+    applied = 0
+    for path in sorted(Path(directory).glob('*.jsonl')):
+        with open(path, 'rb') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue  # журнал живого процесу
+
+            checkpoint = ClockJournalCheckpoint.objects.filter(segment=path.name).values_list('offset', flat=True)
+            events = _read_events(path, checkpoint.first() or 0)
+            for start in range(0, len(events), batch_size):
+                chunk = events[start:start + batch_size]
+                applied += apply_events([event for _, event in chunk], path.name, chunk[-1][0])
+            path.unlink()
+
+    existing = {path.name for path in Path(directory).glob('*.jsonl')}
+    ClockJournalCheckpoint.objects.exclude(segment__in=existing).delete()
+    return applied
+
+
+class ClockJournal:
+    """Журнал подій процесу з фоновим груповим записом у БД"""
+
+    def __init__(self, directory, interval=0.005, segment_max_bytes=1024 * 1024):
+        if fcntl is None:
+            raise ImproperlyConfigured('CLOCK_JOURNAL_DIR потребує POSIX (fcntl.flock)')
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.interval = interval
+        self.segment_max_bytes = segment_max_bytes
+
+        self.lock = threading.Lock()  # файл, pending, latest
+        self.flush_lock = threading.Lock()
+        self.pending = []  # [(позиція після події, ClockEvent)]
+        self.latest = {}  # {employee_id: остання ще не записана подія}
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+
+        recover(self.directory)
+        self._open_segment()
+        self.thread = threading.Thread(target=self._run, name='clock-journal-flusher', daemon=True)
+        self.thread.start()
+
+    def _open_segment(self):
+        self.segment = f'{socket.gethostname()}-{os.getpid()}-{time.time_ns()}.jsonl'
+        self.fd = os.open(self.directory / self.segment, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        self.size = 0
+
+    def _rotate(self):
+        """Новий файл журналу, якщо поточний великий і вже повністю записаний у БД"""
+        from .models import ClockJournalCheckpoint
+
+        if self.pending or self.size < self.segment_max_bytes:
+            return
+        old_segment, old_fd = self.segment, self.fd
+        self._open_segment()
+        os.unlink(self.directory / old_segment)
+        os.close(old_fd)
+        ClockJournalCheckpoint.objects.filter(segment=old_segment).delete()
+
+    def pending_event(self, employee_id):
+        """Остання ще не записана в БД подія співробітника або None"""
+        return self.latest.get(employee_id)
+
+    def record(self, kind, employee_id, stored_open):
+        """
+        Дописати подію, якщо вона змінює стан співробітника
+
+        Args:
+            kind: 'in' або 'out'
+            stored_open: чи є у співробітника відкритий запис у БД
+                (не записані події цього процесу мають пріоритет)
+
+        Returns:
+            ClockEvent або None (прихід, коли вже на роботі; вихід без приходу)
+        """
+        with self.lock:
+            previous = self.latest.get(employee_id)
+            is_open = previous.kind == 'in' if previous else stored_open
+            if is_open == (kind == 'in'):
+                return None
+
+            event = ClockEvent(kind, employee_id, timezone.now())
+            line = _encode(event)
+            os.write(self.fd, line)
+            os.fsync(self.fd)
+            self.size += len(line)
+            self.pending.append((self.size, event))
+            self.latest[employee_id] = event
+        self.wakeup.set()
+        return event
+
+    def flush(self):
+        """Записати накопичені події в БД; повертає їх кількість"""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return 0
+            try:
+                apply_events([event for _, event in batch], self.segment, batch[-1][0])
+            except Exception:
+                with self.lock:
+                    self.pending = batch + self.pending
+                raise
+
+            with self.lock:
+                for _, event in batch:
+                    if self.latest.get(event.employee_id) is event:
+                        del self.latest[event.employee_id]
+                self._rotate()
+            return len(batch)
+
+    def _run(self):
+        while not self.stopping.is_set():
+            self.wakeup.wait()
+            # Групова фіксація: події, що надійшли за інтервал, - однією транзакцією
+            self.stopping.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Не вдалося записати події журналу приходів, повтор')
+                connection.close()
+                self.wakeup.set()
+                self.stopping.wait(max(self.interval, 0.1))
+        connection.close()
+
+    def close(self):
+        """Зупинити фоновий потік і записати залишок подій"""
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        self.wakeup.set()
+        self.thread.join()
+        try:
+            self.flush()
+        finally:
+            os.close(self.fd)
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """Журнал процесу, якщо увімкнено CLOCK_JOURNAL_DIR, інакше None"""
+    global _journal
+    directory = getattr(settings, 'CLOCK_JOURNAL_DIR', None)
+    if not directory:
+        return None
+    if _journal is None or _journal.directory != Path(directory):
+        with _journal_lock:
+            if _journal is None or _journal.directory != Path(directory):
+                close_journal()
+                _journal = ClockJournal(directory, getattr(settings, 'CLOCK_FLUSH_INTERVAL', 0.005))
+    return _journal
+
+
+def pending_event(employee_id):
+    """Ще не записана подія співробітника (у буферизованому режимі) або None"""
+    journal = get_journal()
+    return journal.pending_event(employee_id) if journal else None
+
+
+def close_journal():
+    """Записати й закрити журнал процесу (при завершенні процесу, у тестах)"""
+    global _journal
+    if _journal is not None:
+        journal, _journal = _journal, None
+        journal.close()
+
+
+atexit.register(close_journal)
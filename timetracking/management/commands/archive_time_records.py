@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from timetracking.archive import archive_records
+from timetracking.models import TimeRecordArchive
+
+
+class Command(BaseCommand):
+    help = 'Перенести закриті записи часу, старші за TIMERECORD_ARCHIVE_AFTER_DAYS, у стиснутий архів по місяцях'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Співробітників в одній транзакції')
+
+    def handle(self, *args, **options):
+        moved = archive_records(batch_size=options['batch_size'])
+        for month, count in moved.items():
+            self.stdout.write(f'📦 {month:%m.%Y}: {count} записів')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ В архіві {sum(moved.values())} записів (до {TimeRecordArchive.cutoff():%d.%m.%Y})'
+        ))
@@ -0,0 +1,24 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from timetracking.models import DailyTimesheet
+
+
+class Command(BaseCommand):
+    help = 'Заповнити денні підсумки робочого часу з наявних записів'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat,
+                            help='Перша дата (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat,
+                            help='Остання дата (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = DailyTimesheet.rebuild(
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Створено {created} денних підсумків'))
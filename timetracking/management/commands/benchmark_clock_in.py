@@ -0,0 +1,109 @@
+import itertools
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from employees.models import Employee
+from timetracking.ingest import close_journal, get_journal
+from timetracking.models import TimeRecord, TimeTrackingSystem
+
+
+def _percentile(values, percent):
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Затримка clock_in під сплеском запитів: запис у БД одразу проти журналу з груповим записом '
+        '(потрібна БД у файлі; створені співробітники видаляються)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--rate', type=int, default=5000, help='Запитів за хвилину')
+        parser.add_argument('--threads', type=int, default=16, help='Потоків-обробників запитів')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError('Потрібна БД у файлі (SQLITE_PATH)')
+
+        self.stdout.write(
+            f'⏱️ {options["requests"]} приходів, {options["rate"]}/хв, {options["threads"]} потоків'
+        )
+        for mode in ('direct', 'journal'):
+            employee_ids = self.create_employees(options['requests'])
+            try:
+                if mode == 'direct':
+                    latencies, errors = self.run_burst(employee_ids, options)
+                else:
+                    with tempfile.TemporaryDirectory() as directory, override_settings(CLOCK_JOURNAL_DIR=directory):
+                        get_journal()  # відновлення і старт фонового потоку - не в заміри
+                        latencies, errors = self.run_burst(employee_ids, options)
+                        started = time.perf_counter()
+                        close_journal()
+                        self.stdout.write(f'   journal: дозапис у БД після сплеску {time.perf_counter() - started:.3f} с')
+                self.report(mode, employee_ids, latencies, errors)
+            finally:
+                Employee.objects.filter(pk__in=employee_ids).delete()
+
+    def create_employees(self, count):
+        offset = Employee.objects.count()
+        employees = Employee.objects.bulk_create([
+            Employee(first_name='Бенчмарк', last_name=str(i), email=f'bench{offset + i}@company.com',
+                     phone='+380500000000', position='Інженер', department=f'Відділ {i % 10}',
+                     hire_date=date(2024, 1, 1))
+            for i in range(count)
+        ])
+        return list(Employee.objects.filter(email__in=[emp.email for emp in employees]).values_list('id', flat=True))
+
+    def run_burst(self, employee_ids, options):
+        """
+        Відкрите навантаження: запит i надходить у момент start + i / rate,
+        незалежно від того, чи оброблено попередні. Затримка рахується від
+        моменту надходження, тож черга до зайнятих потоків теж враховується.
+        """
+        interval = 60 / options['rate']
+        start = time.perf_counter() + 0.2
+        arrivals = itertools.count()
+        latencies, errors = [], []
+
+        def worker():
+            try:
+                for index in arrivals:
+                    if index >= len(employee_ids):
+                        return
+                    arrival = start + index * interval
+                    time.sleep(max(0, arrival - time.perf_counter()))
+                    try:
+                        if TimeTrackingSystem.clock_in(Employee(pk=employee_ids[index])) is None:
+                            errors.append('повторний прихід')
+                    except Exception as exc:
+                        errors.append(f'{type(exc).__name__}: {exc}')
+                    latencies.append(time.perf_counter() - arrival)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted(latencies), errors
+
+    def report(self, mode, employee_ids, latencies, errors):
+        if errors:
+            raise CommandError(f'{mode}: {len(errors)} помилок, напр. {errors[0]}')
+        stored = TimeRecord.objects.filter(employee_id__in=employee_ids, clock_out_time__isnull=True).count()
+        if stored != len(employee_ids):
+            raise CommandError(f'{mode}: у БД {stored} відкритих записів з {len(employee_ids)}')
+        ms = [latency * 1000 for latency in latencies]
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {mode:8} p50 {statistics.median(ms):7.2f} мс  p95 {_percentile(ms, 95):7.2f} мс  '
+            f'p99 {_percentile(ms, 99):7.2f} мс  max {ms[-1]:7.2f} мс'
+        ))
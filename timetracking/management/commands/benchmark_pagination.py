@@ -0,0 +1,96 @@
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.pagination import Cursor
+
+from employees.models import Employee
+from hrm_project.pagination import KeysetPagination
+from timetracking.models import TimeRecord
+from timetracking.views import TimeRecordViewSet
+
+URL = 'http://localhost/api/time-records/'
+
+
+class Command(BaseCommand):
+    help = 'Порівняти час сторінки /api/time-records/ на різній глибині: курсор проти OFFSET (дані відкочуються)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=200_000)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--runs', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.populate(options['records'])
+            self.stdout.write(f'📦 {options["records"]} записів створено за {time.perf_counter() - started:.1f} с')
+
+            ids = list(TimeRecord.objects.order_by('-id').values_list('id', flat=True))
+            view = TimeRecordViewSet.as_view({'get': 'list'})
+            factory = RequestFactory(SERVER_NAME='localhost')
+            paginator = KeysetPagination()
+            paginator.base_url = URL
+            page_size = options['page_size']
+
+            for depth in (0, 0.1, 0.5, 0.9, 0.99):
+                offset = int(len(ids) * depth)
+                cursor_url = URL
+                if offset:
+                    # Курсор, який клієнт отримав би у посиланні next на цій глибині
+                    cursor_url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(ids[offset - 1])))
+                request_url = f'{cursor_url}{"&" if "?" in cursor_url else "?"}page_size={page_size}'
+
+                with CaptureQueriesContext(connection) as queries:
+                    view(factory.get(request_url))
+                cursor_ms = self.measure(lambda: view(factory.get(request_url)).render(), options['runs'])
+                position = ids[offset - 1] if offset else ids[0] + 1
+                keyset_ms = self.measure(
+                    lambda: list(TimeRecord.objects.filter(id__lt=position).order_by('-id')[:page_size]), options['runs']
+                )
+                offset_ms = self.measure(
+                    lambda: list(TimeRecord.objects.order_by('-id')[offset:offset + page_size]), options['runs']
+                )
+                self.stdout.write(
+                    f'📄 глибина {offset:>8}: курсор (API) {cursor_ms:7.2f} мс, {len(queries)} запитів; '
+                    f'запит: курсор {keyset_ms:6.2f} мс, OFFSET {offset_ms:6.2f} мс'
+                )
+
+            transaction.set_rollback(True)
+
+    def measure(self, func, runs):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def populate(self, count):
+        """Синтетичні записи (bulk_create оминає сигнали; денні підсумки тут не потрібні)"""
+        employees_count = max(1, count // 250)
+        offset = Employee.objects.count()
+        Employee.objects.bulk_create([
+            Employee(first_name='Бенч', last_name=str(i), email=f'bench{offset + i}@company.com',
+                     phone='+380500000000', position='Інженер', department=f'Відділ {i % 10}',
+                     hire_date=date(2024, 1, 1))
+            for i in range(employees_count)
+        ], batch_size=1000)
+        employees = list(Employee.objects.filter(email__startswith='bench').values_list('id', flat=True))
+
+        today = timezone.now().date()
+        batch = []
+        for i in range(count):
+            day = today - timedelta(days=i // len(employees))
+            clock_in = timezone.make_aware(datetime(day.year, day.month, day.day, 9))
+            batch.append(TimeRecord(employee_id=employees[i % len(employees)], date=day, clock_in_time=clock_in,
+                                    clock_out_time=clock_in + timedelta(hours=8)))
+            if len(batch) >= 5000:
+                TimeRecord.objects.bulk_create(batch)
+                batch = []
+        TimeRecord.objects.bulk_create(batch)
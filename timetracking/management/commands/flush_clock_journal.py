@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from timetracking.ingest import recover
+
+
+class Command(BaseCommand):
+    help = 'Записати в БД події журналів приходів завершених процесів (CLOCK_JOURNAL_DIR)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=settings.CLOCK_JOURNAL_DIR,
+                            help='Каталог журналу (за замовчуванням CLOCK_JOURNAL_DIR)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not options['dir']:
+            raise CommandError('Не задано CLOCK_JOURNAL_DIR')
+        applied = recover(options['dir'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Застосовано {applied} подій журналу'))
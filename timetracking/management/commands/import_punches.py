@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from timetracking.punches import import_punches
+
+
+class Command(BaseCommand):
+    help = 'Імпортувати журнал турнікетів (CSV: номер перепустки, час ISO 8601, in/out)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл CSV')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Записів в одній транзакції')
+        parser.add_argument('--sort-buffer', type=int, default=200_000, help='Подій, що сортуються в пам\'яті')
+        parser.add_argument('--debounce', type=int, default=60,
+                            help='Повторна відмітка ближче за стільки секунд - дублікат')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with open(options['path'], newline='', encoding='utf-8') as lines:
+            stats = import_punches(
+                lines,
+                batch_size=options['batch_size'],
+                sort_buffer=options['sort_buffer'],
+                debounce=timedelta(seconds=options['debounce']),
+            )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {stats["punches"]} відміток за {elapsed:.1f} с: створено {stats["created"]} записів, '
+            f'відкрито {stats["open"]}, закрито {stats["closed"]}'
+        ))
+        skipped = {
+            'вже в БД': stats['existing'],
+            'дублікатів': stats['duplicates'],
+            'прихід без виходу': stats['unmatched_in'],
+            'вихід без приходу': stats['unmatched_out'],
+            'невідомих перепусток': stats['unknown_badge'],
+            'некоректних рядків': stats['invalid'],
+        }
+        if any(skipped.values()):
+            self.stdout.write('⚠️ Пропущено: ' + ', '.join(f'{label} {count}' for label, count in skipped.items() if count))
@@ -0,0 +1,130 @@
+import multiprocessing
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count
+
+
+# Моделі імпортуються у функціях: процеси-воркери (spawn) імпортують цей модуль до django.setup()
+def _employee_model():
+    from employees.models import Employee
+    return Employee
+
+
+def _run_worker(employee_ids, action, start_at, seed):
+    """Один потік: усі співробітники у випадковому порядку; (успішні, помилки)"""
+    from timetracking.models import TimeTrackingSystem
+
+    Employee = _employee_model()
+    employee_ids = list(employee_ids)
+    random.Random(seed).shuffle(employee_ids)
+    time.sleep(max(0, start_at - time.time()))
+
+    done, errors = 0, []
+    try:
+        for employee_id in employee_ids:
+            try:
+                if getattr(TimeTrackingSystem, action)(Employee(pk=employee_id)) is not None:
+                    done += 1
+            except Exception as exc:  # звітується батьківському процесу
+                errors.append(f'{type(exc).__name__}: {exc}')
+    finally:
+        connections.close_all()
+    return done, errors
+
+
+def _run_threads(employee_ids, action, threads, start_at, seed):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(
+            lambda index: _run_worker(employee_ids, action, start_at, seed + index), range(threads)
+        ))
+    return sum(done for done, _ in results), [error for _, errors in results for error in errors]
+
+
+def _run_process(employee_ids, action, threads, start_at, seed):
+    django.setup()
+    return _run_threads(employee_ids, action, threads, start_at, seed)
+
+
+class Command(BaseCommand):
+    help = (
+        'Одночасні clock_in / clock_out тих самих співробітників з потоків і процесів '
+        '(потрібна БД у файлі; створені співробітники видаляються)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--threads', type=int, default=8, help='Потоків у кожному процесі')
+        parser.add_argument('--processes', type=int, default=4, help='0 - лише потоки цього процесу')
+        parser.add_argument('--rounds', type=int, default=2, help='Кількість циклів прихід/вихід')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            if connection.is_in_memory_db():
+                raise CommandError('БД у пам\'яті недоступна іншим процесам; вкажіть файл (SQLITE_PATH)')
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                self.stdout.write(f'🗄️ journal_mode={cursor.fetchone()[0]}')
+
+        Employee = _employee_model()
+        offset = Employee.objects.count()
+        employees = Employee.objects.bulk_create([
+            Employee(first_name='Стрес', last_name=str(i), email=f'stress{offset + i}@company.com',
+                     phone='+380500000000', position='Інженер', department=f'Відділ {i % 10}',
+                     hire_date=date(2024, 1, 1))
+            for i in range(options['employees'])
+        ])
+        employee_ids = list(Employee.objects.filter(
+            email__in=[emp.email for emp in employees]
+        ).values_list('id', flat=True))
+        workers = max(options['processes'], 1) * options['threads']
+
+        try:
+            for round_number in range(1, options['rounds'] + 1):
+                for action in ('clock_in', 'clock_out'):
+                    started = time.perf_counter()
+                    done, errors = self.run_phase(employee_ids, action, options)
+                    elapsed = time.perf_counter() - started
+                    self.check_phase(employee_ids, action, done, errors)
+                    self.stdout.write(self.style.SUCCESS(
+                        f'✅ Раунд {round_number}, {action}: {workers} воркерів × {len(employee_ids)} спроб, '
+                        f'успішних {done}, {elapsed:.1f} с'
+                    ))
+        finally:
+            Employee.objects.filter(pk__in=employee_ids).delete()
+
+    def run_phase(self, employee_ids, action, options):
+        # Старт за спільним часом, щоб процеси встигли запуститися і стартували разом
+        start_at = time.time() + (2 if options['processes'] else 0.2)
+        seed = random.randrange(1_000_000)
+        if not options['processes']:
+            return _run_threads(employee_ids, action, options['threads'], start_at, seed)
+
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(options['processes']) as pool:
+            results = pool.starmap(_run_process, [
+                (employee_ids, action, options['threads'], start_at, seed + index * options['threads'])
+                for index in range(options['processes'])
+            ])
+        return sum(done for done, _ in results), [error for _, errors in results for error in errors]
+
+    def check_phase(self, employee_ids, action, done, errors):
+        from timetracking.models import Presence, TimeRecord
+
+        if errors:
+            raise CommandError(f'{action}: {len(errors)} помилок, напр. {errors[0]}')
+        duplicates = TimeRecord.objects.filter(
+            employee_id__in=employee_ids, clock_out_time__isnull=True
+        ).values('employee').annotate(count=Count('id')).filter(count__gt=1).count()
+        present = Presence.objects.filter(employee_id__in=employee_ids).count()
+        expected_present = len(employee_ids) if action == 'clock_in' else 0
+        if done != len(employee_ids) or duplicates or present != expected_present:
+            raise CommandError(
+                f'{action}: успішних {done} з {len(employee_ids)}, дублікатів {duplicates}, '
+                f'присутніх {present} замість {expected_present}'
+            )
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, F, Q, Sum
+
+# Знімок timetracking.models.session_duration() на момент міграції: міграція не
+# залежить від поточного коду моделей
+SESSION_DURATION = ExpressionWrapper(F('clock_out_time') - F('clock_in_time'), output_field=models.DurationField())
+
+
+def populate_timesheets(apps, schema_editor):
+    """Початкове заповнення денних підсумків з наявних записів"""
+    TimeRecord = apps.get_model('timetracking', 'TimeRecord')
+    DailyTimesheet = apps.get_model('timetracking', 'DailyTimesheet')
+
+    rows = TimeRecord.objects.values('employee', 'date').annotate(
+        duration=Sum(SESSION_DURATION),
+        sessions=Count('id'),
+        open_sessions=Count('id', filter=Q(clock_out_time__isnull=True)),
+    ).order_by()
+    DailyTimesheet.objects.bulk_create([
+        DailyTimesheet(
+            employee_id=row['employee'],
+            date=row['date'],
+            total_seconds=int(row['duration'].total_seconds()) if row['duration'] else 0,
+            session_count=row['sessions'],
+            has_open_session=row['open_sessions'] > 0,
+        )
+        for row in rows.iterator(chunk_size=1000)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_departmentpayroll'),
+        ('timetracking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTimesheet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('total_seconds', models.PositiveIntegerField(default=0, verbose_name='Відпрацьовано (сек)')),
+                ('session_count', models.PositiveIntegerField(default=0, verbose_name='Кількість сесій')),
+                ('has_open_session', models.BooleanField(default=False, verbose_name='Є незакрита сесія')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='employees.employee', verbose_name='Співробітник')),
+            ],
+            options={
+                'verbose_name': 'Денний підсумок часу',
+                'verbose_name_plural': 'Денні підсумки часу',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='unique_timesheet_employee_date')],
+            },
+        ),
+        migrations.RunPython(populate_timesheets, migrations.RunPython.noop),
+    ]
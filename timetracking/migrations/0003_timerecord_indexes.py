@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0004_employee_department_idx'),
+        ('timetracking', '0002_dailytimesheet'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timerecord',
+            name='employee',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='employees.employee', verbose_name='Співробітник'),
+        ),
+        migrations.AddIndex(
+            model_name='timerecord',
+            index=models.Index(fields=['employee', '-date'], name='timerecord_emp_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timerecord',
+            index=models.Index(fields=['date'], name='timerecord_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timerecord',
+            index=models.Index(condition=models.Q(('clock_out_time__isnull', True)), fields=['date', 'employee'], name='timerecord_open_idx'),
+        ),
+    ]
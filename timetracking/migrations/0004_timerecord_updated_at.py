@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0003_timerecord_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timerecord',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Оновлено'),
+        ),
+    ]
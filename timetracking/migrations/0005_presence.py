@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_presence(apps, schema_editor):
+    """Присутність з наявних незакритих записів (останній запис співробітника)"""
+    TimeRecord = apps.get_model('timetracking', 'TimeRecord')
+    Presence = apps.get_model('timetracking', 'Presence')
+
+    latest = {}
+    open_records = TimeRecord.objects.filter(clock_out_time__isnull=True).order_by(
+        '-clock_in_time', '-id'
+    ).values_list('employee_id', 'id', 'clock_in_time')
+    for employee_id, record_id, since in open_records.iterator(chunk_size=1000):
+        latest.setdefault(employee_id, (record_id, since))
+    Presence.objects.bulk_create([
+        Presence(employee_id=employee_id, record_id=record_id, since=since)
+        for employee_id, (record_id, since) in latest.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employee_updated_at'),
+        ('timetracking', '0004_timerecord_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Presence',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='presence', serialize=False, to='employees.employee', verbose_name='Співробітник')),
+                ('since', models.DateTimeField(verbose_name='На роботі з')),
+                ('record', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='timetracking.timerecord', verbose_name='Відкритий запис')),
+            ],
+            options={
+                'verbose_name': 'Присутність',
+                'verbose_name_plural': 'Присутність',
+            },
+        ),
+        migrations.RunPython(populate_presence, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:40
+
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, F, Q, Sum
+
+# Знімок timetracking.models.session_duration() на момент міграції: міграція не
+# залежить від поточного коду моделей
+SESSION_DURATION = ExpressionWrapper(F('clock_out_time') - F('clock_in_time'), output_field=models.DurationField())
+
+
+def close_duplicate_sessions(apps, schema_editor):
+    """
+    Закрити зайві незакриті записи (подвійні приходи) перед додаванням обмеження
+
+    Відкритим лишається найпізніший запис співробітника; кожен раніший
+    закривається часом приходу наступного. Денні підсумки змінених днів перераховуються.
+    """
+    TimeRecord = apps.get_model('timetracking', 'TimeRecord')
+    DailyTimesheet = apps.get_model('timetracking', 'DailyTimesheet')
+
+    duplicated = TimeRecord.objects.filter(clock_out_time__isnull=True).values('employee').annotate(
+        count=Count('id')
+    ).filter(count__gt=1).values('employee')
+    open_records = TimeRecord.objects.filter(
+        employee__in=duplicated, clock_out_time__isnull=True
+    ).order_by('employee', 'clock_in_time', 'id')
+
+    days, previous = set(), None
+    for record in open_records:
+        if previous is not None and previous.employee_id == record.employee_id:
+            previous.clock_out_time = record.clock_in_time
+            previous.save(update_fields=['clock_out_time'])
+            days.add((previous.employee_id, previous.date))
+        previous = record
+
+    for employee_id, date in days:
+        row = TimeRecord.objects.filter(employee_id=employee_id, date=date).aggregate(
+            duration=Sum(SESSION_DURATION),
+            open_sessions=Count('id', filter=Q(clock_out_time__isnull=True)),
+        )
+        DailyTimesheet.objects.filter(employee_id=employee_id, date=date).update(
+            total_seconds=int(row['duration'].total_seconds()) if row['duration'] else 0,
+            has_open_session=row['open_sessions'] > 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_employee_updated_at'),
+        ('timetracking', '0005_presence'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_sessions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='timerecord',
+            constraint=models.UniqueConstraint(condition=models.Q(('clock_out_time__isnull', True)), fields=('employee',), name='timerecord_one_open_session', violation_error_message='Співробітник уже має незакритий запис часу.'),
+        ),
+    ]
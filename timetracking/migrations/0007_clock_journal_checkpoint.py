@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0006_one_open_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClockJournalCheckpoint',
+            fields=[
+                ('segment', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Файл журналу')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Позиція')),
+            ],
+            options={
+                'verbose_name': 'Позиція журналу приходів',
+                'verbose_name_plural': 'Позиції журналу приходів',
+            },
+        ),
+    ]
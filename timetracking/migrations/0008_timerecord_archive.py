@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_employee_badge_id'),
+        ('timetracking', '0007_clock_journal_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeRecordArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='Місяць')),
+                ('record_count', models.PositiveIntegerField(default=0, verbose_name='Кількість записів')),
+                ('days', models.JSONField(default=dict, verbose_name='Підсумки по днях')),
+                ('data', models.BinaryField(verbose_name='Записи (zlib, JSON)')),
+                ('employee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='employees.employee', verbose_name='Співробітник')),
+            ],
+            options={
+                'verbose_name': 'Архів записів часу',
+                'verbose_name_plural': 'Архів записів часу',
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'month'), name='unique_archive_employee_month')],
+            },
+        ),
+    ]
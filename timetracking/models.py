@@ -1,14 +1,75 @@
-from django.db import models
+import json
+import zlib
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
 from employees.models import Employee
-from datetime import datetime
+from employees.report_cache import bump_version
+from .ingest import get_journal, pending_event
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from django.utils import timezone
 
 
+def session_duration(prefix=''):
+    """ORM-вираз тривалості сесії (NULL, якщо сесія не закрита)"""
+    return ExpressionWrapper(
+        F(f'{prefix}clock_out_time') - F(f'{prefix}clock_in_time'),
+        output_field=DurationField()
+    )
+
+
+def duration_to_hours(duration):
+    """Перевести timedelta з агрегату в години"""
+    if not duration:
+        return 0
+    return round(duration.total_seconds() / 3600, 2)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _microseconds(value):
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_microseconds(value):
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class TimeRecordQuerySet(models.QuerySet):
+    """Запити до записів часу з розрахунком тривалості в БД"""
+
+    def with_duration(self):
+        """Додати анотацію duration до кожного запису"""
+        return self.annotate(duration=session_duration())
+
+    def total_hours(self):
+        """Сума відпрацьованих годин по закритих сесіях"""
+        total = self.aggregate(total=Sum(session_duration()))['total']
+        return duration_to_hours(total)
+
+    def hours_by_employee(self):
+        """Тривалість роботи по співробітниках (employee, duration)"""
+        return self.values('employee').annotate(
+            duration=Sum(session_duration())
+        ).order_by('employee')
+
+    def hours_by_day(self):
+        """Тривалість роботи по днях (date, duration)"""
+        return self.values('date').annotate(
+            duration=Sum(session_duration())
+        ).order_by('date')
+
+
 class TimeRecord(models.Model):
     """Запис робочого часу"""
+    # Окремий індекс FK не потрібен: його покриває timerecord_emp_date_idx
     employee = models.ForeignKey(
         Employee,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name="Співробітник"
     )
     clock_in_time = models.DateTimeField(verbose_name="Час входу")
@@ -18,6 +79,9 @@ class TimeRecord(models.Model):
         verbose_name="Час виходу"
     )
     date = models.DateField(verbose_name="Дата")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    objects = TimeRecordQuerySet.as_manager()
 
     def calculate_hours(self):
         """Розрахувати відпрацьовані години"""
@@ -43,6 +107,426 @@ class TimeRecord(models.Model):
         verbose_name = "Запис робочого часу"
         verbose_name_plural = "Записи робочого часу"
         ordering = ['-date', '-clock_in_time']
+        indexes = [
+            # Історія та години співробітника за період
+            models.Index(fields=['employee', '-date'], name='timerecord_emp_date_idx'),
+            # Години всіх співробітників за період (звіти)
+            models.Index(fields=['date'], name='timerecord_date_idx'),
+            # Незакриті сесії: хто зараз на роботі, відмітка приходу/виходу
+            models.Index(fields=['date', 'employee'], condition=Q(clock_out_time__isnull=True),
+                         name='timerecord_open_idx'),
+        ]
+        constraints = [
+            # Не більше однієї незакритої сесії: подвійний прихід відхиляє БД
+            models.UniqueConstraint(
+                fields=['employee'],
+                condition=Q(clock_out_time__isnull=True),
+                name='timerecord_one_open_session',
+                violation_error_message='Співробітник уже має незакритий запис часу.',
+            ),
+        ]
+
+
+class TimeRecordArchiveQuerySet(models.QuerySet):
+    """Запити до архіву записів часу"""
+
+    def day_totals(self, days):
+        """
+        Підсумки архівованих записів за дні {(співробітник, дата): (секунди, сесії)}
+
+        Дні після межі архівації (TimeRecordArchive.cutoff) архіву не мають - без запиту.
+        """
+        cutoff = TimeRecordArchive.cutoff()
+        days = {(employee_id, day) for employee_id, day in days if day < cutoff}
+        if not days:
+            return {}
+        segments = self.filter(
+            employee_id__in={employee_id for employee_id, _ in days},
+            month__in={day.replace(day=1) for _, day in days},
+        ).values_list('employee_id', 'days')
+        totals = {}
+        for employee_id, segment_days in segments:
+            for day, (seconds, sessions) in segment_days.items():
+                key = (employee_id, date.fromisoformat(day))
+                if key in days:
+                    totals[key] = (seconds, sessions)
+        return totals
+
+
+class TimeRecordArchive(models.Model):
+    """
+    Архівні записи часу співробітника за місяць (холодне сховище)
+
+    Закриті записи, старші за TIMERECORD_ARCHIVE_AFTER_DAYS, переносяться
+    сюди командою archive_time_records: один стиснутий сегмент на
+    співробітника й місяць. Денні підсумки (DailyTimesheet) лишаються в
+    таблиці й враховують архів через day_totals().
+    """
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Співробітник"
+    )
+    month = models.DateField(verbose_name="Місяць")
+    record_count = models.PositiveIntegerField(default=0, verbose_name="Кількість записів")
+    # {дата ISO: [секунди, сесії]} - не стиснуто, щоб рахувати денні підсумки без розпакування
+    days = models.JSONField(default=dict, verbose_name="Підсумки по днях")
+    data = models.BinaryField(verbose_name="Записи (zlib, JSON)")
+
+    objects = TimeRecordArchiveQuerySet.as_manager()
+
+    @staticmethod
+    def cutoff(today=None):
+        """Перший день місяця, з якого записи часу лишаються в таблиці"""
+        today = today or timezone.localdate()
+        return (today - timedelta(days=settings.TIMERECORD_ARCHIVE_AFTER_DAYS)).replace(day=1)
+
+    @staticmethod
+    def pack(records):
+        """
+        Стиснути записи [TimeRecord] у дані сегмента
+
+        Стовпці з різницями між сусідніми значеннями (мікросекунди, дні) -
+        так zlib стискає в рази краще, ніж рядки дат.
+        """
+        ids, clock_ins, durations, days, updates = [], [], [], [], []
+        previous_id, previous_in = 0, 0
+        for record in records:
+            clock_in = _microseconds(record.clock_in_time)
+            clock_out = _microseconds(record.clock_out_time)
+            ids.append(record.pk - previous_id)
+            clock_ins.append(clock_in - previous_in)
+            durations.append(clock_out - clock_in)
+            days.append(record.date.toordinal())
+            updates.append(_microseconds(record.updated_at) - clock_out)
+            previous_id, previous_in = record.pk, clock_in
+        return zlib.compress(json.dumps(
+            [ids, clock_ins, durations, days, updates], separators=(',', ':')
+        ).encode(), 9)
+
+    def records(self):
+        """Записи сегмента (незбережені TimeRecord з первинними ключами таблиці)"""
+        ids, clock_ins, durations, days, updates = json.loads(zlib.decompress(self.data))
+        records = []
+        pk, clock_in = 0, 0
+        for id_delta, in_delta, duration, day, updated in zip(ids, clock_ins, durations, days, updates):
+            pk, clock_in = pk + id_delta, clock_in + in_delta
+            records.append(TimeRecord(
+                pk=pk, employee_id=self.employee_id, clock_in_time=_from_microseconds(clock_in),
+                clock_out_time=_from_microseconds(clock_in + duration), date=date.fromordinal(day),
+                updated_at=_from_microseconds(clock_in + duration + updated),
+            ))
+        return records
+
+    def __str__(self):
+        return f"{self.employee} - {self.month:%m.%Y}: {self.record_count} записів"
+
+    class Meta:
+        verbose_name = "Архів записів часу"
+        verbose_name_plural = "Архів записів часу"
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'month'], name='unique_archive_employee_month'),
+        ]
+
+
+class DailyTimesheetQuerySet(models.QuerySet):
+    """Агрегати по денних підсумках"""
+
+    def summary(self):
+        """Години та відпрацьовані дні за діапазон одним запитом"""
+        stats = self.aggregate(
+            total_seconds=Sum('total_seconds'),
+            days_worked=Count('id'),
+        )
+        return {
+            'hours': round((stats['total_seconds'] or 0) / 3600, 2),
+            'days_worked': stats['days_worked'],
+        }
+
+    def by_month(self):
+        """Години та відпрацьовані дні по місяцях {перший_день_місяця: {...}}"""
+        rows = self.annotate(month=TruncMonth('date')).values('month').annotate(
+            total_seconds=Sum('total_seconds'),
+            days_worked=Count('id'),
+        ).order_by('month')
+        return {
+            row['month']: {
+                'hours': round((row['total_seconds'] or 0) / 3600, 2),
+                'days_worked': row['days_worked'],
+            }
+            for row in rows
+        }
+
+    def totals(self, group_by='employee', period='day'):
+        """
+        Години по співробітниках або відділах за дні, тижні чи місяці (один згрупований запит)
+
+        Args:
+            group_by: 'employee' або 'department'
+            period: 'day', 'week' (понеділок тижня) або 'month' (перший день місяця)
+
+        Returns:
+            список словників {group_by: ..., 'period': дата, 'hours', 'days_worked', 'sessions'}
+        """
+        groups = {'employee': F('employee_id'), 'department': F('employee__department')}
+        periods = {'day': F('date'), 'week': TruncWeek('date'), 'month': TruncMonth('date')}
+        rows = self.annotate(group=groups[group_by], period=periods[period]).values('group', 'period').annotate(
+            total_seconds=Sum('total_seconds'),
+            days_worked=Count('id'),
+            sessions=Sum('session_count'),
+        ).order_by('group', 'period')
+        return [
+            {
+                group_by: row['group'],
+                'period': row['period'],
+                'hours': round((row['total_seconds'] or 0) / 3600, 2),
+                'days_worked': row['days_worked'],
+                'sessions': row['sessions'],
+            }
+            for row in rows
+        ]
+
+
+class DailyTimesheet(models.Model):
+    """Денний підсумок робочого часу співробітника"""
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        verbose_name="Співробітник"
+    )
+    date = models.DateField(verbose_name="Дата")
+    total_seconds = models.PositiveIntegerField(default=0, verbose_name="Відпрацьовано (сек)")
+    session_count = models.PositiveIntegerField(default=0, verbose_name="Кількість сесій")
+    has_open_session = models.BooleanField(default=False, verbose_name="Є незакрита сесія")
+
+    objects = DailyTimesheetQuerySet.as_manager()
+
+    @property
+    def hours(self):
+        return round(self.total_seconds / 3600, 2)
+
+    @staticmethod
+    def _aggregates():
+        """Агрегати записів часу, з яких складається денний підсумок"""
+        return {
+            'duration': Sum(session_duration()),
+            'sessions': Count('id'),
+            'open_sessions': Count('id', filter=Q(clock_out_time__isnull=True)),
+        }
+
+    @classmethod
+    def _fields(cls, row):
+        duration = row['duration']
+        return {
+            'total_seconds': int(duration.total_seconds()) if duration else 0,
+            'session_count': row['sessions'],
+            'has_open_session': row['open_sessions'] > 0,
+        }
+
+    @staticmethod
+    def _add_archived(rows, days):
+        """Додати до агрегатів записів {(співробітник, дата): row} архівовані записи тих самих днів"""
+        for day, (seconds, sessions) in TimeRecordArchive.objects.day_totals(days).items():
+            row = rows.setdefault(day, {'duration': None, 'sessions': 0, 'open_sessions': 0})
+            row['duration'] = (row['duration'] or timedelta(0)) + timedelta(seconds=seconds)
+            row['sessions'] += sessions
+        return rows
+
+    @classmethod
+    def refresh(cls, employee_id, date):
+        """Перерахувати підсумок за один день співробітника"""
+        with transaction.atomic():
+            row = TimeRecord.objects.filter(employee_id=employee_id, date=date).aggregate(**cls._aggregates())
+            day = (employee_id, date)
+            row = cls._add_archived({day: row} if row['sessions'] else {}, {day}).get(day)
+
+            if row is None:
+                cls.objects.filter(employee_id=employee_id, date=date).delete()
+                return None
+
+            timesheet, _ = cls.objects.update_or_create(
+                employee_id=employee_id,
+                date=date,
+                defaults=cls._fields(row)
+            )
+            return timesheet
+
+    @classmethod
+    def refresh_many(cls, days, batch_size=1000):
+        """Перерахувати підсумки для множини (співробітник, дата) кількома запитами"""
+        days = set(days)
+        if not days:
+            return
+        employee_ids = {employee_id for employee_id, _ in days}
+        dates = {date for _, date in days}
+
+        with transaction.atomic():
+            rows = cls._add_archived({
+                (row['employee'], row['date']): row
+                for row in TimeRecord.objects.filter(employee_id__in=employee_ids, date__in=dates).values(
+                    'employee', 'date'
+                ).annotate(**cls._aggregates()).order_by()
+            }, days)
+            existing = cls.objects.filter(employee_id__in=employee_ids, date__in=dates).values_list(
+                'id', 'employee_id', 'date'
+            )
+            cls.objects.filter(id__in=[pk for pk, *day in existing if tuple(day) in days]).delete()
+            cls.objects.bulk_create([
+                cls(employee_id=employee_id, date=date, **cls._fields(row))
+                for (employee_id, date), row in rows.items() if (employee_id, date) in days
+            ], batch_size=batch_size)
+
+    @classmethod
+    def rebuild(cls, date_from=None, date_to=None, batch_size=1000):
+        """Перебудувати підсумки з записів часу (для заповнення та виправлення)"""
+        records = TimeRecord.objects.all()
+        timesheets = cls.objects.all()
+        if date_from:
+            records = records.filter(date__gte=date_from)
+            timesheets = timesheets.filter(date__gte=date_from)
+        if date_to:
+            records = records.filter(date__lte=date_to)
+            timesheets = timesheets.filter(date__lte=date_to)
+
+        rows = records.values('employee', 'date').annotate(**cls._aggregates()).order_by()
+        created = 0
+        with transaction.atomic():
+            timesheets.delete()
+
+            def create(batch):
+                # Дні, де є і записи в таблиці, і архівовані (пізній імпорт), - разом
+                merged = cls._add_archived({(row['employee'], row['date']): row for row in batch}, {
+                    (row['employee'], row['date']) for row in batch
+                })
+                cls.objects.bulk_create([
+                    cls(employee_id=employee_id, date=day, **cls._fields(row))
+                    for (employee_id, day), row in merged.items()
+                ])
+                return len(merged)
+
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    created += create(batch)
+                    batch = []
+            created += create(batch)
+
+            # Дні, записи яких повністю в архіві
+            segments = TimeRecordArchive.objects.all()
+            if date_from:
+                segments = segments.filter(month__gte=date_from.replace(day=1))
+            if date_to:
+                segments = segments.filter(month__lte=date_to)
+            existing = set(timesheets.filter(
+                date__lt=TimeRecordArchive.cutoff()
+            ).values_list('employee_id', 'date'))
+            batch = []
+            for employee_id, segment_days in segments.values_list('employee_id', 'days').iterator(chunk_size=batch_size):
+                for day, (seconds, sessions) in segment_days.items():
+                    day = date.fromisoformat(day)
+                    if (employee_id, day) in existing or (date_from and day < date_from) or (date_to and day > date_to):
+                        continue
+                    batch.append(cls(employee_id=employee_id, date=day, total_seconds=int(seconds), session_count=sessions))
+                if len(batch) >= batch_size:
+                    cls.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            cls.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    def __str__(self):
+        return f"{self.employee} - {self.date}: {self.hours} год"
+
+    class Meta:
+        verbose_name = "Денний підсумок часу"
+        verbose_name_plural = "Денні підсумки часу"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'date'], name='unique_timesheet_employee_date'),
+        ]
+
+
+class Presence(models.Model):
+    """
+    Хто зараз на роботі: відкрита сесія співробітника
+
+    Рядок є, доки у співробітника є незакритий запис часу (незалежно від
+    дати - нічні зміни). Підтримується сигналами записів часу через refresh_many().
+    """
+    employee = models.OneToOneField(
+        Employee,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='presence',
+        verbose_name="Співробітник"
+    )
+    record = models.OneToOneField(
+        TimeRecord,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Відкритий запис"
+    )
+    since = models.DateTimeField(verbose_name="На роботі з")
+
+    @classmethod
+    def refresh_many(cls, employee_ids):
+        """
+        Перерахувати присутність співробітників з їх незакритих записів
+
+        Змінюються лише рядки, що відрізняються; тоді ж збільшується версія
+        для кешу в процесі (timetracking.presence).
+        """
+        employee_ids = set(employee_ids)
+        if not employee_ids:
+            return
+
+        with transaction.atomic():
+            latest = {}
+            open_records = TimeRecord.objects.filter(
+                employee_id__in=employee_ids, clock_out_time__isnull=True
+            ).order_by('-clock_in_time', '-id').values_list('employee_id', 'id', 'clock_in_time')
+            for employee_id, record_id, since in open_records:
+                latest.setdefault(employee_id, (record_id, since))
+            current = {
+                employee_id: (record_id, since)
+                for employee_id, record_id, since in cls.objects.filter(
+                    employee_id__in=employee_ids
+                ).values_list('employee_id', 'record_id', 'since')
+            }
+
+            changed = {employee_id for employee_id in employee_ids if latest.get(employee_id) != current.get(employee_id)}
+            if not changed:
+                return
+            cls.objects.filter(employee_id__in=changed).delete()
+            cls.objects.bulk_create([
+                cls(employee_id=employee_id, record_id=latest[employee_id][0], since=latest[employee_id][1])
+                for employee_id in changed if employee_id in latest
+            ])
+            bump_version(cls._meta.label)
+
+    def __str__(self):
+        return f"{self.employee} - з {self.since}"
+
+    class Meta:
+        verbose_name = "Присутність"
+        verbose_name_plural = "Присутність"
+
+
+class ClockJournalCheckpoint(models.Model):
+    """Позиція файлу журналу приходів, до якої події вже записані в БД (timetracking.ingest)"""
+    segment = models.CharField(max_length=255, primary_key=True, verbose_name="Файл журналу")
+    offset = models.BigIntegerField(default=0, verbose_name="Позиція")
+
+    def __str__(self):
+        return f"{self.segment}: {self.offset}"
+
+    class Meta:
+        verbose_name = "Позиція журналу приходів"
+        verbose_name_plural = "Позиції журналу приходів"
 
 
 class TimeTrackingSystem:
@@ -56,47 +540,158 @@ class TimeTrackingSystem:
 
     @staticmethod
     def clock_in(employee):
-        """Зареєструвати вхід"""
+        """
+        Зареєструвати вхід (None, якщо співробітник уже на роботі)
+
+        Перевірку робить сам INSERT: друга незакрита сесія порушує
+        timerecord_one_open_session, тож одночасні подвійні приходи
+        не створюють дублікатів.
+
+        З CLOCK_JOURNAL_DIR повертає ще не збережений запис (див. timetracking.ingest).
+        """
+        journal = get_journal()
+        if journal is not None:
+            # Буферизований режим: подія в журналі, запис у БД зробить фоновий потік
+            stored_open = TimeRecord.objects.filter(employee=employee, clock_out_time__isnull=True).exists()
+            event = journal.record('in', employee.pk, stored_open)
+            return TimeRecord(employee=employee, clock_in_time=event.at, date=event.at.date()) if event else None
+
         now = timezone.now()  # Використовуємо timezone-aware datetime
-        record = TimeRecord.objects.create(
-            employee=employee,
-            clock_in_time=now,
-            date=now.date()
-        )
-        return record
+        try:
+            with transaction.atomic():
+                return TimeRecord.objects.create(
+                    employee=employee,
+                    clock_in_time=now,
+                    date=now.date()
+                )
+        except IntegrityError:
+            if not TimeRecord.objects.filter(employee=employee, clock_out_time__isnull=True).exists():
+                raise
+            return None
 
     @staticmethod
+    @transaction.atomic
     def clock_out(employee):
-        """Зареєструвати вихід"""
-        today = timezone.now().date()
-        try:
-            record = TimeRecord.objects.filter(
-                employee=employee,
-                date=today,
-                clock_out_time__isnull=True
-            ).latest('clock_in_time')
-
-            record.clock_out_time = timezone.now()  # Використовуємо timezone-aware datetime
-            record.save()
+        """
+        Зареєструвати вихід (сесія могла початися напередодні - нічна зміна)
+
+        Запис закривається умовним UPDATE (лише поки він відкритий), тому з
+        одночасних виходів спрацьовує один, решта отримують None. UPDATE оминає
+        сигнали, тож денний підсумок, присутність і версія звітів оновлюються тут.
+
+        З CLOCK_JOURNAL_DIR лише дописує подію в журнал (див. timetracking.ingest).
+        """
+        journal = get_journal()
+        if journal is not None:
+            record = TimeTrackingSystem.open_record(employee)
+            event = journal.record('out', employee.pk, record is not None and record.pk is not None)
+            if event is None or record is None:
+                return None
+            record.clock_out_time = event.at
             return record
-        except TimeRecord.DoesNotExist:
+
+        record = TimeRecord.objects.filter(employee=employee, clock_out_time__isnull=True).first()
+        if record is None:
             return None
 
+        now = timezone.now()  # Використовуємо timezone-aware datetime
+        closed = TimeRecord.objects.filter(pk=record.pk, clock_out_time__isnull=True).update(
+            clock_out_time=now, updated_at=now
+        )
+        if not closed:
+            return None
+
+        record.clock_out_time = record.updated_at = now
+        DailyTimesheet.refresh(record.employee_id, record.date)
+        Presence.refresh_many([record.employee_id])
+        bump_version(TimeRecord._meta.label)
+        return record
+
+    @staticmethod
+    def open_record(employee):
+        """Незакритий запис співробітника або None (пошук за первинним ключем присутності)"""
+        event = pending_event(employee.pk)
+        if event is not None:
+            # Ще не записаний у БД прихід (запис без pk) або вихід
+            return TimeRecord(employee=employee, clock_in_time=event.at, date=event.at.date()) if event.kind == 'in' else None
+
+        presence = Presence.objects.select_related('record').filter(employee=employee).first()
+        return presence.record if presence else None
+
+    @staticmethod
+    @transaction.atomic
+    def import_records(records, batch_size=1000):
+        """
+        Додати багато записів часу через bulk_create
+
+        bulk_create оминає сигнали, тому денні підсумки та присутність
+        перераховуються одним проходом, а версія звітів збільшується один раз.
+        """
+        records = TimeRecord.objects.bulk_create(records, batch_size=batch_size)
+        DailyTimesheet.refresh_many((record.employee_id, record.date) for record in records)
+        Presence.refresh_many({record.employee_id for record in records if record.clock_out_time is None})
+        bump_version(TimeRecord._meta.label)
+        return records
+
     @staticmethod
     def get_hours_worked(employee, date=None):
         """Отримати відпрацьовані години"""
         if date is None:
             date = timezone.now().date()
 
-        records = TimeRecord.objects.filter(
+        return TimeRecord.objects.filter(
             employee=employee,
             date=date
-        )
+        ).total_hours()
+
+    @staticmethod
+    def top_workers(date_from, limit=10):
+        """
+        Співробітники з найбільшою кількістю годин (один згрупований запит)
 
-        total_hours = sum([record.calculate_hours() for record in records])
-        return round(total_hours, 2)
+        Returns:
+            Список словників {'employee': Employee, 'hours': float}
+        """
+        employees = Employee.objects.annotate(
+            worked=Sum(
+                session_duration('timerecord__'),
+                filter=Q(timerecord__date__gte=date_from)
+            )
+        ).filter(worked__gt=timedelta(0)).order_by('-worked', 'id')[:limit]
+
+        return [
+            {'employee': emp, 'hours': duration_to_hours(emp.worked)}
+            for emp in employees
+        ]
 
     @staticmethod
-    def get_work_history(employee):
-        """Отримати історію роботи"""
-        return TimeRecord.objects.filter(employee=employee)
\ No newline at end of file
+    def get_work_history(employee, date_from=None, date_to=None):
+        """
+        Отримати історію роботи: записи з таблиці й з архіву (TimeRecordArchive)
+
+        Args:
+            employee: Employee
+            date_from, date_to: межі періоду включно (необов'язкові)
+
+        Returns:
+            list[TimeRecord] від новіших до старіших - список, а не QuerySet: архівні
+            записи не збережені в таблиці, тому далі фільтрувати його запитом не можна
+        """
+        records = TimeRecord.objects.filter(employee=employee)
+        segments = TimeRecordArchive.objects.filter(employee=employee)
+        if date_from:
+            records = records.filter(date__gte=date_from)
+            segments = segments.filter(month__gte=date_from.replace(day=1))
+        if date_to:
+            records = records.filter(date__lte=date_to)
+            segments = segments.filter(month__lte=date_to)
+
+        archived = [
+            record for segment in segments for record in segment.records()
+            if (not date_from or record.date >= date_from) and (not date_to or record.date <= date_to)
+        ]
+        history = sorted([*records, *archived], key=lambda record: (record.date, record.clock_in_time), reverse=True)
+        # record.employee без запиту на кожен запис
+        for record in history:
+            record.employee = employee
+        return history
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Хто зараз на роботі
+
+Знімок таблиці Presence зберігається в пам'яті процесу і перечитується
+лише тоді, коли змінилася версія присутності (clock_in / clock_out) або
+співробітників (відділ) - див. employees.report_cache, - або знімок старший
+за PRESENCE_SNAPSHOT_TIMEOUT: версії живуть у кеші процесу, тож зміни з інших
+процесів видно із цією затримкою. Перевірка "чи на роботі" і кількість по
+відділах - без запитів до БД; це підказка для відображення, рішення про
+прихід приймає TimeTrackingSystem.clock_in.
+
+Усередині транзакції знімок може не містити її змін, тому
+тоді читається таблиця. shift_of() враховує й ще не записані події
+буферизованого режиму (timetracking.ingest).
+"""
+import time
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.db import connection
+
+from employees.report_cache import get_versions
+from .ingest import pending_event
+from .models import Presence
+
+PRESENCE_MODELS = ['timetracking.Presence', 'employees.Employee']
+
+Shift = namedtuple('Shift', ['record_id', 'since', 'department'])
+
+# (версії, час читання, {employee_id: Shift}, {відділ: кількість}); замінюється цілком
+_snapshot = (None, 0, {}, {})
+
+
+def _shifts(queryset):
+    return {
+        employee_id: Shift(record_id, since, department)
+        for employee_id, record_id, since, department in queryset.values_list(
+            'employee_id', 'record_id', 'since', 'employee__department'
+        )
+    }
+
+
+def _by_department(shifts):
+    return dict(Counter(shift.department for shift in shifts.values()))
+
+
+def _current():
+    global _snapshot
+    if connection.in_atomic_block:
+        shifts = _shifts(Presence.objects.all())
+        return shifts, _by_department(shifts)
+
+    versions = get_versions(PRESENCE_MODELS)
+    now = time.monotonic()
+    if _snapshot[0] != versions or now - _snapshot[1] > settings.PRESENCE_SNAPSHOT_TIMEOUT:
+        # Версії прочитано до таблиці: зміна між ними лише спричинить ще одне перечитування
+        shifts = _shifts(Presence.objects.all())
+        _snapshot = (versions, now, shifts, _by_department(shifts))
+    return _snapshot[2], _snapshot[3]
+
+
+def on_shift():
+    """Співробітники на роботі {employee_id: Shift}"""
+    return _current()[0]
+
+
+def shift_of(employee_id):
+    """Відкрита сесія співробітника (Shift) або None"""
+    event = pending_event(employee_id)
+    if event is not None:
+        return Shift(None, event.at, None) if event.kind == 'in' else None
+    if connection.in_atomic_block:
+        return _shifts(Presence.objects.filter(employee_id=employee_id)).get(employee_id)
+    return _current()[0].get(employee_id)
+
+
+def is_clocked_in(employee_id):
+    """Чи співробітник зараз на роботі"""
+    return shift_of(employee_id) is not None
+
+
+def on_shift_by_department():
+    """Кількість співробітників на роботі по відділах {відділ: кількість}"""
+    return _current()[1]
@@ -0,0 +1,246 @@
+"""
+Імпорт журналів турнікетів (CSV: номер перепустки, час, напрямок)
+
+Файл читається потоково. Події сортуються за часом зовнішнім сортуванням:
+відсортовані шматки по sort_buffer подій скидаються у тимчасові файли і
+зливаються heapq.merge, тож у пам'яті - лише буфер і стан по співробітниках.
+Далі один прохід у порядку часу: прихід відкриває сесію співробітника,
+вихід її закриває, готові записи пишуться пакетами по batch_size (кожен -
+своя транзакція). Записи часу й нові денні підсумки вставляються
+executemany напряму через курсор: підготовка моделей ORM коштувала більше,
+ніж саме сортування, а сигналів, як і в bulk_create, тут однаково немає.
+
+- Повторні відмітки тим самим напрямком у межах debounce - дублікати.
+- Вихід без приходу та прихід без виходу (наступний прихід) - непарні.
+- Вихід закриває і сесію, відкриту в БД до імпорту (нічна зміна з учорашнього файлу).
+- Сесії, які вже є в БД (той самий співробітник і час приходу), пропускаються,
+  тож повторний імпорт файлу нічого не дублює.
+- Незакриті в кінці файлу сесії записуються відкритими, якщо в співробітника
+  немає іншого відкритого запису (timerecord_one_open_session).
+"""
+import csv
+import heapq
+import pickle
+import tempfile
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from employees.models import Employee
+from employees.report_cache import bump_version
+from .models import DailyTimesheet, Presence, TimeRecord
+
+Punch = namedtuple('Punch', ['at', 'badge', 'is_in'])
+
+DIRECTIONS = {'in': True, 'entry': True, '1': True, 'out': False, 'exit': False, '0': False}
+
+# Подій в одному pickle-блоці тимчасового файлу
+_RUN_BLOCK = 10_000
+
+
+def parse_punches(lines, stats, tz=None):
+    """Події з рядків CSV; рядок заголовка і некоректні рядки пропускаються (stats['invalid'])"""
+    tz = tz or timezone.get_current_timezone()
+    for line_number, row in enumerate(csv.reader(lines), 1):
+        try:
+            badge, at, direction = row[0].strip(), datetime.fromisoformat(row[1].strip()), row[2].strip().lower()
+            is_in = DIRECTIONS[direction]
+        except (IndexError, KeyError, ValueError):
+            if line_number > 1:
+                stats['invalid'] += 1
+            continue
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=tz)
+        yield Punch(at, badge, is_in)
+
+
+def _read_run(run):
+    while True:
+        try:
+            yield from pickle.load(run)
+        except EOFError:
+            return
+
+
+def sort_punches(punches, sort_buffer):
+    """Події за часом; якщо їх більше за sort_buffer - через тимчасові файли"""
+    runs = []
+    try:
+        while True:
+            chunk = sorted(islice(punches, sort_buffer))
+            if not runs and len(chunk) < sort_buffer:
+                yield from chunk
+                return
+            if chunk:
+                run = tempfile.TemporaryFile()
+                for start in range(0, len(chunk), _RUN_BLOCK):
+                    pickle.dump(chunk[start:start + _RUN_BLOCK], run, pickle.HIGHEST_PROTOCOL)
+                run.seek(0)
+                runs.append(run)
+            if len(chunk) < sort_buffer:
+                break
+        yield from heapq.merge(*map(_read_run, runs))
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _insert_sql(model, fields):
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(name).column) for name in fields)
+    return f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({", ".join(["%s"] * len(fields))})'
+
+
+def _write(records, stats):
+    """
+    Записати пакет сесій [(employee_id, прихід, вихід або None, дата)]
+
+    Сесії, що вже є в БД, пропускаються. Денні підсумки нових днів
+    вставляються разом із записами, наявні - перераховуються (refresh_many).
+
+    Returns:
+        кількість нових записів
+    """
+    employee_ids = {record[0] for record in records}
+    first, last = min(record[3] for record in records), max(record[3] for record in records)
+    with transaction.atomic():
+        # Пакет - вузьке вікно часу для майже всіх співробітників: індекс за датою, а не IN по співробітниках
+        # (дата запису могла бути порахована в іншому часовому поясі - вікно ширше на день)
+        existing = set(TimeRecord.objects.filter(
+            date__range=(first - timedelta(days=1), last + timedelta(days=1)),
+            clock_in_time__range=(min(record[1] for record in records), max(record[1] for record in records)),
+        ).order_by().values_list('employee_id', 'clock_in_time'))
+        new = [record for record in records if record[:2] not in existing]
+        stats['existing'] += len(records) - len(new)
+        if not new:
+            return 0
+
+        # {(співробітник, дата): [тривалість, сесій, чи є незакрита]}
+        days = {}
+        for employee_id, clock_in, clock_out, day in new:
+            total = days.setdefault((employee_id, day), [timedelta(0), 0, False])
+            if clock_out is None:
+                total[2] = True
+            else:
+                total[0] += clock_out - clock_in
+            total[1] += 1
+        stored = set(DailyTimesheet.objects.filter(
+            employee_id__in=employee_ids, date__range=(first, last),
+        ).order_by().values_list('employee_id', 'date'))
+
+        adapt_datetime, adapt_date = connection.ops.adapt_datetimefield_value, connection.ops.adapt_datefield_value
+        now = adapt_datetime(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                _insert_sql(TimeRecord, ['employee', 'clock_in_time', 'clock_out_time', 'date', 'updated_at']),
+                [(employee_id, adapt_datetime(clock_in), adapt_datetime(clock_out), adapt_date(day), now)
+                 for employee_id, clock_in, clock_out, day in new],
+            )
+            cursor.executemany(
+                _insert_sql(DailyTimesheet, ['employee', 'date', 'total_seconds', 'session_count', 'has_open_session']),
+                [(employee_id, adapt_date(day), int(duration.total_seconds()), sessions, has_open)
+                 for (employee_id, day), (duration, sessions, has_open) in days.items()
+                 if (employee_id, day) not in stored],
+            )
+        DailyTimesheet.refresh_many(day for day in days if day in stored)
+        Presence.refresh_many({record[0] for record in new if record[2] is None})
+        bump_version(TimeRecord._meta.label)
+    return len(new)
+
+
+def _close(closing, stats, batch_size):
+    """Закрити записи, відкриті в БД до імпорту: [(id запису, час виходу)]"""
+    now = timezone.now()
+    for start in range(0, len(closing), batch_size):
+        chunk = dict(closing[start:start + batch_size])
+        with transaction.atomic():
+            records = list(TimeRecord.objects.filter(pk__in=chunk, clock_out_time__isnull=True))
+            for record in records:
+                record.clock_out_time, record.updated_at = chunk[record.pk], now
+            TimeRecord.objects.bulk_update(records, ['clock_out_time', 'updated_at'])
+            DailyTimesheet.refresh_many((record.employee_id, record.date) for record in records)
+            Presence.refresh_many(record.employee_id for record in records)
+            if records:
+                bump_version(TimeRecord._meta.label)
+        stats['closed'] += len(records)
+
+
+def import_punches(lines, batch_size=5000, sort_buffer=200_000, debounce=timedelta(minutes=1)):
+    """
+    Імпортувати журнал турнікетів
+
+    Args:
+        lines: рядки CSV (відкритий файл)
+        batch_size: записів в одній транзакції
+        sort_buffer: подій, що сортуються в пам'яті
+        debounce: повторна відмітка ближче за цей інтервал - дублікат
+
+    Returns:
+        Counter: punches, created, closed, open, existing, duplicates,
+        unmatched_in, unmatched_out, unknown_badge, invalid
+    """
+    stats = Counter()
+    tz = timezone.get_current_timezone()
+    badges = dict(Employee.objects.exclude(badge_id=None).values_list('badge_id', 'id'))
+    # Відкриті сесії {employee_id: (час приходу, id запису в БД або None)}
+    sessions = {
+        employee_id: (clock_in, record_id)
+        for record_id, employee_id, clock_in in TimeRecord.objects.filter(
+            clock_out_time__isnull=True
+        ).values_list('id', 'employee_id', 'clock_in_time')
+    }
+    stored_open = set(sessions)  # співробітники, чий запис у БД лишиться відкритим
+    last_out = {}
+    batch, closing = [], []
+
+    for punch in sort_punches(parse_punches(lines, stats, tz), sort_buffer):
+        stats['punches'] += 1
+        employee_id = badges.get(punch.badge)
+        if employee_id is None:
+            stats['unknown_badge'] += 1
+            continue
+
+        session = sessions.get(employee_id)
+        if punch.is_in:
+            if session is not None:
+                if abs(punch.at - session[0]) <= debounce:
+                    stats['duplicates'] += 1
+                    continue
+                stats['unmatched_in'] += 1
+            sessions[employee_id] = (punch.at, None)
+            continue
+
+        if session is None or punch.at < session[0]:  # другий випадок - запис у БД новіший за файл
+            recent = last_out.get(employee_id)
+            stats['duplicates' if recent and punch.at - recent <= debounce else 'unmatched_out'] += 1
+            continue
+        del sessions[employee_id]
+        last_out[employee_id] = punch.at
+        clock_in, record_id = session
+        if record_id is not None:
+            closing.append((record_id, punch.at))
+            stored_open.discard(employee_id)
+            continue
+        batch.append((employee_id, clock_in, punch.at, clock_in.astimezone(tz).date()))
+        if len(batch) >= batch_size:
+            stats['created'] += _write(batch, stats)
+            batch = []
+
+    if batch:
+        stats['created'] += _write(batch, stats)
+    _close(closing, stats, batch_size)
+
+    still_open = []
+    for employee_id, (clock_in, record_id) in sessions.items():
+        if record_id is not None:
+            continue
+        if employee_id in stored_open:
+            stats['unmatched_in'] += 1
+            continue
+        still_open.append((employee_id, clock_in, None, clock_in.astimezone(tz).date()))
+    for start in range(0, len(still_open), batch_size):
+        stats['open'] += _write(still_open[start:start + batch_size], stats)
+    return stats
@@ -1,13 +1,86 @@
+from django.utils import timezone
 from rest_framework import serializers
-from .models import TimeRecord
 
+from hrm_project.serializers import BulkItemSerializer, SparseFieldsMixin
+from employees.models import Employee
+from employees.serializers import EmployeeSerializer
+from .models import TimeRecord, duration_to_hours
 
-class TimeRecordSerializer(serializers.ModelSerializer):
+
+class TimeRecordSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     hours_worked = serializers.SerializerMethodField()
+    expandable_fields = {'employee': EmployeeSerializer}
 
     class Meta:
         model = TimeRecord
         fields = '__all__'
+        method_sources = {'hours_worked': ['clock_in_time', 'clock_out_time']}
 
     def get_hours_worked(self, obj):
-        return obj.calculate_hours()
\ No newline at end of file
+        # Тривалість, порахована в БД (TimeRecordQuerySet.with_duration у viewset)
+        if hasattr(obj, 'duration'):
+            return duration_to_hours(obj.duration)
+        return obj.calculate_hours()
+
+
+class TimeRecordBulkSerializer(BulkItemSerializer):
+    """Запис часу для POST /api/time-records/bulk/ (дата за замовчуванням - день приходу)"""
+    employee = serializers.IntegerField(min_value=1)
+    clock_in_time = serializers.DateTimeField()
+    clock_out_time = serializers.DateTimeField(required=False, allow_null=True)
+    date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('clock_out_time') and attrs['clock_out_time'] < attrs['clock_in_time']:
+            raise serializers.ValidationError({'clock_out_time': 'Час виходу раніше часу входу.'})
+        attrs.setdefault('date', timezone.localdate(attrs['clock_in_time']))
+        return attrs
+
+    def validate_batch(self, items):
+        known = set(Employee.objects.filter(
+            id__in={item['employee'] for item in items.values()}
+        ).values_list('id', flat=True))
+        errors = {
+            index: {'employee': [f'Співробітника {item["employee"]} не існує.']}
+            for index, item in items.items() if item['employee'] not in known
+        }
+
+        # Одна незакрита сесія на співробітника (timerecord_one_open_session)
+        opening = {index: item['employee'] for index, item in items.items()
+                   if not item.get('clock_out_time') and index not in errors}
+        already_open = set(TimeRecord.objects.filter(
+            employee_id__in=set(opening.values()), clock_out_time__isnull=True
+        ).values_list('employee_id', flat=True))
+        seen = set()
+        for index, employee_id in opening.items():
+            if employee_id in already_open or employee_id in seen:
+                errors[index] = {'clock_out_time': ['Співробітник уже має незакритий запис часу.']}
+            seen.add(employee_id)
+        return errors
+
+
+class TimeRecordSummaryParams(serializers.Serializer):
+    """Параметри GET /api/time-records/summary/"""
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    group_by = serializers.ChoiceField(choices=['employee', 'department'], default='employee')
+    period = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    employee = serializers.IntegerField(required=False, min_value=1)
+    department = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': 'Кінцева дата раніше початкової.'})
+        return attrs
+
+
+class TimeRecordHistoryParams(serializers.Serializer):
+    """Параметри GET /api/time-records/history/"""
+    employee = serializers.IntegerField(min_value=1)
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': 'Кінцева дата раніше початкової.'})
+        return attrs
@@ -0,0 +1,29 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import TimeRecord, DailyTimesheet, Presence
+
+
+@receiver(pre_save, sender=TimeRecord)
+def remember_old_day(sender, instance, **kwargs):
+    """Запам'ятати попередній день запису (адмін може змінити співробітника)"""
+    instance._old_day = None
+    if instance.pk:
+        instance._old_day = TimeRecord.objects.filter(
+            pk=instance.pk
+        ).values_list('employee_id', 'date').first()
+
+
+@receiver(post_save, sender=TimeRecord)
+def time_record_saved(sender, instance, **kwargs):
+    days = {(instance.employee_id, instance.date), getattr(instance, '_old_day', None)}
+    for day in days - {None}:
+        DailyTimesheet.refresh(*day)
+    # Разом, бо запис міг перейти до іншого співробітника (record унікальний)
+    Presence.refresh_many(employee_id for employee_id, _ in days - {None})
+
+
+@receiver(post_delete, sender=TimeRecord)
+def time_record_deleted(sender, instance, **kwargs):
+    DailyTimesheet.refresh(instance.employee_id, instance.date)
+    Presence.refresh_many([instance.employee_id])
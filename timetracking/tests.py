@@ -1,3 +1,777 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from employees.testing import make_employee
+from .models import TimeRecord, TimeTrackingSystem, DailyTimesheet, Presence, duration_to_hours
+
+
+def make_record(employee, day, start_hour, minutes):
+    clock_in = timezone.make_aware(datetime(day.year, day.month, day.day, start_hour))
+    clock_out = clock_in + timedelta(minutes=minutes) if minutes is not None else None
+    return TimeRecord.objects.create(
+        employee=employee,
+        clock_in_time=clock_in,
+        clock_out_time=clock_out,
+        date=day,
+    )
+
+
+class WorkedHoursQueryTest(TestCase):
+    """Години рахуються в БД так само, як calculate_hours()"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.now().date()
+        cls.employees = [make_employee(f'user{i}@company.com') for i in range(12)]
+        for i, emp in enumerate(cls.employees):
+            for days_ago in range(3):
+                day = cls.today - timedelta(days=days_ago)
+                make_record(emp, day, 9, 60 * 4 + i * 7)
+                make_record(emp, day, 14, 60 * 3 + days_ago * 11)
+        # Незакрита сесія не враховується
+        make_record(cls.employees[0], cls.today, 20, None)
+
+    def python_hours(self, records):
+        return round(sum(r.calculate_hours() for r in records), 2)
+
+    def test_total_hours_matches_python(self):
+        records = TimeRecord.objects.filter(date__gte=self.today - timedelta(days=1))
+        self.assertAlmostEqual(records.total_hours(), self.python_hours(records), places=1)
+
+    def test_with_duration(self):
+        for record in TimeRecord.objects.with_duration():
+            self.assertEqual(duration_to_hours(record.duration), record.calculate_hours())
+
+    def test_hours_by_employee_and_day(self):
+        by_employee = {row['employee']: duration_to_hours(row['duration'])
+                       for row in TimeRecord.objects.hours_by_employee()}
+        for emp in self.employees:
+            records = TimeRecord.objects.filter(employee=emp)
+            self.assertAlmostEqual(by_employee[emp.id], self.python_hours(records), places=1)
+
+        by_day = TimeRecord.objects.filter(employee=self.employees[3]).hours_by_day()
+        self.assertEqual(len(by_day), 3)
+
+    def test_get_hours_worked(self):
+        emp = self.employees[5]
+        records = TimeRecord.objects.filter(employee=emp, date=self.today)
+        self.assertAlmostEqual(TimeTrackingSystem.get_hours_worked(emp), self.python_hours(records), places=1)
+
+    def test_top_workers_single_query(self):
+        with self.assertNumQueries(1):
+            top = TimeTrackingSystem.top_workers(self.today - timedelta(days=7), limit=10)
+
+        self.assertEqual(len(top), 10)
+        self.assertEqual(top[0]['employee'], self.employees[-1])
+        hours = [item['hours'] for item in top]
+        self.assertEqual(hours, sorted(hours, reverse=True))
+
+
+class DailyTimesheetTest(TestCase):
+    """Денні підсумки оновлюються разом із записами часу"""
+
+    def setUp(self):
+        self.employee = make_employee('worker@company.com')
+        self.day = date(2025, 3, 10)
+
+    def test_clock_in_and_out(self):
+        system = TimeTrackingSystem()
+        record = system.clock_in(self.employee)
+        timesheet = DailyTimesheet.objects.get(employee=self.employee, date=record.date)
+        self.assertTrue(timesheet.has_open_session)
+        self.assertEqual(timesheet.session_count, 1)
+        self.assertEqual(timesheet.total_seconds, 0)
+
+        TimeRecord.objects.filter(pk=record.pk).update(clock_in_time=record.clock_in_time - timedelta(hours=2))
+        system.clock_out(self.employee)
+        timesheet.refresh_from_db()
+        self.assertFalse(timesheet.has_open_session)
+        self.assertAlmostEqual(timesheet.total_seconds, 7200, delta=5)
+
+    def test_edit_moves_and_delete_removes_rollup(self):
+        other = make_employee('other@company.com')
+        record = make_record(self.employee, self.day, 9, 90)
+        make_record(self.employee, self.day, 13, 30)
+        self.assertEqual(DailyTimesheet.objects.get(employee=self.employee).total_seconds, 120 * 60)
+
+        record.employee = other
+        record.save()
+        self.assertEqual(DailyTimesheet.objects.get(employee=self.employee).total_seconds, 30 * 60)
+        self.assertEqual(DailyTimesheet.objects.get(employee=other).total_seconds, 90 * 60)
+
+        record.delete()
+        self.assertFalse(DailyTimesheet.objects.filter(employee=other).exists())
+
+    def test_summary_and_by_month(self):
+        for offset in range(5):
+            make_record(self.employee, self.day + timedelta(days=offset), 9, 60 * 8)
+            make_record(self.employee, self.day + timedelta(days=30 + offset), 9, 60 * 4)
+
+        timesheets = DailyTimesheet.objects.filter(employee=self.employee)
+        with self.assertNumQueries(1):
+            months = timesheets.by_month()
+        self.assertEqual(months[date(2025, 3, 1)], {'hours': 40.0, 'days_worked': 5})
+        self.assertEqual(months[date(2025, 4, 1)], {'hours': 20.0, 'days_worked': 5})
+        self.assertEqual(timesheets.filter(date__lt=date(2025, 4, 1)).summary(), {'hours': 40.0, 'days_worked': 5})
+
+    def test_backfill_command(self):
+        make_record(self.employee, self.day, 9, 60)
+        make_record(self.employee, self.day + timedelta(days=1), 9, None)
+        DailyTimesheet.objects.all().delete()
+
+        call_command('backfill_timesheets', stdout=StringIO())
+        self.assertEqual(DailyTimesheet.objects.count(), 2)
+        self.assertEqual(DailyTimesheet.objects.get(date=self.day).total_seconds, 3600)
+        self.assertTrue(DailyTimesheet.objects.get(date=self.day + timedelta(days=1)).has_open_session)
+
+
+class TimeRecordPaginationTest(TestCase):
+    """API віддає записи сторінками за курсором, без COUNT(*) у запиті сторінки"""
+
+    @classmethod
+    def setUpTestData(cls):
+        employee = make_employee('worker@company.com')
+        day = date(2025, 3, 10)
+        cls.records = [make_record(employee, day + timedelta(days=i), 9, 60) for i in range(7)]
+
+    def test_walk_pages(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url, seen = '/api/time-records/?page_size=3', []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                data = self.client.get(url).json()
+            # Запит валідаторів (ETag) та запит сторінки - без COUNT(*)
+            self.assertEqual(len(queries), 2)
+            self.assertNotIn('COUNT', queries[1]['sql'])
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+
+        self.assertEqual(seen, sorted((r.id for r in self.records), reverse=True))
+
+    def test_page_size_limits(self):
+        from unittest import mock
+        from hrm_project.pagination import KeysetPagination
+
+        self.assertEqual(len(self.client.get('/api/time-records/').json()['results']), 7)
+        with mock.patch.object(KeysetPagination, 'page_size', 2):
+            data = self.client.get('/api/time-records/').json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertNotIn('count', data)
+
+        with mock.patch.object(KeysetPagination, 'max_page_size', 4):
+            data = self.client.get('/api/time-records/?page_size=100').json()
+        self.assertEqual(len(data['results']), 4)
+
+
+class TimeRecordFilterTest(TestCase):
+    """Фільтри /api/time-records/ виконуються в БД за індексами"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee('worker@company.com')
+        cls.other = make_employee('other@company.com')
+        cls.day = date(2025, 3, 10)
+        for offset in range(5):
+            make_record(cls.employee, cls.day + timedelta(days=offset), 9, 60)
+            make_record(cls.other, cls.day + timedelta(days=offset), 9, 60)
+        cls.open_record = make_record(cls.employee, cls.day + timedelta(days=5), 9, None)
+
+    def ids(self, query):
+        response = self.client.get(f'/api/time-records/?page_size=100&{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return {item['id'] for item in response.json()['results']}
+
+    def test_filters(self):
+        expected = set(TimeRecord.objects.filter(
+            employee=self.employee, date__gte=self.day + timedelta(days=1), date__lte=self.day + timedelta(days=3)
+        ).values_list('id', flat=True))
+        self.assertEqual(len(expected), 3)
+        self.assertEqual(self.ids(f'employee={self.employee.pk}&date__gte=2025-03-11&date__lte=2025-03-13'), expected)
+
+        self.assertEqual(self.ids('open=true'), {self.open_record.pk})
+        self.assertEqual(len(self.ids('open=false')), 10)
+        self.assertEqual(len(self.ids('')), 11)
+
+    def test_invalid_input(self):
+        for query in ['employee=abc', 'employee=0', 'date__gte=10.03.2025', 'open=maybe',
+                      'date__gte=2025-03-12&date__lte=2025-03-11']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/time-records/?{query}').status_code, 400)
+
+    def test_uses_indexes(self):
+        from .filters import TimeRecordFilter
+
+        def plan(params):
+            query_filter = TimeRecordFilter(data=params)
+            self.assertTrue(query_filter.is_valid())
+            return query_filter.filter_queryset(TimeRecord.objects.all()).explain()
+
+        self.assertIn('timerecord_emp_date_idx', plan({'employee': '1', 'date__gte': '2025-03-11'}))
+        self.assertIn('timerecord_open_idx', plan({'open': 'true', 'date__gte': '2025-03-11'}))
+
+
+class TimeRecordBulkTest(TestCase):
+    """POST /api/time-records/bulk/ перевіряє пакет цілком і створює записи через bulk_create"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = [make_employee(f'user{i}@company.com') for i in range(10)]
+
+    def post(self, items):
+        return self.client.post('/api/time-records/bulk/', items, content_type='application/json')
+
+    def test_creates_records_and_timesheets(self):
+        day = date(2025, 3, 10)
+        make_record(self.employees[0], day, 8, 30)
+        response = self.post([
+            {'employee': self.employees[0].pk, 'clock_in_time': '2025-03-10T10:00:00+02:00',
+             'clock_out_time': '2025-03-10T11:00:00+02:00'},
+            {'employee': self.employees[1].pk, 'clock_in_time': '2025-03-10T23:30:00+02:00',
+             'date': '2025-03-11'},
+        ])
+        self.assertEqual(response.status_code, 201, response.content)
+        ids = [item['id'] for item in response.json()['results']]
+        self.assertEqual(TimeRecord.objects.get(pk=ids[0]).date, day)
+        self.assertIsNone(TimeRecord.objects.get(pk=ids[1]).clock_out_time)
+
+        self.assertEqual(DailyTimesheet.objects.get(employee=self.employees[0], date=day).total_seconds, 5400)
+        timesheet = DailyTimesheet.objects.get(employee=self.employees[1])
+        self.assertEqual((timesheet.date, timesheet.has_open_session), (date(2025, 3, 11), True))
+
+    def test_invalid_batch_creates_nothing(self):
+        response = self.post([
+            {'employee': self.employees[0].pk, 'clock_in_time': '2025-03-10T10:00:00+02:00'},
+            {'employee': 999999, 'clock_in_time': '2025-03-10T10:00:00+02:00'},
+            {'employee': self.employees[0].pk, 'clock_in_time': '2025-03-10T10:00:00+02:00',
+             'clock_out_time': '2025-03-10T09:00:00+02:00'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(set(errors), {'1', '2'})
+        self.assertIn('employee', errors['1'])
+        self.assertIn('clock_out_time', errors['2'])
+        self.assertFalse(TimeRecord.objects.exists())
+
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post({'employee': 1}).status_code, 400)
+
+    def test_ten_thousand_items(self):
+        import time
+
+        start = timezone.make_aware(datetime(2025, 1, 1, 9))
+        items = [
+            {'employee': self.employees[i % 10].pk,
+             'clock_in_time': (start + timedelta(days=i // 10)).isoformat(),
+             'clock_out_time': (start + timedelta(days=i // 10, hours=8)).isoformat()}
+            for i in range(10_000)
+        ]
+        started = time.monotonic()
+        response = self.post(items)
+        self.assertEqual(response.status_code, 201)
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(TimeRecord.objects.count(), 10_000)
+        self.assertEqual(DailyTimesheet.objects.filter(total_seconds=8 * 3600).count(), 10_000)
+
+
+class TimeRecordHoursTest(TestCase):
+    """Години в API рахуються в БД; /summary/ - агрегатним запитом до денних підсумків"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee('worker@company.com', 'IT')
+        cls.other = make_employee('other@company.com', 'IT')
+        cls.sales = make_employee('sales@company.com', 'Sales')
+        # Пн 10.03 - Нд 16.03 і понеділок наступного тижня
+        for offset in range(8):
+            make_record(cls.employee, date(2025, 3, 10) + timedelta(days=offset), 9, 90)
+        make_record(cls.employee, date(2025, 3, 10), 14, 30)
+        make_record(cls.other, date(2025, 3, 11), 9, 60)
+        make_record(cls.sales, date(2025, 4, 1), 9, 120)
+        make_record(cls.sales, date(2025, 4, 2), 9, None)
+
+    def test_hours_from_annotation(self):
+        from unittest import mock
+
+        with mock.patch.object(TimeRecord, 'calculate_hours', side_effect=AssertionError):
+            results = self.client.get('/api/time-records/?page_size=100').json()['results']
+            detail = self.client.get(f'/api/time-records/{results[0]["id"]}/').json()
+        self.assertEqual(
+            {item['id']: item['hours_worked'] for item in results},
+            {record.pk: record.calculate_hours() for record in TimeRecord.objects.all()},
+        )
+        self.assertEqual(detail['hours_worked'], results[0]['hours_worked'])
+
+    def summary(self, query):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/time-records/summary/?date_from=2025-03-01&date_to=2025-04-30&{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(queries), 1)
+        return response.json()['results']
+
+    def test_summary(self):
+        results = self.summary(f'employee={self.employee.pk}')
+        self.assertEqual(len(results), 8)
+        self.assertEqual(results[0], {'employee': self.employee.pk, 'period': '2025-03-10',
+                                      'hours': 2.0, 'days_worked': 1, 'sessions': 2})
+
+        results = self.summary('period=week')
+        self.assertEqual([(row['employee'], row['period'], row['hours'], row['days_worked']) for row in results], [
+            (self.employee.pk, '2025-03-10', 11.0, 7),
+            (self.employee.pk, '2025-03-17', 1.5, 1),
+            (self.other.pk, '2025-03-10', 1.0, 1),
+            (self.sales.pk, '2025-03-31', 2.0, 2),
+        ])
+
+        results = self.summary('group_by=department&period=month')
+        self.assertEqual([(row['department'], row['period'], row['hours'], row['sessions']) for row in results], [
+            ('IT', '2025-03-01', 13.5, 10),
+            ('Sales', '2025-04-01', 2.0, 2),
+        ])
+        self.assertEqual(len(self.summary('department=Sales')), 2)
+
+    def test_summary_invalid(self):
+        for query in ['', 'date_from=2025-03-01', 'date_from=2025-03-02&date_to=2025-03-01',
+                      'date_from=2025-03-01&date_to=2025-03-31&period=year',
+                      'date_from=2025-03-01&date_to=2025-03-31&group_by=position']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/time-records/summary/?{query}').status_code, 400)
+
+
+class PresenceTest(TestCase):
+    """Присутність відповідає незакритим записам, зокрема нічним змінам"""
+
+    def setUp(self):
+        self.employee = make_employee('worker@company.com')
+        self.system = TimeTrackingSystem()
+
+    def presence(self):
+        return dict(Presence.objects.values_list('employee_id', 'record_id'))
+
+    def test_clock_in_and_out(self):
+        record = self.system.clock_in(self.employee)
+        self.assertEqual(self.presence(), {self.employee.pk: record.pk})
+        self.assertIsNone(self.system.clock_in(self.employee))
+        self.assertEqual(TimeRecord.objects.count(), 1)
+
+        self.assertEqual(self.system.clock_out(self.employee), record)
+        self.assertEqual(self.presence(), {})
+        self.assertIsNone(self.system.clock_out(self.employee))
+
+    def test_overnight_session(self):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        record = make_record(self.employee, yesterday, 22, None)
+        self.assertEqual(TimeTrackingSystem.open_record(self.employee), record)
+
+        closed = self.system.clock_out(self.employee)
+        self.assertEqual(closed, record)
+        self.assertGreater(closed.calculate_hours(), 0)
+        self.assertEqual(self.presence(), {})
+
+    def test_edits_and_import(self):
+        other = make_employee('other@company.com')
+        record = make_record(self.employee, date(2025, 3, 10), 9, None)
+        record.employee = other
+        record.save()
+        self.assertEqual(self.presence(), {other.pk: record.pk})
+
+        record.delete()
+        self.assertEqual(self.presence(), {})
+        record = make_record(other, date(2025, 3, 11), 9, None)
+        self.assertEqual(self.presence(), {other.pk: record.pk})
+        record.clock_out_time = record.clock_in_time + timedelta(hours=1)
+        record.save()
+        self.assertEqual(self.presence(), {})
+
+        imported = TimeTrackingSystem.import_records([
+            TimeRecord(employee=self.employee, date=date(2025, 3, 12),
+                       clock_in_time=timezone.make_aware(datetime(2025, 3, 12, 9))),
+        ])
+        self.assertEqual(self.presence(), {self.employee.pk: imported[0].pk})
+
+
+class PresenceRegistryTest(TransactionTestCase):
+    """Знімок присутності в процесі: без запитів, доки не змінилася версія"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def test_snapshot(self):
+        from .presence import is_clocked_in, on_shift, on_shift_by_department
+
+        it = [make_employee(f'it{i}@company.com', 'IT') for i in range(3)]
+        sales = make_employee('sales@company.com', 'Sales')
+        system = TimeTrackingSystem()
+        for employee in it + [sales]:
+            system.clock_in(employee)
+        system.clock_out(it[0])
+
+        self.assertEqual(on_shift_by_department(), {'IT': 2, 'Sales': 1})
+        with self.assertNumQueries(0):
+            self.assertTrue(is_clocked_in(it[1].pk))
+            self.assertFalse(is_clocked_in(it[0].pk))
+            self.assertEqual(set(on_shift()), {it[1].pk, it[2].pk, sales.pk})
+
+        system.clock_out(it[1])
+        self.assertFalse(is_clocked_in(it[1].pk))
+        sales.department = 'IT'
+        sales.save()
+        self.assertEqual(on_shift_by_department(), {'IT': 2})
+
+        self.assertIsNone(system.clock_in(it[2]))
+        self.assertEqual(TimeRecord.objects.filter(employee=it[2]).count(), 1)
+
+    def test_snapshot_expires(self):
+        """Зміни інших процесів (версія тут не змінилася) видно після PRESENCE_SNAPSHOT_TIMEOUT"""
+        import time
+        from unittest import mock
+        from django.conf import settings
+        from .presence import is_clocked_in
+
+        employee = make_employee('worker@company.com')
+        TimeTrackingSystem().clock_in(employee)
+        self.assertTrue(is_clocked_in(employee.pk))
+
+        Presence.objects.filter(employee=employee).delete()
+        self.assertTrue(is_clocked_in(employee.pk))
+        later = time.monotonic() + settings.PRESENCE_SNAPSHOT_TIMEOUT + 1
+        with mock.patch('timetracking.presence.time.monotonic', return_value=later):
+            self.assertFalse(is_clocked_in(employee.pk))
+
+
+class OpenSessionConstraintTest(TestCase):
+    """БД не допускає двох незакритих сесій співробітника"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee('worker@company.com')
+        cls.record = make_record(cls.employee, date(2025, 3, 10), 9, None)
+
+    def test_constraint(self):
+        from django.core.exceptions import ValidationError
+        from django.db import IntegrityError, transaction
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            make_record(self.employee, date(2025, 3, 11), 9, None)
+        # Форми (адмінка) показують помилку замість 500
+        second = TimeRecord(employee=self.employee, date=date(2025, 3, 11),
+                            clock_in_time=timezone.make_aware(datetime(2025, 3, 11, 9)))
+        with self.assertRaisesMessage(ValidationError, 'Співробітник уже має незакритий запис часу.'):
+            second.full_clean()
+
+        self.assertIsNone(TimeTrackingSystem().clock_in(self.employee))
+        self.assertEqual(TimeRecord.objects.count(), 1)
+
+    def test_bulk_rejects_second_open_session(self):
+        other = make_employee('other@company.com')
+        response = self.client.post('/api/time-records/bulk/', [
+            {'employee': self.employee.pk, 'clock_in_time': '2025-03-11T09:00:00+02:00'},
+            {'employee': other.pk, 'clock_in_time': '2025-03-11T09:00:00+02:00'},
+            {'employee': other.pk, 'clock_in_time': '2025-03-11T10:00:00+02:00'},
+            {'employee': other.pk, 'clock_in_time': '2025-03-11T07:00:00+02:00',
+             'clock_out_time': '2025-03-11T08:00:00+02:00'},
+        ], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'0', '2'})
+
+
+class ClockInConcurrencyTest(SimpleTestCase):
+    """Одночасні приходи з потоків і процесів (SQLite у файлі, WAL) не створюють дублікатів"""
+
+    def test_parallel_clock_in(self):
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        from django.conf import settings
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, 'SQLITE_PATH': os.path.join(directory, 'stress.sqlite3')}
+            for command in [
+                ['migrate', '-v', '0'],
+                ['stress_clock_in', '--employees', '20', '--threads', '4', '--processes', '2', '--rounds', '1'],
+            ]:
+                result = subprocess.run(
+                    [sys.executable, 'manage.py', *command], cwd=settings.BASE_DIR, env=env,
+                    capture_output=True, text=True, timeout=300,
+                )
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+        self.assertIn('journal_mode=wal', result.stdout)
+        self.assertIn('clock_in: 8 воркерів × 20 спроб, успішних 20', result.stdout)
+        self.assertIn('clock_out: 8 воркерів × 20 спроб, успішних 20', result.stdout)
+
+
+class ClockJournalTest(TransactionTestCase):
+    """Буферизований режим: подія підтверджується з журналу, у БД - пакетом"""
+
+    def setUp(self):
+        import tempfile
+        from django.core.cache import cache
+        from django.test import override_settings
+        from .ingest import close_journal
+
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+        # Фоновий потік не пише сам: пакети записуються явним flush() / close_journal()
+        settings = override_settings(CLOCK_JOURNAL_DIR=self.directory, CLOCK_FLUSH_INTERVAL=3600)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(close_journal)
+        self.employee = make_employee('journal@company.com')
+
+    def test_pending_events_merged_into_reads(self):
+        from .ingest import get_journal
+        from .presence import is_clocked_in
+
+        record = TimeTrackingSystem.clock_in(self.employee)
+        self.assertIsNone(record.pk)
+        self.assertFalse(TimeRecord.objects.exists())
+        self.assertTrue(is_clocked_in(self.employee.pk))
+        self.assertEqual(TimeTrackingSystem.open_record(self.employee).clock_in_time, record.clock_in_time)
+        self.assertIsNone(TimeTrackingSystem.clock_in(self.employee))
+
+        self.assertEqual(get_journal().flush(), 1)
+        stored = TimeRecord.objects.get()
+        self.assertEqual(stored.clock_in_time, record.clock_in_time)
+        self.assertEqual(Presence.objects.get().record, stored)
+        self.assertTrue(is_clocked_in(self.employee.pk))
+
+        closed = TimeTrackingSystem.clock_out(self.employee)
+        self.assertEqual(closed.pk, stored.pk)
+        self.assertFalse(is_clocked_in(self.employee.pk))
+        self.assertIsNone(TimeTrackingSystem.clock_out(self.employee))
+        get_journal().flush()
+        stored.refresh_from_db()
+        self.assertEqual(stored.clock_out_time, closed.clock_out_time)
+        self.assertFalse(Presence.objects.exists())
+        self.assertFalse(DailyTimesheet.objects.get().has_open_session)
+
+    def test_close_flushes_in_and_out_of_one_batch(self):
+        from .ingest import close_journal
+
+        TimeTrackingSystem.clock_in(self.employee)
+        TimeTrackingSystem.clock_out(self.employee)
+        TimeTrackingSystem.clock_in(self.employee)
+        close_journal()
+
+        self.assertEqual(TimeRecord.objects.filter(clock_out_time__isnull=False).count(), 1)
+        self.assertEqual(Presence.objects.get().record, TimeRecord.objects.get(clock_out_time__isnull=True))
+
+    def test_recover_from_checkpoint(self):
+        import os
+        from .ingest import ClockEvent, _encode, recover
+        from .models import ClockJournalCheckpoint
+
+        at = timezone.now() - timedelta(hours=8)
+        lines = [_encode(ClockEvent(kind, self.employee.pk, at + timedelta(hours=hours)))
+                 for kind, hours in [('in', 0), ('out', 4), ('in', 5)]]
+        path = os.path.join(self.directory, 'host-1-1.jsonl')
+        with open(path, 'wb') as journal:
+            # Обрізаний останній рядок - збій під час запису, не підтверджений клієнту
+            journal.write(b''.join(lines) + b'{"type": "out"')
+        # Перший прихід уже записано до збою
+        TimeRecord.objects.create(employee=self.employee, clock_in_time=at, date=at.date())
+        ClockJournalCheckpoint.objects.create(segment='host-1-1.jsonl', offset=len(lines[0]))
+
+        self.assertEqual(recover(self.directory), 2)
+        self.assertEqual(TimeRecord.objects.count(), 2)
+        self.assertEqual(TimeRecord.objects.get(clock_out_time__isnull=False).clock_in_time, at)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(ClockJournalCheckpoint.objects.exists())
+
+    def test_recover_skips_stale_events(self):
+        import os
+        from .ingest import ClockEvent, _encode, recover
+
+        at = timezone.now() - timedelta(hours=8)
+        # Журнал процесу, що впав: його вихід і прихід старші за сесії, записані після нього
+        events = [ClockEvent('out', self.employee.pk, at + timedelta(hours=1)),
+                  ClockEvent('in', self.employee.pk, at + timedelta(hours=2))]
+        with open(os.path.join(self.directory, 'host-1-1.jsonl'), 'wb') as journal:
+            journal.write(b''.join(map(_encode, events)))
+        closed = TimeRecord.objects.create(employee=self.employee, clock_in_time=at + timedelta(hours=3),
+                                           clock_out_time=at + timedelta(hours=4), date=at.date())
+        current = TimeRecord.objects.create(employee=self.employee, clock_in_time=at + timedelta(hours=5),
+                                            date=at.date())
+
+        self.assertEqual(recover(self.directory), 0)
+        self.assertEqual(TimeRecord.objects.count(), 2)
+        current.refresh_from_db()
+        self.assertIsNone(current.clock_out_time)
+        self.assertEqual(TimeRecord.objects.get(clock_out_time__isnull=False), closed)
+
+
+class ImportPunchesTest(TestCase):
+    """Імпорт журналу турнікетів: пари прихід/вихід, дублікати, непарні відмітки"""
+
+    def setUp(self):
+        self.alice = make_employee('alice@company.com')
+        self.alice.badge_id = 'A1'
+        self.alice.save()
+        self.bob = make_employee('bob@company.com')
+        self.bob.badge_id = 'B2'
+        self.bob.save()
+        # Нічна зміна Боба з учорашнього файлу
+        self.night = make_record(self.bob, date(2025, 3, 2), 22, None)
+
+    def import_file(self, rows):
+        import os
+        import tempfile
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write('badge,timestamp,direction\n' + ''.join(f'{row}\n' for row in rows))
+        self.addCleanup(os.unlink, csv_file.name)
+        out = StringIO()
+        # Малий буфер сортування - злиття кількох тимчасових файлів
+        call_command('import_punches', csv_file.name, '--sort-buffer', '2', '--batch-size', '2', stdout=out)
+        return out.getvalue()
+
+    def test_import(self):
+        rows = [
+            'A1,2025-03-03T17:00:00,out',
+            'B2,2025-03-03T06:00:00,OUT',
+            'A1,2025-03-03T08:00:00,in',
+            'A1,2025-03-03T08:00:30,in',
+            'A1,2025-03-03T17:00:20,out',
+            'B2,2025-03-03T21:00:00,in',
+            'A1,2025-03-03T18:00:00,out',
+            'ZZ,2025-03-03T08:00:00,in',
+            'A1,не дата,in',
+        ]
+        # Ранкова сесія Аліси, відмічена в системі: підсумок дня вже є
+        early = make_record(self.alice, date(2025, 3, 3), 6, 60)
+        output = self.import_file(rows)
+        self.assertIn('8 відміток', output)
+        self.assertIn('створено 1 записів, відкрито 1, закрито 1', output)
+        self.assertIn('дублікатів 2, вихід без приходу 1, невідомих перепусток 1, некоректних рядків 1', output)
+
+        alice = TimeRecord.objects.exclude(pk=early.pk).get(employee=self.alice)
+        self.assertEqual(alice.calculate_hours(), 9.0)
+        self.assertEqual(alice.date, date(2025, 3, 3))
+        self.night.refresh_from_db()
+        self.assertEqual(self.night.calculate_hours(), 8.0)
+        self.assertEqual(Presence.objects.get().employee, self.bob)
+        timesheet = DailyTimesheet.objects.get(employee=self.alice)
+        self.assertEqual((timesheet.total_seconds, timesheet.session_count), (10 * 3600, 2))
+        imported = set(DailyTimesheet.objects.values_list('employee', 'date', 'total_seconds', 'session_count',
+                                                          'has_open_session'))
+        DailyTimesheet.rebuild()
+        self.assertEqual(set(DailyTimesheet.objects.values_list('employee', 'date', 'total_seconds', 'session_count',
+                                                                'has_open_session')), imported)
+
+        # Повторний імпорт нічого не дублює
+        output = self.import_file(rows)
+        self.assertIn('створено 0 записів, відкрито 0, закрито 0', output)
+        self.assertIn('вже в БД 1', output)
+        self.assertEqual(TimeRecord.objects.count(), 4)
+
+
+class TimeRecordArchiveTest(TestCase):
+    """Архів старих записів: денні підсумки незмінні, історія читає обидва рівні"""
+
+    def setUp(self):
+        self.employee = make_employee('archive@company.com')
+        self.old_day = (timezone.localdate() - timedelta(days=500)).replace(day=10)
+        self.old = [
+            make_record(self.employee, self.old_day, 8, 480),
+            make_record(self.employee, self.old_day, 18, 60),
+            make_record(self.employee, self.old_day + timedelta(days=1), 9, 240),
+        ]
+        self.recent = make_record(self.employee, timezone.localdate() - timedelta(days=10), 9, 120)
+        # Незакритий запис лишається в таблиці
+        self.open = make_record(make_employee('open@company.com'), self.old_day, 9, None)
+
+    def timesheets(self):
+        return list(DailyTimesheet.objects.order_by('employee', 'date').values_list(
+            'employee', 'date', 'total_seconds', 'session_count', 'has_open_session'
+        ))
+
+    def test_archive(self):
+        from .models import TimeRecordArchive
+
+        before = self.timesheets()
+        out = StringIO()
+        call_command('archive_time_records', stdout=out)
+        self.assertIn('В архіві 3 записів', out.getvalue())
+
+        self.assertEqual(set(TimeRecord.objects.values_list('id', flat=True)), {self.recent.pk, self.open.pk})
+        segment = TimeRecordArchive.objects.get()
+        self.assertEqual((segment.month, segment.record_count), (self.old_day.replace(day=1), 3))
+        self.assertEqual(self.timesheets(), before)
+
+        history = TimeTrackingSystem.get_work_history(self.employee)
+        self.assertEqual([record.pk for record in history], [self.recent.pk] + [r.pk for r in reversed(self.old)])
+        self.assertEqual([record.calculate_hours() for record in history], [2.0, 4.0, 1.0, 8.0])
+        self.assertEqual(len(TimeTrackingSystem.get_work_history(self.employee, date_to=self.old_day)), 2)
+
+        # Пізній запис в архівованому місяці: підсумок дня - таблиця плюс архів
+        late = make_record(self.employee, self.old_day, 20, 60)
+        timesheet = DailyTimesheet.objects.get(employee=self.employee, date=self.old_day)
+        self.assertEqual((timesheet.total_seconds, timesheet.session_count), (10 * 3600, 3))
+        DailyTimesheet.rebuild()
+        self.assertEqual(DailyTimesheet.objects.get(employee=self.employee, date=self.old_day).total_seconds, 10 * 3600)
+        self.assertEqual(len(self.timesheets()), len(before))
+
+        call_command('archive_time_records', stdout=StringIO())
+        segment.refresh_from_db()
+        self.assertEqual(segment.record_count, 4)
+        self.assertFalse(TimeRecord.objects.filter(pk=late.pk).exists())
+        self.assertEqual(DailyTimesheet.objects.get(employee=self.employee, date=self.old_day).total_seconds, 10 * 3600)
+
+    def test_export_and_api_after_archive(self):
+        import csv
+        from django.contrib.auth import get_user_model
+        from .models import TimeRecordArchive
+
+        call_command('archive_time_records', stdout=StringIO())
+        hr = get_user_model().objects.create_user('hr', 'hr@company.com', 'password', role='hr')
+        self.client.force_login(hr)
+
+        response = self.client.get(f'/hr/export/time-records/?date_from={self.old_day}')
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual([row['id'] for row in rows], [str(record.pk) for record in self.old + [self.recent, self.open]])
+        self.assertEqual([row['hours'] for row in rows[:3]], ['8.0', '1.0', '4.0'])
+        self.assertEqual(rows[0]['employee_email'], 'archive@company.com')
+        response = self.client.get(f'/hr/export/time-records/?date_from={self.old_day}&date_to={self.old_day}')
+        self.assertEqual(len(response.getvalue().decode().splitlines()), 1 + 3)
+
+        # Список API архіву не читає, але позначає межу
+        cutoff = TimeRecordArchive.cutoff().isoformat()
+        self.assertEqual(self.client.get('/api/time-records/')['Archive-Cutoff'], cutoff)
+        self.assertNotIn('Archive-Cutoff', self.client.get(f'/api/time-records/?date__gte={cutoff}'))
+
+    def test_history_views_after_archive(self):
+        from django.contrib.auth import get_user_model
+
+        call_command('archive_time_records', stdout=StringIO())
+        hr = get_user_model().objects.create_user('hr', 'hr@company.com', 'password', role='hr')
+        self.client.force_login(hr)
+
+        # Сторінка співробітника в HR: архівований місяць
+        response = self.client.get(f'/hr/employee/{self.employee.pk}/?month={self.old_day:%Y-%m}')
+        self.assertEqual([record.pk for record in response.context['time_records']], [r.pk for r in reversed(self.old)])
+        self.assertEqual(response.context['total_hours'], 13.0)
+        self.assertContains(response, f'{self.old_day:%d.%m.%Y}')
+        response = self.client.get(f'/hr/employee/{self.employee.pk}/?month=bad')
+        self.assertEqual(response.context['month_start'], timezone.localdate().replace(day=1))
+
+        # API: період до межі архіву
+        url = f'/api/time-records/history/?employee={self.employee.pk}&date_from={self.old_day}&date_to={timezone.localdate()}'
+        # Сесія і користувач, співробітник, сегменти архіву, записи таблиці - без запиту на запис
+        with self.assertNumQueries(5):
+            results = self.client.get(f'{url}&expand=employee').json()['results']
+        self.assertEqual([row['id'] for row in results], [self.recent.pk] + [r.pk for r in reversed(self.old)])
+        self.assertEqual([row['hours_worked'] for row in results], [2.0, 4.0, 1.0, 8.0])
+        self.assertEqual(results[-1]['employee']['email'], 'archive@company.com')
+        self.assertEqual(self.client.get(f'{url}&date_from=bad').status_code, 400)
+        self.assertEqual(self.client.get(url.replace(f'employee={self.employee.pk}', 'employee=999')).status_code, 404)
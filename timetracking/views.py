@@ -1,8 +1,96 @@
-from rest_framework import viewsets
-from .models import TimeRecord
-from .serializers import TimeRecordSerializer
+from django.db import IntegrityError
+from django.shortcuts import get_object_or_404
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from employees.models import Employee
+from hrm_project.viewsets import ConditionalGetMixin, OptimizedQuerySetMixin
+from .filters import TimeRecordFilter
+from .models import DailyTimesheet, TimeRecord, TimeRecordArchive, TimeTrackingSystem
+from .serializers import (
+    TimeRecordBulkSerializer, TimeRecordHistoryParams, TimeRecordSerializer, TimeRecordSummaryParams,
+)
 
-class TimeRecordViewSet(viewsets.ModelViewSet):
+
+class TimeRecordViewSet(ConditionalGetMixin, OptimizedQuerySetMixin, viewsets.ModelViewSet):
     queryset = TimeRecord.objects.all()
-    serializer_class = TimeRecordSerializer
\ No newline at end of file
+    serializer_class = TimeRecordSerializer
+    query_filter_class = TimeRecordFilter
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # hours_worked читає тривалість, пораховану в БД
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.with_duration()
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # Записи до цієї дати могли перейти в архів (TimeRecordArchive) і в список не потрапляють;
+        # їх віддають history (нижче) і вивантаження time-records
+        query_filter = self.query_filter_class(data=request.query_params)
+        query_filter.is_valid()
+        cutoff = TimeRecordArchive.cutoff()
+        date_from = query_filter.validated_data.get('date__gte')
+        if date_from is None or date_from < cutoff:
+            response['Archive-Cutoff'] = cutoff.isoformat()
+        return response
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Створити до BULK_MAX_ITEMS записів одним запитом (усі або жодного)"""
+        serializer = TimeRecordBulkSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            records = TimeTrackingSystem.import_records([
+                TimeRecord(employee_id=item.pop('employee'), **item) for item in serializer.validated_data
+            ])
+        except IntegrityError:
+            # Співробітник відмітив прихід між перевіркою пакета і вставкою
+            return Response(
+                {'detail': 'Співробітник уже має незакритий запис часу.'}, status=status.HTTP_409_CONFLICT
+            )
+        return Response(
+            {'results': [{'id': record.pk, 'status': 'created'} for record in records]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        Записи співробітника за період разом з архівними
+
+        ?employee=&date_from=&date_to= - і для днів до межі Archive-Cutoff, яких
+        немає в списку (TimeTrackingSystem.get_work_history). Без пагінації.
+        """
+        params = TimeRecordHistoryParams(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        employee = get_object_or_404(Employee.objects.select_related('salary_strategy'), pk=data['employee'])
+        records = TimeTrackingSystem.get_work_history(employee, data['date_from'], data['date_to'])
+        return Response({'results': self.get_serializer(records, many=True).data})
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Години за період по співробітниках або відділах
+
+        ?date_from=&date_to=&group_by=employee|department&period=day|week|month
+        [&employee=&department=] - агрегатний запит до денних підсумків.
+        """
+        params = TimeRecordSummaryParams(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        timesheets = DailyTimesheet.objects.filter(date__gte=data['date_from'], date__lte=data['date_to'])
+        if 'employee' in data:
+            timesheets = timesheets.filter(employee_id=data['employee'])
+        if 'department' in data:
+            timesheets = timesheets.filter(employee__department=data['department'])
+        return Response({
+            'group_by': data['group_by'],
+            'period': data['period'],
+            'results': timesheets.totals(data['group_by'], data['period']),
+        })